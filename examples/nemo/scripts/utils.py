@@ -411,6 +411,29 @@ def insert_explicit_loop_parallelism(
     :param privatise_arrays: whether to attempt to privatise arrays that cause
         write-write race conditions.
 
+    '''
+    # The same loop nests are analysed repeatedly (e.g. once for each
+    # enclosing loop), so cache their variable accesses while the directives
+    # are added.
+    root = schedule.root
+    access_cache_enabled = root.access_cache_enabled
+    root.enable_access_cache()
+    try:
+        _insert_loop_directives(schedule, region_directive_trans,
+                                loop_directive_trans, collapse,
+                                privatise_arrays)
+    finally:
+        # Restore the previous setting even if a transformation fails, so
+        # that the cache does not stay enabled for the caller's code.
+        root.enable_access_cache(access_cache_enabled)
+
+
+def _insert_loop_directives(schedule, region_directive_trans,
+                            loop_directive_trans, collapse, privatise_arrays):
+    ''' Inserts the given region and loop directives for each loop in the
+    schedule that doesn't already have a Directive as an ancestor. See
+    insert_explicit_loop_parallelism for the arguments.
+
     '''
     # Add the parallel directives in each loop
     for loop in schedule.walk(Loop):
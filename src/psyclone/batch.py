@@ -0,0 +1,265 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''
+    This module provides the driver for the psyclone-batch script. It
+    applies the PSyclone code-transformation mode to many files in a
+    single invocation, optionally distributing them over a pool of worker
+    processes. Each worker imports PSyclone, loads the configuration and
+    builds up its ModuleManager only once and then processes many files,
+    which avoids paying the start-up cost of PSyclone for every file.
+'''
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import os
+import sys
+import traceback
+from typing import List, Optional, Tuple
+
+from psyclone.configuration import Config, ConfigurationError
+from psyclone.generator import code_transformation_mode
+from psyclone.parse import ModuleManager
+from psyclone.profiler import Profiler
+from psyclone.version import __VERSION__
+
+# Whether the Config of this process has been set up by _configure. This is
+# inherited by worker processes that are forked from the main process.
+_CONFIGURED = False
+
+
+def read_manifest(manifest: str) -> List[Tuple[str, str]]:
+    '''
+    Reads the list of files to process from a manifest file. Each
+    non-empty line of the manifest contains the name of an input file and
+    the name of the corresponding output file, separated by whitespace.
+    Anything following a '#' is a comment. Relative file names are taken
+    to be relative to the current working directory.
+
+    :param manifest: the name of the manifest file, or '-' to read the
+        manifest from stdin.
+
+    :returns: the list of input and output file names.
+
+    :raises ValueError: if a line does not contain exactly two file names.
+
+    '''
+    if manifest == "-":
+        lines = sys.stdin.readlines()
+    else:
+        with open(manifest, "r", encoding="utf-8") as manifest_file:
+            lines = manifest_file.readlines()
+
+    file_pairs = []
+    for line_number, line in enumerate(lines, 1):
+        names = line.split("#", 1)[0].split()
+        if not names:
+            continue
+        if len(names) != 2:
+            raise ValueError(
+                f"Line {line_number} of manifest '{manifest}' must contain "
+                f"an input and an output file name but found "
+                f"'{line.strip()}'.")
+        file_pairs.append((names[0], names[1]))
+    return file_pairs
+
+
+def _configure(args: argparse.Namespace) -> None:
+    '''
+    Sets up the Config (and Profiler) according to the command-line
+    arguments in the same way as the psyclone command does in the
+    code-transformation mode.
+
+    :param args: the parsed command-line arguments.
+
+    :raises ConfigurationError: if an include path is invalid.
+    :raises ValueError: if a profiling option is invalid.
+
+    '''
+    # pylint: disable=global-statement
+    global _CONFIGURED
+    config = Config.get()
+    config.load(args.config)
+    config.api = ""
+    if args.profile:
+        Profiler.set_options(args.profile, "")
+    if args.backend:
+        config.backend_checks_enabled = (
+            str(args.backend) == "enable-validation")
+    config.include_paths = args.include if args.include else ["./"]
+    if args.module_index:
+        ModuleManager.get().module_index_file = args.module_index
+    _CONFIGURED = True
+
+
+def _init_worker(args: argparse.Namespace) -> None:
+    '''
+    Initialises a worker process. Workers that are forked from the main
+    process inherit its configuration, otherwise (e.g. if worker processes
+    are spawned) the configuration is loaded once per worker.
+
+    :param args: the parsed command-line arguments.
+
+    '''
+    if not _CONFIGURED:
+        _configure(args)
+
+
+def _process_file(args: argparse.Namespace, input_file: str,
+                  output_file: str) -> Optional[str]:
+    '''
+    Applies the code-transformation mode to a single file. This is executed
+    by the worker processes (or by the main process if no pool is used).
+
+    :param args: the parsed command-line arguments.
+    :param input_file: the file to process.
+    :param output_file: the file in which to store the output.
+
+    :returns: an error message if processing the file failed, or None.
+
+    '''
+    try:
+        code_transformation_mode(input_file=input_file,
+                                 recipe_file=args.script,
+                                 output_file=output_file,
+                                 line_length=args.limit,
+                                 result_cache_path=args.result_cache)
+    except SystemExit:
+        # code_transformation_mode has already reported the error.
+        return f"Failed to process '{input_file}'."
+    except Exception:  # pylint: disable=broad-except
+        return (f"Failed to process '{input_file}':\n"
+                f"{traceback.format_exc()}")
+    return None
+
+
+def run(arguments: List[str]) -> None:
+    '''
+    Driver for the psyclone-batch tool. Parses and checks the command-line
+    arguments and processes all files listed in the manifest. Errors are
+    reported for each file that could not be processed, and the tool exits
+    with an error code if there was any.
+
+    :param arguments: the list of command-line arguments with which
+        psyclone-batch has been invoked.
+
+    '''
+    # Make sure we have the supported APIs defined in the Config singleton,
+    # but postpone loading the config file till the command line was parsed
+    # in case that the user specifies a different config file.
+    Config.get(do_not_load_file=True)
+
+    parser = argparse.ArgumentParser(
+        prog="psyclone-batch",
+        description='Transform many files using the PSyclone '
+                    'source-to-source Fortran compiler (code-transformation '
+                    'mode only).')
+    parser.add_argument('manifest',
+                        help="file listing an input and an output file name "
+                        "per line ('-' to read the list from stdin)")
+    parser.add_argument(
+        '-v', '--version', action='version',
+        version=f'psyclone-batch version: {__VERSION__}',
+        help='display version information')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='number of worker processes (default %(default)s). Use 0 for '
+        'one worker per CPU.')
+    parser.add_argument('-c', '--config', help='config file with '
+                        'PSyclone specific options')
+    parser.add_argument('-s', '--script', help='filename of a PSyclone'
+                        ' optimisation recipe')
+    parser.add_argument(
+        '-I', '--include', default=[], action="append",
+        help='path to Fortran INCLUDE or module files')
+    parser.add_argument(
+        '--module-index', metavar='INDEX_FILE',
+        help='file in which to keep an index of the modules in the search '
+        'paths (see the psyclone command)')
+    parser.add_argument(
+        '-l', '--limit', dest='limit', default='off',
+        choices=['off', 'all', 'output'],
+        help="limit the Fortran line length to 132 characters (default "
+        "'%(default)s'). Use 'all' to apply limit to both input and "
+        "output Fortran. Use 'output' to apply line-length limit to output "
+        "Fortran only.")
+    parser.add_argument(
+        '-p', '--profile', action="append", choices=Profiler.SUPPORTED_OPTIONS,
+        help="add profiling hooks for 'kernels', 'invokes' or 'routines'")
+    parser.add_argument(
+        '--backend', dest='backend',
+        choices=['enable-validation', 'disable-validation'],
+        help=("options to control the PSyIR backend used for code generation. "
+              "Use 'disable-validation' to disable the validation checks that "
+              "are performed by default."))
+    parser.add_argument('--result-cache', metavar='CACHE_DIR',
+                        help='directory in which to cache the generated code '
+                        '(see the psyclone command)')
+
+    args = parser.parse_args(arguments)
+
+    if args.jobs < 0:
+        print(f"The number of jobs must not be negative but got "
+              f"{args.jobs}.", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        file_pairs = read_manifest(args.manifest)
+        # Configure this process so that any error in the settings is
+        # reported once (and so that forked workers inherit the Config).
+        _configure(args)
+    except (OSError, ValueError, ConfigurationError) as err:
+        print(str(err), file=sys.stderr)
+        sys.exit(1)
+
+    jobs = args.jobs if args.jobs else os.cpu_count()
+    if jobs == 1 or len(file_pairs) <= 1:
+        errors = [_process_file(args, input_file, output_file)
+                  for input_file, output_file in file_pairs]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(args,)) as executor:
+            errors = list(executor.map(
+                _process_file,
+                [args] * len(file_pairs),
+                [input_file for input_file, _ in file_pairs],
+                [output_file for _, output_file in file_pairs]))
+
+    errors = [error for error in errors if error]
+    for error in errors:
+        print(error, file=sys.stderr)
+    if errors:
+        print(f"{len(errors)} of {len(file_pairs)} files could not be "
+              f"processed.", file=sys.stderr)
+        sys.exit(1)
@@ -63,7 +63,11 @@ _FILE_NAME = "psyclone.cfg"
 # single = If any given kernel (within a single Application) is transformed
 #          more than once then the same transformation must always be
 #          applied and only one version of the transformed kernel is created.
-VALID_KERNEL_NAMING_SCHEMES = ["multiple", "single"]
+# hashed = As for multiple, but if an identical transformed kernel has
+#          already been created (as recorded by the hash of its code in an
+#          index in the kernel output directory) then it is reused rather
+#          than creating another copy.
+VALID_KERNEL_NAMING_SCHEMES = ["multiple", "single", "hashed"]
 
 LFRIC_API_NAMES = ["lfric", "dynamo0.3"]
 GOCEAN_API_NAMES = ["gocean", "gocean1.0"]
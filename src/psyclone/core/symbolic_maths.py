@@ -36,11 +36,11 @@
 # -----------------------------------------------------------------------------
 
 ''' This module provides access to sympy-based symbolic maths
-functions.'''
+functions. Importing SymPy takes a significant part of the start-up time
+of PSyclone, so it is only imported by the functions that use it.'''
 
+from collections import OrderedDict
 from enum import Enum
-from sympy import (Complexes, ConditionSet, core, EmptySet, expand, FiniteSet,
-                   ImageSet, simplify, solvers, Union)
 
 
 class SymbolicMaths:
@@ -65,6 +65,15 @@ class SymbolicMaths:
     # available, or None otherwise.
     _instance = None
 
+    # The same expressions are often compared many times (e.g. by the
+    # dependency analysis of nested loops). Therefore, the simplified
+    # differences of pairs of expressions are kept in a least-recently-used
+    # cache of at most _cache_max_size entries (0 disables the cache).
+    _cache = OrderedDict()
+    _cache_max_size = 4096
+    _cache_hits = 0
+    _cache_misses = 0
+
     class Fuzzy(Enum):
         '''
         Enumeration used as a return value for situations where we need to
@@ -90,6 +99,56 @@ class SymbolicMaths:
 
         return SymbolicMaths._instance
 
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def cache_info():
+        '''
+        :returns: the statistics of the cache of symbolic comparisons: the
+            number of hits and misses, the maximum and the current number of
+            entries.
+        :rtype: Dict[str, int]
+
+        '''
+        return {"hits": SymbolicMaths._cache_hits,
+                "misses": SymbolicMaths._cache_misses,
+                "max_size": SymbolicMaths._cache_max_size,
+                "size": len(SymbolicMaths._cache)}
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def clear_cache():
+        '''Removes all entries from the cache of symbolic comparisons and
+        resets its statistics.
+
+        '''
+        SymbolicMaths._cache.clear()
+        SymbolicMaths._cache_hits = 0
+        SymbolicMaths._cache_misses = 0
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def set_cache_max_size(max_size):
+        '''Sets the maximum number of entries of the cache of symbolic
+        comparisons. The least recently used entries are removed if the
+        cache is larger.
+
+        :param int max_size: the maximum number of entries, 0 disables the
+            cache.
+
+        :raises TypeError: if max_size is not an int.
+        :raises ValueError: if max_size is negative.
+
+        '''
+        if not isinstance(max_size, int):
+            raise TypeError(f"The maximum size of the cache must be an int "
+                            f"but got '{type(max_size).__name__}'.")
+        if max_size < 0:
+            raise ValueError(f"The maximum size of the cache must not be "
+                             f"negative but got {max_size}.")
+        SymbolicMaths._cache_max_size = max_size
+        while len(SymbolicMaths._cache) > max_size:
+            SymbolicMaths._cache.popitem(last=False)
+
     # -------------------------------------------------------------------------
     @staticmethod
     def equal(exp1, exp2, identical_variables=None):
@@ -116,6 +175,9 @@ class SymbolicMaths:
         if exp1 is None or exp2 is None:
             return exp1 == exp2
 
+        # pylint: disable=import-outside-toplevel
+        from sympy import core
+
         diff = SymbolicMaths._subtract(exp1, exp2,
                                        identical_variables=identical_variables)
         # For ranges all values (start, stop, step) must be equal, meaning
@@ -144,6 +206,7 @@ class SymbolicMaths:
         # Circular dependency:
         # pylint: disable=import-outside-toplevel
         from psyclone.psyir.backend.visitor import VisitorError
+        from sympy import core
 
         try:
             result = SymbolicMaths._subtract(exp1, exp2)
@@ -180,6 +243,36 @@ class SymbolicMaths:
         # n-5), so it might be zero.
         return False
 
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _expression_key(expression):
+        '''
+        Creates the key of an expression in the cache of symbolic
+        comparisons. Apart from the structure of the expression (which is
+        compared by ``==``), the SymPy representation of a reference depends
+        on whether it is an array and, for a whole array, on its rank. These
+        are therefore part of the key.
+
+        :param expression: the expression.
+        :type expression: :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: the key of the expression.
+        :rtype: tuple
+
+        '''
+        # Avoid circular import
+        # pylint: disable=import-outside-toplevel
+        from psyclone.psyir.nodes import Reference
+
+        references = []
+        for ref in expression.walk(Reference):
+            if type(ref) is Reference and ref.is_array:
+                references.append(len(ref.symbol.shape))
+            else:
+                references.append(ref.is_array)
+        # pylint: disable=protected-access
+        return (expression._get_structural_hash(), tuple(references))
+
     # -------------------------------------------------------------------------
     @staticmethod
     def _subtract(exp1, exp2, identical_variables=None,
@@ -214,10 +307,34 @@ class SymbolicMaths:
         # Avoid circular import
         # pylint: disable=import-outside-toplevel
         from psyclone.psyir.backend.sympy_writer import SymPyWriter
+        from sympy import simplify
+
+        writer = SymPyWriter()
+
+        # The cache is keyed by the structural hashes of the expressions
+        # (together with the options that affect the SymPy symbols). Each
+        # entry also stores copies of the expressions, which are compared
+        # to the given expressions in case of a hash collision.
+        key = None
+        if (SymbolicMaths._cache_max_size and
+                (not identical_variables or
+                 isinstance(identical_variables, dict))):
+            key = (SymbolicMaths._expression_key(exp1),
+                   SymbolicMaths._expression_key(exp2),
+                   tuple(sorted(identical_variables.items()))
+                   if identical_variables else None,
+                   bool(all_variables_positive))
+            entry = SymbolicMaths._cache.get(key)
+            if entry and entry[0] == exp1 and entry[1] == exp2:
+                SymbolicMaths._cache_hits += 1
+                SymbolicMaths._cache.move_to_end(key)
+                result = entry[2]
+                # Don't return the cached list itself for a range
+                return list(result) if isinstance(result, list) else result
+            SymbolicMaths._cache_misses += 1
 
         # Use the SymPyWriter to convert the two expressions to
         # SymPy expressions:
-        writer = SymPyWriter()
         sympy_expressions = writer(
             [exp1, exp2],
             identical_variables=identical_variables,
@@ -230,11 +347,17 @@ class SymbolicMaths:
             result = []
             for i, j in zip(sympy_expressions[0], sympy_expressions[1]):
                 result.append(simplify(i - j))
-            return result
-
-        # Simplify triggers a set of SymPy algorithms to simplify
-        # the expression.
-        return simplify(sympy_expressions[0] - sympy_expressions[1])
+        else:
+            # Simplify triggers a set of SymPy algorithms to simplify
+            # the expression.
+            result = simplify(sympy_expressions[0] - sympy_expressions[1])
+
+        if key is not None:
+            SymbolicMaths._cache[key] = (exp1.copy(), exp2.copy(), result)
+            if len(SymbolicMaths._cache) > SymbolicMaths._cache_max_size:
+                SymbolicMaths._cache.popitem(last=False)
+            return list(result) if isinstance(result, list) else result
+        return result
 
     @staticmethod
     def greater_than(exp1, exp2, all_variables_positive=None):
@@ -253,6 +376,9 @@ class SymbolicMaths:
         :rtype: :py:class:`psyclone.core.symbolic_maths.Fuzzy`
 
         '''
+        # pylint: disable=import-outside-toplevel
+        from sympy import core
+
         diff_val = SymbolicMaths._subtract(
             exp1, exp2,
             all_variables_positive=all_variables_positive)
@@ -286,6 +412,9 @@ class SymbolicMaths:
         :rtype: :py:class:`psyclone.core.symbolic_maths.Fuzzy`
 
         '''
+        # pylint: disable=import-outside-toplevel
+        from sympy import core
+
         diff_val = SymbolicMaths._subtract(
             exp1, exp2,
             all_variables_positive=all_variables_positive)
@@ -332,6 +461,9 @@ class SymbolicMaths:
         # easier to not restrict the domain, and detect and interpret
         # a non-integer solution later.
         # We use solvers.solveset to allow testing to monkeypatch solveset
+        # pylint: disable=import-outside-toplevel
+        from sympy import (Complexes, ConditionSet, EmptySet, FiniteSet,
+                           ImageSet, solvers, Union)
 
         solution = solvers.solveset(exp1-exp2, symbol)
         if solution == Complexes:
@@ -400,6 +532,7 @@ class SymbolicMaths:
         from psyclone.psyir.backend.sympy_writer import SymPyWriter
         from psyclone.psyir.frontend.sympy_reader import SymPyReader
         from psyclone.psyir.nodes import Reference, Literal
+        from sympy import expand
 
         # variables and literals do not require expansion
         if isinstance(expr, (Reference, Literal)):
@@ -112,9 +112,11 @@ class VariablesAccessInfo(dict):
                                             f"not a Node, but of type "
                                             f"{type(node)}")
 
-                    node.reference_accesses(self)
+                    # pylint: disable=protected-access
+                    node._cached_reference_accesses(self)
             elif isinstance(nodes, Node):
-                nodes.reference_accesses(self)
+                # pylint: disable=protected-access
+                nodes._cached_reference_accesses(self)
             else:
                 arg_type = str(type(nodes))
                 raise InternalError(f"Error in VariablesAccessInfo. "
@@ -328,6 +330,32 @@ class VariablesAccessInfo(dict):
         # locations just merged in
         self._location = self._location + max_new_location
 
+    def append(self, other_access_info):
+        '''Adds all accesses of another VariablesAccessInfo instance, whose
+        locations must start at 0, as if they had been added to this
+        instance at its current location. Unlike :py:meth:`merge`, this
+        keeps the order in which the variables were first accessed and
+        advances the location of this instance by the location of the other
+        instance, so the result is identical to collecting the accesses of
+        the other instance directly in this instance.
+
+        :param other_access_info: the other VariablesAccessInfo instance.
+        :type other_access_info: \
+            :py:class:`psyclone.core.VariablesAccessInfo`
+        '''
+        for signature, other_var_info in other_access_info.items():
+            if signature in self:
+                var_info = self[signature]
+            else:
+                var_info = SingleVariableAccessInfo(signature)
+                self[signature] = var_info
+            for access_info in other_var_info.all_accesses:
+                var_info.add_access_with_location(
+                    access_info.access_type,
+                    access_info.location + self._location,
+                    access_info.node, access_info.component_indices)
+        self._location += other_access_info.location
+
     def is_called(self, signature: Signature) -> bool:
         '''
         :param signature: signature of the variable.
@@ -4093,7 +4093,7 @@ class LFRicHaloExchangeStart(LFRicHaloExchange):
         '''
         # Look at all nodes following this one in schedule order
         # (which is PSyIRe node order)
-        for node in self.following():
+        for node in self.following_iter():
             if self.sameParent(node) and isinstance(node, LFRicHaloExchange):
                 # Found a following `haloexchange`,
                 # `haloexchangestart` or `haloexchangeend` PSyIRe node
@@ -51,7 +51,8 @@ import sys
 import traceback
 import importlib
 import shutil
-from typing import Union, Callable, List, Tuple
+import time
+from typing import Union, Callable, Dict, List, Tuple
 
 from fparser.api import get_reader
 from fparser.two import Fortran2003
@@ -60,29 +61,18 @@ from psyclone.alg_gen import Alg, NoInvokesError
 from psyclone.configuration import (
     Config, ConfigurationError, VALID_KERNEL_NAMING_SCHEMES,
     LFRIC_API_NAMES, GOCEAN_API_NAMES)
-from psyclone.domain.common.algorithm.psyir import (
-    AlgorithmInvokeCall, KernelFunctor)
-from psyclone.domain.common.transformations import AlgTrans
-from psyclone.domain.gocean.transformations import (
-    RaisePSyIR2GOceanKernTrans, GOceanAlgInvoke2PSyCallTrans)
-from psyclone.domain.lfric.algorithm import LFRicBuiltinFunctor
-from psyclone.domain.lfric.lfric_builtins import BUILTIN_MAP
-from psyclone.domain.lfric.transformations import (
-    LFRicAlgTrans, RaisePSyIR2LFRicKernTrans, LFRicAlgInvoke2PSyCallTrans)
 from psyclone.errors import GenerationError, InternalError
 from psyclone.line_length import FortLineLength
 from psyclone.parse import ModuleManager
-from psyclone.parse.algorithm import parse
-from psyclone.parse.kernel import get_kernel_filepath
-from psyclone.parse.utils import ParseError, parse_fp2
+from psyclone.parse.utils import ParseError
 from psyclone.profiler import Profiler
-from psyclone.psyGen import PSyFactory
 from psyclone.psyir.backend.fortran import FortranWriter
 from psyclone.psyir.frontend.fortran import FortranReader
 from psyclone.psyir.frontend.fparser2 import Fparser2Reader
 from psyclone.psyir.nodes import Loop, Container, Routine
 from psyclone.psyir.symbols import UnresolvedInterface
 from psyclone.psyir.transformations import TransformationError
+from psyclone.result_cache import ResultCache
 from psyclone.version import __VERSION__
 
 # TODO issue #1618 remove temporary LFRIC_TESTING flag, associated
@@ -94,6 +84,43 @@ from psyclone.version import __VERSION__
 # until it is working.
 LFRIC_TESTING = False
 
+# The time (in seconds) taken by each stage of the last call to generate().
+_GENERATE_TIMING: Dict[str, float] = {}
+
+
+class _StageTimer:
+    '''
+    Records the time taken by consecutive stages of processing a file:
+    each stage lasts from the end of the previous stage (or the creation
+    of the timer) until it is ended.
+
+    :param timing: the dictionary in which to accumulate the time taken by
+        each stage.
+
+    '''
+    def __init__(self, timing: Dict[str, float]):
+        self._timing = timing
+        self._start = time.perf_counter()
+
+    def end_stage(self, stage: str) -> None:
+        '''
+        Ends the current stage and starts the next one.
+
+        :param stage: the name of the stage that ended.
+        '''
+        now = time.perf_counter()
+        self._timing[stage] = (self._timing.get(stage, 0.0) +
+                               now - self._start)
+        self._start = now
+
+
+def generate_timing() -> Dict[str, float]:
+    '''
+    :returns: the time (in seconds) taken by each stage of the last call
+        to :py:func:`generate`, in the order in which the stages were run.
+    '''
+    return dict(_GENERATE_TIMING)
+
 
 def load_script(
         script_name: str, function_name: str = "trans",
@@ -219,7 +246,33 @@ def generate(filename, api="", kernel_paths=None, script_name=None,
     >>> alg, psy = generate("algspec.f90", line_length=True)
     >>> alg, psy = generate("algspec.f90", distributed_memory=False)
 
+    The algorithm file is only parsed once: the same fparser2 parse tree
+    is used to find the invokes and to create the algorithm PSyIR, and
+    the kernel files are only parsed once (see
+    :py:class:`psyclone.parse.kernel.KernelCache`). The time taken by
+    each stage is returned by :py:func:`generate_timing`.
+
     '''
+    # The DSL-specific modules are only imported when they are required
+    # (i.e. not in the code-transformation mode) to reduce start-up time.
+    # pylint: disable=import-outside-toplevel
+    from psyclone.domain.common.algorithm.psyir import (
+        AlgorithmInvokeCall, KernelFunctor)
+    from psyclone.domain.common.transformations import AlgTrans
+    from psyclone.domain.gocean.transformations import (
+        RaisePSyIR2GOceanKernTrans, GOceanAlgInvoke2PSyCallTrans)
+    from psyclone.domain.lfric.algorithm import LFRicBuiltinFunctor
+    from psyclone.domain.lfric.lfric_builtins import BUILTIN_MAP
+    from psyclone.domain.lfric.transformations import (
+        LFRicAlgTrans, RaisePSyIR2LFRicKernTrans,
+        LFRicAlgInvoke2PSyCallTrans)
+    from psyclone.parse.algorithm import parse
+    from psyclone.parse.kernel import get_kernel_filepath, KernelCache
+    from psyclone.psyGen import PSyFactory
+
+    _GENERATE_TIMING.clear()
+    timer = _StageTimer(_GENERATE_TIMING)
+
     if kernel_paths is None:
         kernel_paths = []
 
@@ -250,36 +303,45 @@ def generate(filename, api="", kernel_paths=None, script_name=None,
     # can be combined.
     ModuleManager.get().add_search_path(kernel_paths)
 
+    # Each kernel file is only parsed once in this run, however often its
+    # kernels are called.
+    kernel_cache = KernelCache()
     ast, invoke_info = parse(filename, api=api, invoke_name="invoke",
                              kernel_paths=kernel_paths,
-                             line_length=line_length)
+                             line_length=line_length,
+                             kernel_cache=kernel_cache)
+    timer.end_stage("parse")
 
     if api in LFRIC_API_NAMES and not LFRIC_TESTING:
         psy = PSyFactory(api, distributed_memory=distributed_memory)\
             .create(invoke_info)
+        timer.end_stage("psy_creation")
         if script_name is not None:
             # Apply provided recipe to PSyIR
             recipe, _, _ = load_script(script_name)
             recipe(psy.container.root)
+            timer.end_stage("psy_script")
         alg_gen = None
 
     elif api in GOCEAN_API_NAMES or (api in LFRIC_API_NAMES and LFRIC_TESTING):
-        # Create language-level PSyIR from the Algorithm file
+        # Create language-level PSyIR from the fparser2 parse tree of the
+        # Algorithm file that was created by parse() (which is not used
+        # otherwise in this case), rather than parsing the file again.
         reader = FortranReader()
         if api in LFRIC_API_NAMES:
             # avoid undeclared builtin errors in PSyIR by adding a
             # wildcard use statement.
-            fp2_tree = parse_fp2(filename)
             # Choose a module name that is invalid Fortran so that it
             # does not clash with any existing names in the algorithm
             # layer.
             builtins_module_name = "_psyclone_builtins"
-            add_builtins_use(fp2_tree, builtins_module_name)
-            psyir = Fparser2Reader().generate_psyir(fp2_tree)
+            add_builtins_use(ast, builtins_module_name)
+            psyir = Fparser2Reader().generate_psyir(ast)
             # Check that there is only one module/program per file.
             check_psyir(psyir, filename)
         else:
-            psyir = reader.psyir_from_file(filename)
+            psyir = Fparser2Reader().generate_psyir(
+                ast, os.path.basename(filename))
 
         # Raise to Algorithm PSyIR
         if api in GOCEAN_API_NAMES:
@@ -296,6 +358,7 @@ def generate(filename, api="", kernel_paths=None, script_name=None,
             raise NoInvokesError(
                 "Algorithm file contains no invoke() calls: refusing to "
                 "generate empty PSy code")
+        timer.end_stage("algorithm_psyir")
 
         if script_name is not None:
             # Call the optimisation script for algorithm optimisations
@@ -303,6 +366,7 @@ def generate(filename, api="", kernel_paths=None, script_name=None,
                                        is_optional=True)
             if recipe:
                 recipe(psyir)
+                timer.end_stage("algorithm_script")
 
         # For each kernel called from the algorithm layer
         kernels = {}
@@ -339,25 +403,32 @@ def generate(filename, api="", kernel_paths=None, script_name=None,
                 filepath = get_kernel_filepath(
                     container_symbol.name, kernel_paths, filename)
 
-                try:
-                    # Create language-level PSyIR from the kernel file
-                    kernel_psyir = reader.psyir_from_file(filepath)
-                except InternalError as info:
-                    print(f"In kernel file '{filepath}':\n{str(info.value)}",
-                          file=sys.stderr)
-                    sys.exit(1)
-
-                # Raise to Kernel PSyIR
-                if api in GOCEAN_API_NAMES:
-                    kern_trans = RaisePSyIR2GOceanKernTrans(kern.symbol.name)
-                    kern_trans.apply(kernel_psyir)
-                else:  # api in LFRIC_API_NAMES
-                    kern_trans = RaisePSyIR2LFRicKernTrans()
-                    kern_trans.apply(
-                        kernel_psyir,
-                        options={"metadata_name": kern.symbol.name})
+                kernel_psyir = kernel_cache.get_kernel_psyir(
+                    filepath, kern.symbol.name)
+                if kernel_psyir is None:
+                    try:
+                        # Create language-level PSyIR from the kernel file
+                        kernel_psyir = reader.psyir_from_file(filepath)
+                    except InternalError as info:
+                        print(f"In kernel file '{filepath}':\n"
+                              f"{str(info.value)}", file=sys.stderr)
+                        sys.exit(1)
+
+                    # Raise to Kernel PSyIR
+                    if api in GOCEAN_API_NAMES:
+                        kern_trans = RaisePSyIR2GOceanKernTrans(
+                            kern.symbol.name)
+                        kern_trans.apply(kernel_psyir)
+                    else:  # api in LFRIC_API_NAMES
+                        kern_trans = RaisePSyIR2LFRicKernTrans()
+                        kern_trans.apply(
+                            kernel_psyir,
+                            options={"metadata_name": kern.symbol.name})
+                    kernel_cache.add_kernel_psyir(filepath, kern.symbol.name,
+                                                  kernel_psyir)
 
                 kernels[id(invoke)][id(kern)] = kernel_psyir
+        timer.end_stage("kernel_psyir")
 
         # Transform 'invoke' calls into calls to PSy-layer subroutines
         if api in GOCEAN_API_NAMES:
@@ -380,27 +451,33 @@ def generate(filename, api="", kernel_paths=None, script_name=None,
         # Create Fortran from Algorithm PSyIR
         writer = FortranWriter()
         alg_gen = writer(psyir)
+        timer.end_stage("algorithm_output")
 
         # Create the PSy-layer
         # TODO: issue #1629 replace invoke_info with alg and kern psyir
         psy = PSyFactory(api, distributed_memory=distributed_memory)\
             .create(invoke_info)
+        timer.end_stage("psy_creation")
 
         if script_name is not None:
             # Call the optimisation script for psy-layer optimisations
             recipe, _, _ = load_script(script_name)
             recipe(psy.container.root)
+            timer.end_stage("psy_script")
 
     # TODO issue #1618 remove Alg class and tests from PSyclone
     if api in LFRIC_API_NAMES and not LFRIC_TESTING:
         alg_gen = Alg(ast, psy).gen
+        timer.end_stage("algorithm_output")
 
     # Add profiling nodes to schedule if automatic profiling has
     # been requested.
     for invoke in psy.invokes.invoke_list:
         Profiler.add_profile_nodes(invoke.schedule, Loop)
 
-    return alg_gen, psy.gen
+    psy_gen = psy.gen
+    timer.end_stage("psy_output")
+    return alg_gen, psy_gen
 
 
 def main(arguments):
@@ -437,6 +514,11 @@ def main(arguments):
     parser.add_argument(
         '-I', '--include', default=[], action="append",
         help='path to Fortran INCLUDE or module files')
+    parser.add_argument(
+        '--module-index', metavar='INDEX_FILE',
+        help='file in which to keep an index of the modules provided by the '
+        'files in the search paths. It is updated with any new or modified '
+        'files and speeds up finding modules in later invocations')
     parser.add_argument(
         '-l', '--limit', dest='limit', default='off',
         choices=['off', 'all', 'output'],
@@ -457,6 +539,12 @@ def main(arguments):
     # Code-transformation mode flags
     parser.add_argument('-o', metavar='OUTPUT_FILE',
                         help='(code-transformation mode) output file')
+    parser.add_argument('--result-cache', metavar='CACHE_DIR',
+                        help='(code-transformation mode) directory in which '
+                        'to cache the generated code. If the input file and '
+                        'everything else it depends on are unchanged, the '
+                        'cached code is used instead of processing the file '
+                        'again')
 
     # PSyKAl mode flags
     parser.add_argument('-api', '--psykal-dsl', metavar='DSL',
@@ -487,13 +575,18 @@ def main(arguments):
         choices=VALID_KERNEL_NAMING_SCHEMES,
         help='(psykal mode) naming scheme to use when re-naming transformed'
              ' kernels')
+    parser.add_argument(
+        '--timing', action='store_true',
+        help='(psykal mode) print the time taken by each stage of the '
+             'processing to stderr')
     parser.set_defaults(dist_mem=Config.get().distributed_memory)
 
     args = parser.parse_args(arguments)
 
     # Validate that the given arguments are for the right operation mode
     if not args.psykal_dsl:
-        if (args.oalg or args.opsy or args.okern or args.directory):
+        if (args.oalg or args.opsy or args.okern or args.directory or
+                args.timing):
             print(f"When using the code-transformation mode (with no -api or "
                   f"--psykal-dsl flags), the psykal-mode arguments must not be"
                   f" present in the command, but found {arguments}")
@@ -504,6 +597,11 @@ def main(arguments):
                   "(-api/--psykal-dsl flag), use the -oalg, -opsy, -okern to "
                   "specify the output destination of each psykal layer.")
             sys.exit(1)
+        if args.result_cache:
+            print("The '--result-cache' flag is only supported in the "
+                  "code-transformation mode (with no -api or --psykal-dsl "
+                  "flags).")
+            sys.exit(1)
 
     # If no config file name is specified, args.config is none
     # and config will load the default config file.
@@ -549,11 +647,15 @@ def main(arguments):
         print(str(err), file=sys.stderr)
         sys.exit(1)
 
+    if args.module_index:
+        ModuleManager.get().module_index_file = args.module_index
+
     if not args.psykal_dsl:
         code_transformation_mode(input_file=args.filename,
                                  recipe_file=args.script,
                                  output_file=args.o,
-                                 line_length=args.limit)
+                                 line_length=args.limit,
+                                 result_cache_path=args.result_cache)
     else:
         # PSyKAl-DSL mode
 
@@ -601,6 +703,11 @@ def main(arguments):
                   file=sys.stderr)
             traceback.print_exception(*sys.exc_info(), file=sys.stderr)
             sys.exit(1)
+        if args.timing:
+            print(f"Time taken by each stage of processing "
+                  f"'{args.filename}':", file=sys.stderr)
+            for stage, seconds in generate_timing().items():
+                print(f"  {stage}: {seconds:.3f}s", file=sys.stderr)
         if args.limit != 'off':
             # Limit the line length of the output Fortran to ensure it conforms
             # to the 132 characters mandated by the standard.
@@ -690,10 +797,15 @@ def add_builtins_use(fp2_tree, name):
 
 
 def code_transformation_mode(input_file, recipe_file, output_file,
-                             line_length="off"):
+                             line_length="off", result_cache_path=None):
     ''' Process the input_file with the recipe_file instructions and
     store it in the output_file.
 
+    If a result_cache_path is provided, the output is looked up in (and
+    afterwards stored to) a :py:class:`psyclone.result_cache.ResultCache`
+    in that directory, so that an unchanged input file is not processed
+    again.
+
     Note: there is some duplicated logic in the PSyKAl path, we could attempt
     to merge them when adopting the LFRIC_TESTING PATH and removing the
     previous way.
@@ -706,8 +818,26 @@ def code_transformation_mode(input_file, recipe_file, output_file,
     :type output_file: Optional[str | os.PathLike]
     :param str line_length: set to "output" to break the output into lines
         of 123 chars, and to "all", to additionally check the input code.
+    :param result_cache_path: the directory of the result cache to use.
+    :type result_cache_path: Optional[str | os.PathLike]
 
     '''
+    result_cache = None
+    if result_cache_path:
+        result_cache = ResultCache(result_cache_path)
+        cache_key = result_cache.get_key(input_file, recipe_file, line_length)
+        output = result_cache.load(cache_key)
+        if output is not None:
+            if output_file:
+                with open(output_file, mode='w', encoding="utf8") as ofile:
+                    ofile.write(output)
+            else:
+                print(output, file=sys.stdout)
+            return
+        # Only record the files accessed for this input file (the
+        # ModuleManager is shared by all files processed by psyclone-batch).
+        ModuleManager.get().clear_accessed_files()
+
     # Load recipe file
     if recipe_file:
         trans_recipe, files_to_skip, resolve_mods = load_script(recipe_file)
@@ -742,17 +872,43 @@ def code_transformation_mode(input_file, recipe_file, output_file,
 
         # Generate Fortran (We can disable the backend copy because at this
         # point we also drop the PSyIR and we don't need to guarantee that
-        # is left unmodified)
-        output = FortranWriter(disable_copy=True)(psyir)
-        # Fix line_length if requested
+        # is left unmodified). The code is generated and written out in
+        # chunks (e.g. one routine at a time) so that the text of a large
+        # file is never held in memory more than once.
+        chunks = FortranWriter(disable_copy=True).stream(psyir)
+        # Fix line_length if requested (each chunk consists of complete
+        # lines, so the chunks can be processed independently)
         if line_length in ("output", "all"):
-            output = fll.process(output)
+            chunks = map(fll.process, chunks)
+
+        # The result cache needs the complete output
+        cached_chunks = [] if result_cache else None
 
         if output_file:
-            with open(output_file, mode='w', encoding="utf8") as ofile:
-                ofile.write(output)
+            try:
+                with open(output_file, mode='w', encoding="utf8") as ofile:
+                    for chunk in chunks:
+                        ofile.write(chunk)
+                        if result_cache:
+                            cached_chunks.append(chunk)
+            except Exception:
+                # Do not leave a partially written file behind
+                if os.path.isfile(output_file):
+                    os.remove(output_file)
+                raise
         else:
-            print(output, file=sys.stdout)
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+                if result_cache:
+                    cached_chunks.append(chunk)
+            sys.stdout.write("\n")
+
+        if result_cache:
+            mod_manager = ModuleManager.get()
+            result_cache.store(
+                cache_key, "".join(cached_chunks),
+                [input_file] + mod_manager.accessed_files,
+                mod_manager.search_paths, output_file)
     else:
         # Skip parsing and transformation and copy contents of file directly
         if output_file:
@@ -38,6 +38,7 @@
 '''
 
 from psyclone.parse.file_info import FileInfo, FileInfoFParserError
+from psyclone.parse.module_index import ModuleIndex
 from psyclone.parse.module_info import ModuleInfo, ModuleInfoError
 from psyclone.parse.module_manager import ModuleManager
 
@@ -46,6 +47,7 @@ from psyclone.parse.module_manager import ModuleManager
 __all__ = [
         'FileInfo',
         'FileInfoFParserError',
+        'ModuleIndex',
         'ModuleInfo',
         'ModuleInfoError',
         'ModuleManager'
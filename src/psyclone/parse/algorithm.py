@@ -56,7 +56,7 @@ from fparser.two.Fortran2003 import Main_Program, Module, \
 from psyclone.configuration import Config, LFRIC_API_NAMES
 from psyclone.errors import InternalError
 from psyclone.parse.kernel import BuiltInKernelTypeFactory, get_kernel_ast, \
-    KernelTypeFactory
+    KernelCache, KernelTypeFactory
 from psyclone.parse.utils import check_api, check_line_length, ParseError, \
     parse_fp2
 from psyclone.psyir.frontend.fortran import FortranReader
@@ -68,7 +68,7 @@ from psyclone.psyir.frontend.fortran import FortranReader
 
 
 def parse(alg_filename, api="", invoke_name="invoke", kernel_paths=None,
-          line_length=False):
+          line_length=False, kernel_cache=None):
     '''Takes a PSyclone conformant algorithm file as input and outputs a
     parse tree of the code contained therein and an object containing
     information about the 'invoke' calls in the algorithm file and any
@@ -89,6 +89,9 @@ def parse(alg_filename, api="", invoke_name="invoke", kernel_paths=None,
         the input (algorithm and kernel) code is checked to make sure \
         that it conforms and an error raised if not. The default is \
         False.
+    :param kernel_cache: the cache of parsed kernel files to use. If \
+        None, a new cache is created for this algorithm file.
+    :type kernel_cache: Optional[:py:class:`psyclone.parse.kernel.KernelCache`]
 
     :returns: 2-tuple consisting of the fparser2 parse tree of the \
         Algorithm file and an object holding details of the invokes \
@@ -106,7 +109,8 @@ def parse(alg_filename, api="", invoke_name="invoke", kernel_paths=None,
         kernel_paths = []
     # Parsing is encapsulated in the Parser class. We keep this
     # function for compatibility.
-    my_parser = Parser(api, invoke_name, kernel_paths, line_length)
+    my_parser = Parser(api, invoke_name, kernel_paths, line_length,
+                       kernel_cache)
     return my_parser.parse(alg_filename)
 
 
@@ -128,6 +132,10 @@ class Parser():
         the input (algorithm and kernel) code is checked to make sure \
         that it conforms and an error raised if not. The default is \
         False.
+    :param kernel_cache: the cache of parsed kernel files to use. If \
+        None, a new cache is created, so each kernel file is parsed only \
+        once by this parser.
+    :type kernel_cache: Optional[:py:class:`psyclone.parse.kernel.KernelCache`]
 
     For example:
 
@@ -138,7 +146,7 @@ class Parser():
     '''
 
     def __init__(self, api="", invoke_name="invoke", kernel_paths=None,
-                 line_length=False):
+                 line_length=False, kernel_cache=None):
 
         self._invoke_name = invoke_name
         if kernel_paths is None:
@@ -146,6 +154,9 @@ class Parser():
         else:
             self._kernel_paths = kernel_paths
         self._line_length = line_length
+        if kernel_cache is None:
+            kernel_cache = KernelCache()
+        self._kernel_cache = kernel_cache
 
         check_api(api)
         self._api = api
@@ -447,7 +458,8 @@ class Parser():
             raise ParseError(message) from info
 
         modast = get_kernel_ast(module_name, self._alg_filename,
-                                self._kernel_paths, self._line_length)
+                                self._kernel_paths, self._line_length,
+                                self._kernel_cache)
         return KernelCall(module_name,
                           KernelTypeFactory(api=self._api).create(
                               modast, name=kernel_name), args)
@@ -40,8 +40,13 @@
 
 import hashlib
 import copy
+import io
 import os
 import pickle
+import time
+from typing import Optional
+import uuid
+import zlib
 
 from fparser.two import Fortran2003
 from fparser.two.parser import ParserFactory
@@ -51,6 +56,7 @@ from psyclone.configuration import Config
 from psyclone.psyir.nodes import FileContainer
 from psyclone.errors import PSycloneError
 from psyclone.psyir.frontend.fparser2 import Fparser2Reader
+from psyclone.version import __VERSION__
 
 
 class FileInfoFParserError(PSycloneError):
@@ -64,16 +70,71 @@ class FileInfoFParserError(PSycloneError):
 class _CacheFileInfo:
     """Class which is used to store all information
     which can be cached to a file and read back from a file.
+
+    Besides the hash sum of the source code, each cache entry stores a
+    fingerprint of everything else the cached representations depend on
+    (the layout of this class, the PSyclone version and the relevant
+    configuration settings). A cache entry is only used if both match.
+
+    In a cache file, the pickled object is preceded by a header consisting
+    of `MAGIC` and the MD5 digest of the pickled data. This allows
+    detecting truncated or otherwise damaged cache files before
+    unpickling them.
     """
+
+    #: Version of the cache file layout. This must be increased whenever
+    #: the content of this class changes in an incompatible way.
+    CACHE_VERSION = 3
+
+    #: Marker at the start of each cache file.
+    MAGIC = b"PSyclone cache\n"
+
+    #: Number of seconds after which a temporary cache file is considered
+    #: to be left over from a process that was aborted while writing it.
+    STALE_TMP_FILE_AGE = 3600
+
+    #: Name of the file in a cache directory that stores an estimate of the
+    #: total size of the cache files and the number of cache files written
+    #: since the directory was last scanned.
+    SIZE_FILE = "total_size.psycache.txt"
+
+    #: Once the maximum size of a cache directory is exceeded, cache files
+    #: are removed until the total size is at most this fraction of the
+    #: maximum size, so that the directory does not need to be scanned
+    #: again for the next cache files written.
+    EVICTION_TARGET = 0.9
+
+    #: The cache directory is scanned at least once per this many cache
+    #: files written, since the estimate of its size does not include
+    #: updates that are lost when several processes write at the same time.
+    SCAN_INTERVAL = 1000
+
     def __init__(self):
         # Hash sum
         self._source_code_hash_sum: hashlib._Hash = None
 
+        # Fingerprint of the PSyclone version and configuration
+        self._fingerprint: tuple = self.get_fingerprint()
+
         # Fparser tree
         self._fparser_tree: Fortran2003.Program = None
 
-        # Psyir node
-        self._psyir_node: FileContainer = None
+        # Psyir node, stored as compressed pickle data. The PSyIR is
+        # serialised as soon as it has been created so that the cache
+        # holds the output of the frontend rather than a tree that was
+        # subsequently modified.
+        self._psyir_data: bytes = None
+
+    @staticmethod
+    def get_fingerprint() -> tuple:
+        """
+        :returns: a fingerprint of the cache layout, the PSyclone version
+            and the configuration settings that affect the fparser tree
+            and the PSyIR created from a source file.
+        """
+        config = Config.get()
+        return (_CacheFileInfo.CACHE_VERSION, __VERSION__,
+                config.fortran_standard, tuple(config.include_paths))
 
 
 class FileInfo:
@@ -81,7 +142,7 @@ class FileInfo:
     - it stores the original filename
     - it will read the source of the file and cache it
     - it will parse it with fparser and cache it
-    - it will construct the PSyIR (depends on TODO #2786 "and cache it")
+    - it will construct the PSyIR and cache it
 
     :param filepath: Path to the file that this
         object holds information on. Can also be set to 'None' in case of
@@ -93,12 +154,18 @@ class FileInfo:
         This allows using, e.g., `~/.cache/psyclone` as a cache
         directory for all cached files.
         See _get_filepath_cache() for more information.
+    :param cache_max_size: Maximum total size (in bytes) of all cache
+        files in `cache_path`. Whenever a cache file is written and the
+        limit is exceeded, the least recently used cache files are
+        removed. If `None`, the size of the cache is not limited. This is
+        ignored if no `cache_path` is provided.
 
     """
     def __init__(self,
                  filepath: str,
                  cache_active: bool = False,
-                 cache_path: str = None
+                 cache_path: str = None,
+                 cache_max_size: int = None
                  ):
 
         # Full path to file
@@ -110,6 +177,9 @@ class FileInfo:
         # Cache filepath
         self._cache_path = cache_path
 
+        # Maximum size of all files in the cache directory
+        self._cache_max_size = cache_max_size
+
         # Source code:
         self._source_code: str = None
 
@@ -206,6 +276,53 @@ class FileInfo:
         '''
         return self._filename
 
+    @property
+    def source_code_loaded(self) -> bool:
+        '''
+        :returns: whether the source code of this file has been read.
+        '''
+        return self._source_code is not None
+
+    @property
+    def fparser_tree_created(self) -> bool:
+        '''
+        :returns: whether the fparser tree of this file has been created
+            (or loaded from the cache).
+        '''
+        return self._fparser_tree is not None
+
+    @property
+    def psyir_created(self) -> bool:
+        '''
+        :returns: whether the PSyIR of this file has been created (or
+            loaded from the cache).
+        '''
+        return self._psyir_node is not None
+
+    def set_results(
+            self,
+            source_code: str,
+            fparser_tree: Fortran2003.Program = None,
+            psyir_node: FileContainer = None
+    ) -> None:
+        '''Stores the source code and the fparser tree and/or PSyIR of
+        this file if they have been created elsewhere, e.g. by a worker
+        process of the ModuleManager.
+
+        :param source_code: the source code of this file.
+        :param fparser_tree: the fparser tree of this file, if available.
+        :param psyir_node: the PSyIR of this file, if available.
+
+        '''
+        self._source_code = source_code
+        if self._cache_active:
+            self._source_code_hash_sum = hashlib.md5(
+                self._source_code.encode()).hexdigest()
+        if fparser_tree is not None:
+            self._fparser_tree = fparser_tree
+        if psyir_node is not None:
+            self._psyir_node = psyir_node
+
     def get_source_code(self, verbose: bool = False) -> str:
         '''Returns the source code of the file. The first time, it
         will be read from the file, but the data is then cached.
@@ -262,12 +379,13 @@ class FileInfo:
         verbose: bool = False,
         indent: str = ""
     ) -> _CacheFileInfo:
-        """Load fparser parse tree from the cache file if possible.
+        """Load fparser parse tree and PSyIR from the cache file if possible.
 
         This also checks for matching checksums after loading the data
         from the cache.
         The checksum is based solely on a hashsum of the source code itself,
-        see code below.
+        see code below. Cache files written by a different version of
+        PSyclone or with a different configuration are ignored.
 
         :param verbose: Produce some verbose output
         """
@@ -283,31 +401,44 @@ class FileInfo:
         if self._cache_data_load is not None:
             return self._cache_data_load
 
-        # Load cache file.
-        # Warning: There could be race conditions, e.g., in parallel builds.
-        # In the worst case some content is read which is incomplete or
-        # basically garbage. This will lead either to an Exception from the
-        # unpickling or a non-matching checksum which is both caught below.
+        # Load cache file. No locking is required since cache files are
+        # only ever replaced atomically (see _cache_save), so even in
+        # parallel builds we either read a complete cache file or none.
+        cache_filepath = self._get_cache_filepath()
         try:
-            filehandler = open(self._get_cache_filepath(), "rb")
+            with open(cache_filepath, "rb") as filehandler:
+                data = filehandler.read()
             if verbose:
                 # TODO #11: Use logging for this
                 print(
                     f"{indent}- Using cache file "
-                    f"'{self._get_cache_filepath()}'"
+                    f"'{cache_filepath}'"
                 )
-        except FileNotFoundError:
+        except OSError:
             if verbose:
                 # TODO #11: Use logging for this
                 print(
                     f"{indent}- No cache file "
-                    f"'{self._get_cache_filepath()}' found"
+                    f"'{cache_filepath}' found"
                 )
             return None
 
+        # Verify the integrity of the cache file (which could e.g. have
+        # been damaged by a full disk) before unpickling it.
+        header_size = len(_CacheFileInfo.MAGIC) + hashlib.md5().digest_size
+        payload = data[header_size:]
+        if (not data.startswith(_CacheFileInfo.MAGIC) or
+                data[len(_CacheFileInfo.MAGIC):header_size] !=
+                hashlib.md5(payload).digest()):
+            if verbose:
+                # TODO #11: Use logging for this
+                print(f"{indent}  - Cache file is damaged or has an "
+                      f"unknown format - ignoring")
+            return None
+
         # Unpack cache file
         try:
-            cache: _CacheFileInfo = pickle.load(filehandler)
+            cache: _CacheFileInfo = pickle.loads(payload)
         except Exception as ex:
             print(f"{indent}  - Error while reading cache file -"
                   f" ignoring: {str(ex)}"
@@ -325,6 +456,28 @@ class FileInfo:
                 )
             return None
 
+        # Verify that the cache was created by the same version of PSyclone
+        # with the same configuration. (Cache files of older versions do not
+        # store a fingerprint at all.)
+        fingerprint = getattr(cache, "_fingerprint", None)
+        if fingerprint != _CacheFileInfo.get_fingerprint():
+            if verbose:
+                # TODO #11: Use logging for this
+                print(
+                    f"  - Cache fingerprint mismatch: "
+                    f"expected {_CacheFileInfo.get_fingerprint()} "
+                    f"vs. cache {fingerprint}"
+                )
+            return None
+
+        if self._cache_path is not None:
+            # Mark the cache file as recently used, this determines which
+            # files are removed first if the cache directory is too large.
+            try:
+                os.utime(cache_filepath)
+            except OSError:
+                pass
+
         self._cache_data_load = cache
 
     def _cache_save(
@@ -333,9 +486,9 @@ class FileInfo:
     ) -> None:
         """Save the following elements to a cache file:
         - hash sum of code
+        - fingerprint of the PSyclone version and configuration
         - fparser tree
-        - in future work, potentially also psyir nodes too
-          (requires TODO #2786).
+        - psyir nodes (as compressed pickle data)
 
         :param verbose: Produce some verbose output
         """
@@ -353,6 +506,13 @@ class FileInfo:
             self._cache_data_save = _CacheFileInfo()
             self._cache_data_save._source_code_hash_sum = (
                 self._source_code_hash_sum)
+            if self._cache_data_load is not None:
+                # Keep what is already stored in the cache file so that
+                # only new content triggers an update.
+                self._cache_data_save._fparser_tree = (
+                    self._cache_data_load._fparser_tree)
+                self._cache_data_save._psyir_data = (
+                    self._cache_data_load._psyir_data)
 
         if (
             self._cache_data_save._fparser_tree is None
@@ -372,55 +532,63 @@ class FileInfo:
                 copy.deepcopy(self._fparser_tree)
             cache_updated = True
 
-        if self._cache_data_save._psyir_node is None and (
+        if self._cache_data_save._psyir_data is None and (
                 self._psyir_node is not None):
-            # TODO #2786: Serialization of psyir tree not possible
-            #
-            # E.g., this call fails: copy.deepcopy(self._psyir_node)
-            #
-            # Uncomment this code if serialization of psyir tree is
-            # possible and it will work.
-            # self._cache._psyir_node = copy.deepcopy(self._psyir_node)
-            # cache_updated = True
-            pass
+            # The PSyIR is serialised right away (rather than deep-copied)
+            # since this is both a snapshot of the current tree and a much
+            # more compact representation than the tree itself.
+            try:
+                self._cache_data_save._psyir_data = zlib.compress(
+                    pickle.dumps(self._psyir_node,
+                                 protocol=pickle.HIGHEST_PROTOCOL))
+                cache_updated = True
+            except Exception as err:
+                # E.g. a RecursionError for very deeply nested trees. The
+                # fparser tree can still be cached.
+                if verbose:
+                    # TODO #11: Use logging for this
+                    print("  - Unable to serialise PSyIR - ignoring: " +
+                          str(err))
 
         if not cache_updated:
             return None
 
-        # Open cache file
+        # Serialise the cache data. This is done before creating the cache
+        # file so that no incomplete cache file is left behind if it fails.
         try:
-            # Atomically attempt to open the new kernel file (in case
-            # this is part of a parallel build)
-            # We first remove the cache file and then open it.
-            # If the file exists, it throws an exception.
-            # This is not a perfect solution, but avoids parallel
-            # writing access of the same file.
-
-            # We first remove a potentially existing file.
-            try:
-                os.remove(self._get_cache_filepath())
-            except FileNotFoundError:
-                pass
-
-            # Then we open it in exclusive mode.
-            # If it already exists, an exception would be raised.
-            fd = os.open(self._get_cache_filepath(),
-                         os.O_CREAT | os.O_WRONLY | os.O_EXCL)
-
-            filehandler = os.fdopen(fd, "wb")
+            buffer = io.BytesIO()
+            pickle.dump(self._cache_data_save, buffer,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+            payload = buffer.getvalue()
         except Exception as err:
-            if verbose:
-                # TODO #11: Use logging for this
-                print("  - Unable to write to cache file: " + str(err))
+            # Invalidate cache
+            self._cache_data_save = None
+            print("Error while storing cache data - ignoring: " + str(err))
             return None
 
-        # Dump to cache file
+        # Write the cache data to a uniquely-named temporary file which is
+        # then renamed to the cache file. The renaming is atomic so that
+        # other processes (e.g. in parallel builds) never see an incomplete
+        # cache file. If several processes update the same cache file, the
+        # last one wins, which is fine since all of them write equivalent
+        # data.
+        cache_filepath = self._get_cache_filepath()
+        tmp_filepath = f"{cache_filepath}.{uuid.uuid4().hex}.tmp"
         try:
-            pickle.dump(self._cache_data_save, filehandler)
+            fd = os.open(tmp_filepath, os.O_CREAT | os.O_WRONLY | os.O_EXCL)
+            try:
+                with os.fdopen(fd, "wb") as filehandler:
+                    filehandler.write(_CacheFileInfo.MAGIC)
+                    filehandler.write(hashlib.md5(payload).digest())
+                    filehandler.write(payload)
+                os.replace(tmp_filepath, cache_filepath)
+            except Exception:
+                os.remove(tmp_filepath)
+                raise
         except Exception as err:
-            # Invalidate cache
-            self._cache_data_save = None
-            print("Error while storing cache data - ignoring: " + str(err))
+            if verbose:
+                # TODO #11: Use logging for this
+                print("  - Unable to write to cache file: " + str(err))
             return None
 
         if verbose:
@@ -429,6 +597,137 @@ class FileInfo:
                 f"hashsum '{self._cache_data_save._source_code_hash_sum}"
             )
 
+        if self._cache_path is not None and self._cache_max_size is not None:
+            self._update_cache_size(
+                self._cache_path, self._cache_max_size,
+                len(_CacheFileInfo.MAGIC) + 16 + len(payload),
+                verbose=verbose)
+
+    @staticmethod
+    def _update_cache_size(cache_path: str, max_size: int, added_size: int,
+                           verbose: bool = False) -> None:
+        """Adds the size of a newly written cache file to the estimate of
+        the total size of the cache files in the given cache directory
+        (which is stored in the directory, see `_CacheFileInfo.SIZE_FILE`).
+        Scanning the directory and removing the least recently used files
+        (see `_evict_cache_files`) is only done if the estimate exceeds
+        `max_size`, if there is no valid estimate, or once per
+        `_CacheFileInfo.SCAN_INTERVAL` files written, so that writing a
+        cache file does not require accessing all other cache files.
+
+        :param cache_path: the cache directory.
+        :param max_size: the maximum total size (in bytes) of all cache
+            files.
+        :param added_size: the size (in bytes) of the cache file written.
+        :param verbose: Produce some verbose output
+        """
+        size_filepath = os.path.join(cache_path, _CacheFileInfo.SIZE_FILE)
+        try:
+            with open(size_filepath, "r", encoding="utf-8") as fin:
+                total_size, num_writes = (int(value) for value
+                                          in fin.read().split())
+            total_size += added_size
+            num_writes += 1
+        except (OSError, ValueError):
+            # No (valid) estimate.
+            total_size = None
+
+        if (total_size is None or total_size > max_size or
+                num_writes >= _CacheFileInfo.SCAN_INTERVAL):
+            total_size = FileInfo._evict_cache_files(
+                cache_path, max_size,
+                target_size=int(max_size * _CacheFileInfo.EVICTION_TARGET),
+                verbose=verbose)
+            if total_size is None:
+                return
+            num_writes = 0
+
+        # The estimate is updated in the same way as the cache files. If
+        # several processes do this at the same time, only the last update
+        # is kept, so the estimate can be too low until the next scan.
+        tmp_filepath = f"{size_filepath}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_filepath, "w", encoding="utf-8") as fout:
+                fout.write(f"{total_size} {num_writes}\n")
+            os.replace(tmp_filepath, size_filepath)
+        except OSError as err:
+            if verbose:
+                # TODO #11: Use logging for this
+                print("  - Unable to update cache size: " + str(err))
+            try:
+                os.remove(tmp_filepath)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _evict_cache_files(cache_path: str, max_size: int,
+                           target_size: Optional[int] = None,
+                           verbose: bool = False) -> Optional[int]:
+        """Removes the least recently used cache files from the given cache
+        directory if the total size of all cache files exceeds `max_size`,
+        until it does not exceed `target_size`. Temporary files left over
+        by aborted processes are removed as well. This is safe to do while
+        other processes use the same cache directory: a cache file that was
+        already opened can still be read, and a removed cache file is
+        simply re-created.
+
+        :param cache_path: the cache directory.
+        :param max_size: the maximum total size (in bytes) of all cache
+            files.
+        :param target_size: the total size (in bytes) to which the cache
+            files are reduced if `max_size` is exceeded. Defaults to
+            `max_size`.
+        :param verbose: Produce some verbose output
+
+        :returns: the total size of the remaining cache files, or None if
+            the cache directory could not be scanned.
+        """
+        if target_size is None:
+            target_size = max_size
+        cache_files = []
+        total_size = 0
+        now = time.time()
+        try:
+            with os.scandir(cache_path) as all_entries:
+                for entry in all_entries:
+                    try:
+                        stat = entry.stat()
+                        if entry.name.endswith(".psycache"):
+                            cache_files.append((stat.st_mtime,
+                                                stat.st_size, entry.path))
+                            total_size += stat.st_size
+                        elif (entry.name.endswith(".tmp") and
+                              ".psycache." in entry.name and
+                              now - stat.st_mtime >
+                              _CacheFileInfo.STALE_TMP_FILE_AGE):
+                            os.remove(entry.path)
+                    except OSError:
+                        # The file was removed by another process.
+                        pass
+        except OSError as err:
+            if verbose:
+                # TODO #11: Use logging for this
+                print("  - Unable to scan cache directory: " + str(err))
+            return None
+
+        if total_size <= max_size:
+            return total_size
+
+        # Remove the least recently used files first.
+        cache_files.sort()
+        for _, size, path in cache_files:
+            if total_size <= target_size:
+                break
+            try:
+                os.remove(path)
+                if verbose:
+                    # TODO #11: Use logging for this
+                    print(f"  - Removed cache file '{path}'")
+            except OSError:
+                pass
+            total_size -= size
+        return total_size
+
     def get_fparser_tree(
                 self,
                 verbose: bool = False,
@@ -523,25 +822,31 @@ class FileInfo:
         self._cache_load(verbose=verbose, indent=indent)
 
         if self._cache_data_load is not None:
-            if self._cache_data_load._psyir_node is not None:
+            if self._cache_data_load._psyir_data is not None:
                 # Use cached version
                 if verbose:
                     # TODO #11: Use logging for this
                     print(f"{indent}- Using cache of PSyIR")
 
-                self._psyir_node = self._cache_data_load._psyir_node
-                return self._psyir_node
+                try:
+                    self._psyir_node = pickle.loads(
+                        zlib.decompress(self._cache_data_load._psyir_data))
+                    return self._psyir_node
+                except Exception as err:
+                    # Fall back to creating the PSyIR from scratch
+                    print(f"{indent}  - Error while reading cached PSyIR -"
+                          f" ignoring: {str(err)}")
 
         if verbose:
             # TODO #11: Use logging for this
             print(f"{indent}- Running psyir for '{self._filename}'")
 
         # First, we get the fparser tree
+        # The cache is only written once the PSyIR is available so
+        # that both are stored in a single update.
         fparse_tree = self.get_fparser_tree(
                 verbose=verbose,
-                # TODO #2786: If this TODO is resolved, set this to False
-                # and uncomment the self._cache_save below.
-                save_to_cache_if_cache_active=True
+                save_to_cache_if_cache_active=False
             )
 
         # We generate PSyIR from the fparser tree
@@ -549,7 +854,6 @@ class FileInfo:
         processor = self._processor = Fparser2Reader()
         self._psyir_node = processor.generate_psyir(fparse_tree, filename)
 
-        # TODO #2786: Uncomment if psyir nodes are serializable
-        # self._cache_save(verbose=verbose)
+        self._cache_save(verbose=verbose)
 
         return self._psyir_node
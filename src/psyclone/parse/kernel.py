@@ -59,6 +59,7 @@ from fparser.one import parsefortran
 import psyclone.expression as expr
 from psyclone.errors import InternalError
 from psyclone.configuration import Config, LFRIC_API_NAMES, GOCEAN_API_NAMES
+from psyclone.parse.module_manager import ModuleManager
 from psyclone.parse.utils import check_api, check_line_length, ParseError
 
 
@@ -69,7 +70,9 @@ def get_kernel_filepath(module_name, kernel_paths, alg_filename):
 
     Look in the directories and all subdirectories associated with the
     supplied kernel paths or in the same directory as the algorithm
-    file if not found within the kernel paths.
+    file if not found within the kernel paths. The files in each kernel
+    path are only listed once per process (see
+    :py:meth:`psyclone.parse.ModuleManager.get_files_by_name`).
 
     Return the filepath if the file is found.
 
@@ -114,12 +117,10 @@ def get_kernel_filepath(module_name, kernel_paths, alg_filename):
                 f"does not exist or cannot be read: {cdir}")
 
         # Recursively search down through the directory tree starting
-        # at the specified path.
-        for root, _, filenames in os.walk(cdir):
-            for filename in filenames:
-                # perform a case insensitive match
-                if filename.lower() == search_string.lower():
-                    matches.append(os.path.join(root, filename))
+        # at the specified path (performing a case insensitive match).
+        # The ModuleManager only walks each directory tree once.
+        matches.extend(ModuleManager.get().get_files_by_name(search_string,
+                                                             cdir))
     if not kernel_paths:
         # Look *only* in the directory that contained the algorithm
         # file.
@@ -177,14 +178,16 @@ def get_kernel_parse_tree(filepath):
     return parse_tree
 
 
-def get_kernel_ast(module_name, alg_filename, kernel_paths, line_length):
+def get_kernel_ast(module_name, alg_filename, kernel_paths, line_length,
+                   kernel_cache=None):
     '''Search for the kernel source code containing a module with the name
     'module_name' looking in the directory and subdirectories
     associated with the supplied 'kernel_paths' or in the same
     directory as the 'algorithm_filename' if the kernel path is
     empty. If the file is found then check it conforms to the
     'line_length' restriction if this is set and then parse this file
-    and return the parsed file.
+    (unless it has already been parsed and is in the supplied
+    kernel cache) and return the parsed file.
 
     :param str module_name: the name of the module to search for.
     :param str alg_filename: the name of the algorithm file.
@@ -194,6 +197,8 @@ def get_kernel_ast(module_name, alg_filename, kernel_paths, line_length):
     :param bool line_length: whether to check that the kernel code \
         conforms to the 132 character line length limit (True) or not \
         (False).
+    :param kernel_cache: the cache of parsed kernel files to use, if any.
+    :type kernel_cache: Optional[:py:class:`psyclone.parse.kernel.KernelCache`]
 
     :returns: Parse tree of the kernel module with the name 'module_name'.
     :rtype: :py:class:`fparser.one.block_statements.BeginSource`
@@ -202,10 +207,98 @@ def get_kernel_ast(module_name, alg_filename, kernel_paths, line_length):
     filepath = get_kernel_filepath(module_name, kernel_paths, alg_filename)
     if line_length:
         check_line_length(filepath)
+    if kernel_cache is not None:
+        return kernel_cache.get_parse_tree(filepath)
     parse_tree = get_kernel_parse_tree(filepath)
     return parse_tree
 
 
+class KernelCache():
+    '''A cache of parsed kernel files which is used during a single run of
+    PSyclone (e.g. by :py:func:`psyclone.generator.generate`), so that
+    each kernel file is only parsed once, however often its kernels are
+    called in the algorithm layer.
+
+    It stores the fparser1 parse tree of each kernel file, which is
+    shared by all kernel calls since it is only ever read (and fparser1
+    trees can not be copied), and the kernel PSyIR of each kernel, of
+    which every caller gets its own copy.
+
+    '''
+    def __init__(self):
+        # The fparser1 parse trees, indexed by the absolute file path.
+        self._parse_trees = {}
+        # The kernel PSyIRs, indexed by the absolute file path and the
+        # (lower-case) name of the kernel.
+        self._kernel_psyirs = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get_parse_tree(self, filepath):
+        '''
+        :param str filepath: the path to a kernel file.
+
+        :returns: the fparser1 parse tree of the kernel file, which must
+            not be modified.
+        :rtype: :py:class:`fparser.one.block_statements.BeginSource`
+
+        :raises ParseError: if fparser fails to parse the file.
+
+        '''
+        key = os.path.abspath(filepath)
+        parse_tree = self._parse_trees.get(key)
+        if parse_tree is None:
+            self._misses += 1
+            parse_tree = get_kernel_parse_tree(filepath)
+            self._parse_trees[key] = parse_tree
+        else:
+            self._hits += 1
+        return parse_tree
+
+    def get_kernel_psyir(self, filepath, kernel_name):
+        '''
+        :param str filepath: the path to a kernel file.
+        :param str kernel_name: the name of a kernel in this file.
+
+        :returns: a copy of the kernel PSyIR of the given kernel, or None
+            if it is not in the cache.
+        :rtype: Optional[:py:class:`psyclone.psyir.nodes.Node`]
+
+        '''
+        psyir = self._kernel_psyirs.get((os.path.abspath(filepath),
+                                         kernel_name.lower()))
+        if psyir is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return psyir.copy()
+
+    def add_kernel_psyir(self, filepath, kernel_name, psyir):
+        '''
+        Stores a copy of the kernel PSyIR of the given kernel.
+
+        :param str filepath: the path to the kernel file.
+        :param str kernel_name: the name of the kernel in this file.
+        :param psyir: the kernel PSyIR of the kernel.
+        :type psyir: :py:class:`psyclone.psyir.nodes.Node`
+
+        '''
+        self._kernel_psyirs[(os.path.abspath(filepath),
+                             kernel_name.lower())] = psyir.copy()
+
+    def cache_info(self):
+        '''
+        :returns: the statistics of this cache: the number of hits and
+            misses, and the number of cached parse trees and kernel PSyIRs.
+        :rtype: Dict[str, int]
+
+        '''
+        return {"hits": self._hits,
+                "misses": self._misses,
+                "parse_trees": len(self._parse_trees),
+                "kernel_psyirs": len(self._kernel_psyirs)}
+
+
 # pylint: disable=too-few-public-methods
 class KernelTypeFactory():
     '''Factory to create the required API-specific information about
@@ -0,0 +1,264 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module contains the ModuleIndex class, a persistent index of the
+Fortran modules that are provided and used by source files.
+
+'''
+
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from typing import Dict, Iterable, List
+
+from psyclone.parse.file_info import FileInfo
+
+
+class ModuleIndex:
+    '''
+    A persistent index that stores, for each source file, the names of the
+    Fortran modules it provides and uses. It is stored as a JSON file and
+    allows the ModuleManager to find the file containing a module without
+    reading any source files.
+
+    Each entry stores the modification time, the size and the hashsum of
+    the source file it was created from. If the modification time and the
+    size of a file are unchanged, its entry is used without reading the
+    file. Otherwise the file is read and, if its hashsum is unchanged (e.g.
+    because the file was only touched), the entry is kept. Only if the
+    content of a file changed is it scanned for modules again.
+
+    Like the rest of the ModuleManager, the index uses regular expressions
+    to find the modules in a file, so e.g. a module statement that is
+    split over several lines is not detected.
+
+    :param filename: the name of the index file. It is loaded if it
+        exists, and created when the index is saved.
+
+    '''
+    #: Version of the layout of the index file. This must be increased
+    #: whenever the content of the index changes in an incompatible way.
+    INDEX_VERSION = 1
+
+    # The regex used to find Fortran modules (see
+    # ModuleManager.get_modules_in_file).
+    _module_pattern = re.compile(r"^\s*module\s+([a-z]\S*)\s*$",
+                                 flags=(re.IGNORECASE | re.MULTILINE))
+
+    # The regex used to find the modules used in a file, e.g.
+    # "use a_mod, only: b" or "use, intrinsic :: iso_c_binding".
+    _use_pattern = re.compile(r"^\s*use\b\s*(?:,\s*(?:non_)?intrinsic\s*)?"
+                              r"(?:::)?\s*([a-z]\w*)",
+                              flags=(re.IGNORECASE | re.MULTILINE))
+
+    def __init__(self, filename: str):
+        self._filename = filename
+        # The entries of the index, indexed by the absolute path of each
+        # source file.
+        self._entries: Dict[str, dict] = {}
+        # Whether the index has been changed since it was loaded.
+        self._modified = False
+        self.load()
+
+    @property
+    def filename(self) -> str:
+        '''
+        :returns: the name of the index file.
+        '''
+        return self._filename
+
+    @staticmethod
+    def _is_valid_entry(entry) -> bool:
+        '''
+        :param entry: an entry read from the index file.
+
+        :returns: whether the entry has all the required values with the
+            expected types.
+        '''
+        if not isinstance(entry, dict):
+            return False
+        for key, value_type in [("mtime", int), ("size", int),
+                                ("hash", str)]:
+            if not isinstance(entry.get(key), value_type):
+                return False
+        for key in ["provides", "uses"]:
+            names = entry.get(key)
+            if not (isinstance(names, list) and
+                    all(isinstance(name, str) for name in names)):
+                return False
+        return True
+
+    def load(self) -> None:
+        '''
+        Loads the index file. A missing, damaged or outdated index file is
+        ignored (and replaced when the index is saved), as are damaged
+        entries (which are treated as missing).
+        '''
+        self._entries = {}
+        self._modified = False
+        try:
+            with open(self._filename, "r", encoding="utf-8") as file_in:
+                data = json.load(file_in)
+            if data["version"] != ModuleIndex.INDEX_VERSION:
+                return
+            entries = data["files"]
+            if not isinstance(entries, dict):
+                return
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        self._entries = {path: entry for path, entry in entries.items()
+                         if self._is_valid_entry(entry)}
+
+    def save(self) -> None:
+        '''
+        Writes the index file if the index was changed. The index is
+        written to a temporary file first and then renamed so that
+        concurrent PSyclone processes never read a partially written index.
+        If several processes update the index at the same time, the last
+        one wins.
+        '''
+        if not self._modified:
+            return
+        data = {"version": ModuleIndex.INDEX_VERSION,
+                "files": self._entries}
+        tmp_name = None
+        try:
+            index_dir = os.path.dirname(os.path.abspath(self._filename))
+            fd, tmp_name = tempfile.mkstemp(dir=index_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as file_out:
+                json.dump(data, file_out)
+            os.replace(tmp_name, self._filename)
+        except OSError as err:
+            if tmp_name:
+                try:
+                    os.remove(tmp_name)
+                except OSError:
+                    pass
+            # Failing to update the index must not stop PSyclone.
+            # TODO #11: Use logging for this
+            print(f"Unable to write module index '{self._filename}' - "
+                  f"ignoring: {err}", file=sys.stderr)
+            return
+        self._modified = False
+
+    @staticmethod
+    def _get_unique_names(pattern: re.Pattern, source_code: str) -> List[str]:
+        '''
+        :param pattern: the regex to search for.
+        :param source_code: the source code to search.
+
+        :returns: the lower-case names matched by the given regex, without
+            duplicates, in the order in which they first appear.
+        '''
+        return list(dict.fromkeys(name.lower() for name in
+                                  pattern.findall(source_code)))
+
+    def update_file(self, file_info: FileInfo) -> None:
+        '''
+        Makes sure that the entry for the given file is up to date, reading
+        (and scanning) the file only if required.
+
+        :param file_info: the file to update.
+        '''
+        path = os.path.abspath(file_info.filename)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._modified |= self._entries.pop(path, None) is not None
+            return
+        entry = self._entries.get(path)
+        if (entry and entry["mtime"] == stat.st_mtime_ns and
+                entry["size"] == stat.st_size):
+            return
+
+        source_code = file_info.get_source_code()
+        hash_sum = hashlib.md5(source_code.encode()).hexdigest()
+        if not entry or entry["hash"] != hash_sum:
+            entry = {
+                "hash": hash_sum,
+                "provides": self._get_unique_names(self._module_pattern,
+                                                   source_code),
+                "uses": self._get_unique_names(self._use_pattern,
+                                               source_code)}
+        entry["mtime"] = stat.st_mtime_ns
+        entry["size"] = stat.st_size
+        self._entries[path] = entry
+        self._modified = True
+
+    def update_directory(self, directory: str,
+                         file_infos: Iterable[FileInfo]) -> None:
+        '''
+        Updates the entries of all given files of a directory, and removes
+        the entries of all other files in this directory (e.g. files that
+        have been deleted).
+
+        :param directory: the directory.
+        :param file_infos: the files in the directory.
+        '''
+        paths = set()
+        for file_info in file_infos:
+            paths.add(os.path.abspath(file_info.filename))
+            self.update_file(file_info)
+        directory = os.path.abspath(directory)
+        for path in list(self._entries):
+            if os.path.dirname(path) == directory and path not in paths:
+                del self._entries[path]
+                self._modified = True
+
+    def get_provided_modules(self, filename: str) -> List[str]:
+        '''
+        :param filename: the name of a file in the index.
+
+        :returns: the names of the modules provided by the given file.
+
+        :raises KeyError: if the file is not in the index.
+        '''
+        return self._entries[os.path.abspath(filename)]["provides"]
+
+    def get_used_modules(self, filename: str) -> List[str]:
+        '''
+        :param filename: the name of a file in the index.
+
+        :returns: the names of the modules used by the given file.
+
+        :raises KeyError: if the file is not in the index.
+        '''
+        return self._entries[os.path.abspath(filename)]["uses"]
+
+
+# For AutoAPI documentation generation.
+__all__ = ["ModuleIndex"]
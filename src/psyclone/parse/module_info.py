@@ -134,6 +134,16 @@ class ModuleInfo:
         '''
         return self._file_info.filename
 
+    # ------------------------------------------------------------------------
+    @property
+    def file_info(self) -> FileInfo:
+        '''
+        :returns: the object holding information on the source file of this
+            module.
+
+        '''
+        return self._file_info
+
     # ------------------------------------------------------------------------
     def get_source_code(self):
         '''Returns the source code for the module using the associated
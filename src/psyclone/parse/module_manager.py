@@ -37,18 +37,75 @@
 which module is contained in which file (including full location). '''
 
 
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 import copy
 from difflib import SequenceMatcher
-from typing import Dict, Iterable, List, Set, Union, OrderedDict
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Union, OrderedDict
 import os
 import re
 
+from psyclone.configuration import Config
 from psyclone.errors import InternalError
 from psyclone.parse.file_info import FileInfo
+from psyclone.parse.module_index import ModuleIndex
 from psyclone.parse.module_info import ModuleInfo, ModuleInfoError
 from psyclone.psyir.nodes import Container, Node, Routine
 
 
+def _init_worker(config_file: Optional[str], include_paths: List[str]):
+    '''
+    Initialises a worker process of the ModuleManager. Workers that are
+    forked inherit the configuration of the main process, otherwise (e.g.
+    if worker processes are spawned) the same config file is loaded.
+
+    :param config_file: the config file used by the main process.
+    :param include_paths: the include paths used by the main process.
+
+    '''
+    if not Config.has_config_been_initialised():
+        config = Config.get(do_not_load_file=True)
+        config.load(config_file)
+        config.include_paths = include_paths
+
+
+def _process_file(
+        filename: str,
+        cache_active: bool,
+        cache_path: Optional[str],
+        cache_max_size: Optional[int],
+        create_psyir: bool
+) -> Optional[tuple]:
+    '''
+    Creates the fparser tree or the PSyIR of a file. This is executed in a
+    worker process of the ModuleManager, which also uses (and updates) the
+    cache if it is active.
+
+    :param filename: the name of the file to process.
+    :param cache_active: whether caching is active.
+    :param cache_path: the cache directory.
+    :param cache_max_size: the maximum size of the cache directory.
+    :param create_psyir: whether to create the PSyIR (otherwise only the
+        fparser tree is created).
+
+    :returns: the source code, the fparser tree (or None) and the PSyIR
+        (or None) of the file, or None if there was an error (which is
+        then reported when the file is processed again by the main process).
+
+    '''
+    file_info = FileInfo(filename, cache_active=cache_active,
+                         cache_path=cache_path, cache_max_size=cache_max_size)
+    # pylint: disable=broad-except
+    try:
+        if create_psyir:
+            psyir = file_info.get_psyir()
+            return (file_info.get_source_code(), None, psyir)
+        fparser_tree = file_info.get_fparser_tree()
+        return (file_info.get_source_code(), fparser_tree, None)
+    except Exception:
+        return None
+
+
 class ModuleManager:
     """
     This class implements a singleton that manages module
@@ -60,6 +117,8 @@ class ModuleManager:
     :param cache_path: Path to the cache directory. If `None`, the
         cache file will be created in the same directory as the source
         file with a new file ending `.psycache`.
+    :param cache_max_size: Maximum total size (in bytes) of the files in
+        the cache directory. If `None`, the size is not limited.
     """
 
     # Class variable to store the singleton instance
@@ -70,26 +129,32 @@ class ModuleManager:
     _threshold_similarity = 0.7
 
     @staticmethod
-    def get(cache_active: bool = None, cache_path: str = None):
+    def get(cache_active: bool = None, cache_path: str = None,
+            cache_max_size: int = None):
         '''Static function that if necessary creates and returns the singleton
         ModuleManager instance.
 
         :param use_caching: If `True`, a file-based caching of the fparser
             tree will be used. This can significantly accelerate obtaining
             a PSyIR from a source file.
-            For parallel builds, parallel race conditions to the cache file
-            can happen, but this shouldn't lead to wrong results. However,
-            that's untested so far.
+            The cache can be shared by many PSyclone processes (e.g. in
+            parallel builds): cache files are replaced atomically, and
+            each cache file contains a checksum so that damaged files
+            are ignored.
 
         :param cache_path: If set, the cache file will be stored in the given
             path (directory) using a hashsum of the source code to create
             a unique cache file name. If `None`, a cache file will be created
             in the same directory as the source file with a new
             file ending `.psycache`.
+        :param cache_max_size: If set, the least recently used files in the
+            cache path are removed whenever their total size exceeds the
+            given number of bytes.
 
         '''
         if not ModuleManager._instance:
-            ModuleManager._instance = ModuleManager(cache_active, cache_path)
+            ModuleManager._instance = ModuleManager(cache_active, cache_path,
+                                                    cache_max_size)
 
         return ModuleManager._instance
 
@@ -97,7 +162,8 @@ class ModuleManager:
     def __init__(
             self,
             cache_active: bool = None,
-            cache_path: str = None
+            cache_path: str = None,
+            cache_max_size: int = None
     ):
         """
         Set up the module manager. Module manager is actually a singleton
@@ -109,6 +175,8 @@ class ModuleManager:
         :param cache_path: Path to the cache directory. If `None`, the
             cache file will be created in the same directory as the source
             file with a new file ending `.psycache`.
+        :param cache_max_size: Maximum total size (in bytes) of the files in
+            the cache directory. If `None`, the size is not limited.
         """
 
         if ModuleManager._instance is not None:
@@ -122,6 +190,12 @@ class ModuleManager:
         # Path to cache
         self._cache_path: str = cache_path
 
+        # Maximum size of the cache directory
+        self._cache_max_size: int = cache_max_size
+
+        # Number of processes to use when processing many files
+        self._num_processes: int = 1
+
         self._visited_files = {}
 
         # The list of all search paths which have not yet all their files
@@ -144,11 +218,162 @@ class ModuleManager:
 
         self._ignore_modules = set()
 
+        # The persistent module index (if any, see module_index_file), the
+        # files of each module in the index (in the order of the search
+        # paths), the directories that have been indexed and the names of
+        # the files in these directories.
+        self._module_index: Optional[ModuleIndex] = None
+        self._indexed_modules: Dict[str, List[FileInfo]] = {}
+        self._indexed_dirs: Set[str] = set()
+        self._indexed_files: Set[str] = set()
+
+        # The files that have been accessed to find or read a module since
+        # clear_accessed_files was last called (see accessed_files).
+        self._accessed_files: Dict[str, int] = {}
+
+        # The files in each directory tree that has been walked (see
+        # get_files_by_name), indexed by the absolute path of the root
+        # directory and then by the lower-case file name.
+        self._file_name_index: Dict[str, Dict[str, List[str]]] = {}
+
         # Setup the regex used to find Fortran modules. Have to be careful not
         # to match e.g. "module procedure :: some_sub".
         self._module_pattern = re.compile(r"^\s*module\s+([a-z]\S*)\s*$",
                                           flags=(re.IGNORECASE | re.MULTILINE))
 
+    # ------------------------------------------------------------------------
+    @property
+    def num_processes(self) -> int:
+        '''
+        :returns: the number of processes (or threads) used to process many
+            files at once, e.g. by `create_all_fparser_trees`.
+        '''
+        return self._num_processes
+
+    @num_processes.setter
+    def num_processes(self, num_processes: int) -> None:
+        '''
+        Sets the number of processes used to process many files at once. A
+        value of 1 (the default) processes all files in the main process.
+
+        :param num_processes: the number of processes to use.
+
+        :raises TypeError: if num_processes is not an int.
+        :raises ValueError: if num_processes is less than 1.
+
+        '''
+        if not isinstance(num_processes, int):
+            raise TypeError(f"The number of processes must be an int but got "
+                            f"'{type(num_processes).__name__}'.")
+        if num_processes < 1:
+            raise ValueError(f"The number of processes must be at least 1 "
+                             f"but got {num_processes}.")
+        self._num_processes = num_processes
+
+    # ------------------------------------------------------------------------
+    @property
+    def module_index_file(self) -> Optional[str]:
+        '''
+        :returns: the name of the file storing the persistent module index,
+            or None if no module index is used.
+        '''
+        if self._module_index is None:
+            return None
+        return self._module_index.filename
+
+    @module_index_file.setter
+    def module_index_file(self, filename: Optional[str]) -> None:
+        '''
+        Sets the file storing the persistent module index (see
+        :py:class:`psyclone.parse.module_index.ModuleIndex`). The index is
+        loaded from this file if it exists. All search paths that are added
+        afterwards are indexed when they are added, and modules in these
+        search paths are then found with a dictionary lookup. A value of
+        None stops indexing any further search paths.
+
+        :param filename: the name of the index file or None.
+
+        :raises TypeError: if filename is not a str or None.
+
+        '''
+        if filename is None:
+            self._module_index = None
+            return
+        if not isinstance(filename, str):
+            raise TypeError(f"The module index file must be a str or None "
+                            f"but got '{type(filename).__name__}'.")
+        self._module_index = ModuleIndex(filename)
+
+    @property
+    def module_index(self) -> Optional[ModuleIndex]:
+        '''
+        :returns: the persistent module index, which also provides the names
+            of the modules used by each indexed file, or None if no module
+            index is used.
+        '''
+        return self._module_index
+
+    # ------------------------------------------------------------------------
+    @staticmethod
+    def _create_process_pool(num_workers: int) -> ProcessPoolExecutor:
+        '''
+        :param num_workers: the number of worker processes.
+
+        :returns: a pool of worker processes that use the same configuration
+            as this process.
+
+        '''
+        config = Config.get()
+        return ProcessPoolExecutor(
+            max_workers=num_workers, initializer=_init_worker,
+            initargs=(config.filename, config.include_paths))
+
+    # ------------------------------------------------------------------------
+    def _process_files_in_parallel(
+            self,
+            file_infos: Iterable[FileInfo],
+            create_psyir: bool,
+            verbose: bool = False
+    ) -> None:
+        '''
+        Creates the fparser trees (or the PSyIRs) of the given files using a
+        pool of worker processes and stores them in the FileInfo objects.
+        Files whose fparser tree or PSyIR has already been created are
+        skipped. Errors are not reported here: the affected files are
+        simply left unprocessed, so that the errors are raised when the
+        files are processed again by the caller.
+
+        :param file_infos: the files to process.
+        :param create_psyir: whether to create the PSyIR (otherwise only the
+            fparser tree is created).
+        :param verbose: If `True`, print verbose information
+
+        '''
+        if create_psyir:
+            todo = [finfo for finfo in file_infos if not finfo.psyir_created]
+        else:
+            todo = [finfo for finfo in file_infos
+                    if not finfo.fparser_tree_created]
+        if self._num_processes == 1 or len(todo) <= 1:
+            return
+
+        num_workers = min(self._num_processes, len(todo))
+        if verbose:
+            # TODO #11: Use logging for this
+            print(f"- Processing {len(todo)} files using {num_workers} "
+                  f"processes")
+        with self._create_process_pool(num_workers) as executor:
+            results = executor.map(
+                _process_file,
+                [finfo.filename for finfo in todo],
+                [self._cache_active] * len(todo),
+                [self._cache_path] * len(todo),
+                [self._cache_max_size] * len(todo),
+                [create_psyir] * len(todo))
+            for finfo, result in zip(todo, results):
+                if result is not None:
+                    finfo.set_results(*result)
+
     # ------------------------------------------------------------------------
     def add_search_path(self, directories, recursive=True):
         '''If the directory is not already contained in the search path,
@@ -161,35 +386,129 @@ class ModuleManager:
         :param bool recursive: whether recursively all subdirectories should
             be added to the search path.
 
+        If a module index is used (see `module_index_file`), all files in the
+        added directories are indexed right away (only new or modified files
+        are read) and the index file is updated.
+
         '''
         if isinstance(directories, str):
             # Make sure we always have a list
             directories = [directories]
 
+        new_dirs = []
         for directory in directories:
             if not os.access(directory, os.R_OK):
                 raise IOError(f"Directory '{directory}' does not exist or "
                               f"cannot be read.")
-            self._remaining_search_paths[directory] = 1
+            new_dirs.append(directory)
             self._original_search_paths.append(directory)
             if recursive:
-                for root, dirs, _ in os.walk(directory):
+                # The file names found while walking the directory tree
+                # are kept for get_files_by_name.
+                file_name_index = {}
+                for root, dirs, filenames in os.walk(directory):
                     for current_dir in dirs:
                         new_dir = os.path.join(root, current_dir)
-                        self._remaining_search_paths[new_dir] = 1
+                        new_dirs.append(new_dir)
                         self._original_search_paths.append(new_dir)
+                    self._add_to_file_name_index(file_name_index, root,
+                                                 filenames)
+                self._file_name_index[os.path.abspath(directory)] = \
+                    file_name_index
+
+        if self._module_index is None:
+            for directory in new_dirs:
+                self._remaining_search_paths[directory] = 1
+            return
+
+        for directory in new_dirs:
+            self._index_directory(directory)
+        self._module_index.save()
+
+    # ------------------------------------------------------------------------
+    @staticmethod
+    def _add_to_file_name_index(file_name_index: Dict[str, List[str]],
+                                root: str, filenames: Iterable[str]) -> None:
+        '''
+        Adds the given files to an index of file names.
+
+        :param file_name_index: the index, which maps each lower-case file
+            name to the absolute paths of all files with this name.
+        :param root: the directory containing the files.
+        :param filenames: the names of the files.
+
+        '''
+        root = os.path.abspath(root)
+        for filename in filenames:
+            file_name_index.setdefault(filename.lower(), []).append(
+                os.path.join(root, filename))
+
+    # ------------------------------------------------------------------------
+    def get_files_by_name(self, filename: str, directory: str) -> List[str]:
+        '''
+        Returns all files with the given name (compared case-insensitively)
+        in the given directory and all of its subdirectories. Each
+        directory tree is only walked once (and not at all if it has been
+        added as a recursive search path), so files that are created
+        afterwards are not found.
+
+        :param filename: the name of the files to find.
+        :param directory: the root of the directory tree to search.
+
+        :returns: the absolute paths of all matching files.
+
+        '''
+        directory = os.path.abspath(directory)
+        file_name_index = self._file_name_index.get(directory)
+        if file_name_index is None:
+            file_name_index = {}
+            for root, _, filenames in os.walk(directory):
+                self._add_to_file_name_index(file_name_index, root,
+                                             filenames)
+            self._file_name_index[directory] = file_name_index
+        return file_name_index.get(filename.lower(), [])
+
+    # ------------------------------------------------------------------------
+    def _index_directory(self, directory: str) -> None:
+        '''
+        Adds all files of the given directory to the module index (unless
+        the directory has already been indexed) and records which modules
+        they provide.
+
+        :param directory: the directory to index.
+
+        '''
+        if directory in self._indexed_dirs:
+            return
+        self._indexed_dirs.add(directory)
+        # The directory does not need to be searched anymore.
+        self._remaining_search_paths.pop(directory, None)
+        # All files must be passed to the index (including files that were
+        # found while searching the directory before the index was used),
+        # since the index drops the entries of any other files.
+        all_files = self._add_all_files_from_dir(directory,
+                                                 include_visited=True)
+        self._module_index.update_directory(directory, all_files)
+        for finfo in all_files:
+            self._indexed_files.add(finfo.filename)
+            for name in self._module_index.get_provided_modules(
+                    finfo.filename):
+                self._indexed_modules.setdefault(name, []).append(finfo)
 
     # ------------------------------------------------------------------------
-    def _add_all_files_from_dir(self, directory):
+    def _add_all_files_from_dir(self, directory, include_visited=False):
         '''This function creates (and caches) FileInfo objects for all files
         with an extension of (F/f/X/x)90 in the given directory that have
         not previously been visited. The new FileInfo objects are returned.
 
         :param str directory: the directory containing Fortran files
             to analyse.
+        :param bool include_visited: whether the (existing) FileInfo objects
+            of files that have previously been visited are returned as well.
 
         :returns: the FileInfo objects for any files that we have not
-                  previously visited.
+                  previously visited (or for all files if include_visited
+                  is True).
         :rtype: list[:py:class:`psyclone.parse.FileInfo` | None]
 
         '''
@@ -202,12 +521,15 @@ class ModuleManager:
                     continue
                 full_path = os.path.join(directory, entry.name)
                 if full_path in self._visited_files:
+                    if include_visited:
+                        new_files.append(self._visited_files[full_path])
                     continue
                 self._visited_files[full_path] = \
                     FileInfo(
                             full_path,
                             cache_active=self._cache_active,
-                            cache_path=self._cache_path
+                            cache_path=self._cache_path,
+                            cache_max_size=self._cache_max_size
                         )
                 new_files.append(self._visited_files[full_path])
         return new_files
@@ -283,15 +605,26 @@ class ModuleManager:
                 filepath,
                 cache_active=self._cache_active,
                 cache_path=self._cache_path,
+                cache_max_size=self._cache_max_size,
             )
 
     def load_all_source_files(self, verbose: bool = False) -> None:
         """Routine to load the source of all files previously added
-        to the module manager
+        to the module manager. If `num_processes` is larger than one,
+        the files are read concurrently by that many threads (since
+        reading files does not benefit from additional processes).
 
         :param verbose: If `True`, print verbose information
         """
 
+        if self._num_processes > 1:
+            with ThreadPoolExecutor(self._num_processes) as executor:
+                # Consume the results to raise any exceptions.
+                list(executor.map(
+                    lambda fileinfo: fileinfo.get_source_code(verbose),
+                    self._filepath_to_file_info.values()))
+            return
+
         for fileinfo in self._filepath_to_file_info.values():
             fileinfo: FileInfo
             fileinfo.get_source_code(verbose=verbose)
@@ -299,11 +632,14 @@ class ModuleManager:
     def create_all_fparser_trees(self, verbose: bool = False) -> None:
         """
         Routine to load the fparser tree of all files added
-        to the module manager
+        to the module manager. If `num_processes` is larger than one,
+        the files are parsed concurrently by that many processes.
 
         :param verbose: If `True`, print verbose information
         """
 
+        self._process_files_in_parallel(self._filepath_to_file_info.values(),
+                                        create_psyir=False, verbose=verbose)
         for fileinfo in self._filepath_to_file_info.values():
             fileinfo: FileInfo
             fileinfo.get_fparser_tree(verbose=verbose)
@@ -311,11 +647,14 @@ class ModuleManager:
     def create_all_psyir_nodes(self, verbose: bool = False) -> None:
         """
         Routine to create the psyir nodes of all files added
-        to the module manager
+        to the module manager. If `num_processes` is larger than one,
+        the files are processed concurrently by that many processes.
 
         :param verbose: If `True`, print verbose information
         """
 
+        self._process_files_in_parallel(self._filepath_to_file_info.values(),
+                                        create_psyir=True, verbose=verbose)
         for fileinfo in self._filepath_to_file_info.values():
             fileinfo: FileInfo
             fileinfo.get_psyir(verbose=verbose)
@@ -417,12 +756,69 @@ class ModuleManager:
         """
         return list(self._filepath_to_file_info.values())
 
+    @property
+    def all_read_files(self) -> List[str]:
+        """
+        :returns: the names of all files whose source code has been read
+            by the ModuleManager so far, e.g. while searching for a module.
+        """
+        all_files = {}
+        for file_info in chain(self._visited_files.values(),
+                               self._filepath_to_file_info.values()):
+            if file_info.source_code_loaded:
+                all_files[file_info.filename] = 1
+        return list(all_files)
+
+    @property
+    def accessed_files(self) -> List[str]:
+        """
+        :returns: the names of all files that have been accessed to find or
+            read a module (including files that were searched but did not
+            contain the module) since `clear_accessed_files` was last
+            called. Unlike `all_read_files`, this includes the files of
+            modules that had already been found before.
+        """
+        return list(self._accessed_files)
+
+    def clear_accessed_files(self) -> None:
+        """
+        Clears the list of accessed files (see `accessed_files`), e.g.
+        before processing another input file.
+        """
+        self._accessed_files.clear()
+
+    @property
+    def search_paths(self) -> List[str]:
+        """
+        :returns: all directories that have been added to the search path
+            (including the subdirectories of recursively added ones).
+        """
+        return list(dict.fromkeys(self._original_search_paths))
+
     def get_module_info(self, module_name: str) -> ModuleInfo:
         """This function returns the ModuleInfo for the specified
         module.
 
         :param module_name: Name of the module.
 
+        :returns: object describing the requested module or None if the
+                  manager has been configured to ignore this module.
+
+        :raises FileNotFoundError: if the module_name is not found in
+            either the cached data nor in the search path.
+
+        """
+        mod_info = self._find_module_info(module_name)
+        if mod_info:
+            self._accessed_files[mod_info.filename] = 1
+        return mod_info
+
+    def _find_module_info(self, module_name: str) -> ModuleInfo:
+        """Finds the ModuleInfo for the specified module (see
+        `get_module_info`).
+
+        :param module_name: Name of the module.
+
         :returns: object describing the requested module or None if the
                   manager has been configured to ignore this module.
 
@@ -441,10 +837,28 @@ class ModuleManager:
         mod_info: ModuleInfo = self._modules.get(mod_lower, None)
         if mod_info and mod_info.filename.endswith(".f90"):
             return mod_info
+
+        # If the module is in the module index, use the first file (in the
+        # order of the search paths) that does not require pre-processing,
+        # or otherwise the first file.
+        indexed_files = self._indexed_modules.get(mod_lower)
+        if indexed_files:
+            finfo = next((finfo for finfo in indexed_files
+                          if finfo.filename.endswith(".f90")),
+                         indexed_files[0])
+            if not mod_info or mod_info.file_info is not finfo:
+                mod_info = ModuleInfo(mod_lower, finfo)
+                self._modules[mod_lower] = mod_info
+            return mod_info
+
         old_mod_info = mod_info
-        # Are any of the files that we've already seen a good match?
-        mod_info = self._find_module_in_files(mod_lower,
-                                              self._visited_files.values())
+        # Are any of the files that we've already seen a good match? Files
+        # in the module index do not need to be searched again.
+        visited_files = self._visited_files.values()
+        if self._indexed_files:
+            visited_files = [finfo for finfo in visited_files
+                             if finfo.filename not in self._indexed_files]
+        mod_info = self._find_module_in_files(mod_lower, visited_files)
         if mod_info and mod_info.filename.endswith(".f90"):
             return mod_info
         old_mod_info = mod_info
@@ -487,6 +901,7 @@ class ModuleManager:
         #    my_mod
         # `finfo.get_source_code()` will read the file if it hasn't already
         # been cached.
+        self._accessed_files[finfo.filename] = 1
         mod_names = self._module_pattern.findall(finfo.get_source_code())
 
         return [name.lower() for name in mod_names]
@@ -511,6 +926,11 @@ class ModuleManager:
         be ignored (i.e. not listed in any dependencies).
         # TODO 2120: allow a choice to abort or ignore.
 
+        If `num_processes` is larger than one, the files of the modules
+        that still need to be handled are parsed concurrently by a pool of
+        that many processes. A single pool is used for the whole call, and
+        each module is submitted to it as soon as it is discovered.
+
         :param all_mod_names: the set of all module names for which
             to collect module dependencies.
 
@@ -529,51 +949,142 @@ class ModuleManager:
         # (to avoid adding them to the todo list again)
         not_found = set()
 
-        while todo:
-            # Pick one (random) module to handle (convert to lowercase
-            # in case that the code use inconsistent capitalisation)
-            module = todo.pop().lower()
+        # The modules whose files have been submitted to be parsed in
+        # advance (if more than one process is used), the pool of worker
+        # processes (which is only created once at least two files need to
+        # be parsed) and the pending results for each file.
+        prefetched = set()
+        executor = None
+        pending: Dict[str, Future] = {}
+
+        try:
+            while todo:
+                if self._num_processes > 1:
+                    executor = self._prefetch_fparser_trees(
+                        todo, prefetched, executor, pending)
+
+                # Pick one (random) module to handle (convert to lowercase
+                # in case that the code use inconsistent capitalisation)
+                module = todo.pop().lower()
+
+                # Ignore any modules that we were asked to ignore
+                if module in self.ignores():
+                    continue
+                try:
+                    mod_info = self.get_module_info(module)
+                    self._collect_prefetched(mod_info.file_info, pending)
+                    mod_deps = list(mod_info.get_used_module_names())
+                except (FileNotFoundError, ModuleInfoError):
+                    if module not in not_found:
+                        # We don't have any information about this module,
+                        # ignore it.
+                        # TODO 2120: allow a choice to abort or ignore.
+                        print(f"Could not find module '{module}'.")
+                        not_found.add(module)
+                        # Remove this module as dependencies from any other
+                        # module in our todo list, so the final result will
+                        # only contain known modules
+                        for dep in module_dependencies.values():
+                            if module in dep:
+                                dep.remove(module)
+                    continue
+
+                # Remove all dependencies which we don't know anything about:
+                mod_deps = [x for x in mod_deps if x not in not_found]
 
-            # Ignore any modules that we were asked to ignore
+                # Add the dependencies of `module` to the result dictionary:
+                module_dependencies[module] = mod_deps
+
+                # Remove all dependencies from the list of new dependencies
+                # of `module` that have already been handled:
+                module_dependencies_keys = module_dependencies.keys()
+                new_deps = [x for x in mod_deps
+                            if x not in module_dependencies_keys]
+
+                # Then append these really new modules to the list of modules
+                # that still need to be handled
+                for dep in new_deps:
+                    if dep not in todo:
+                        todo.append(dep)
+        finally:
+            if executor:
+                executor.shutdown()
+
+        return module_dependencies
+
+    # -------------------------------------------------------------------------
+    def _prefetch_fparser_trees(
+            self,
+            module_names: List[str],
+            prefetched: Set[str],
+            executor: Optional[ProcessPoolExecutor],
+            pending: Dict[str, Future]
+    ) -> Optional[ProcessPoolExecutor]:
+        '''Submits the files containing the given modules to a pool of
+        worker processes which create their fparser trees. Modules that are
+        ignored or can't be found, and files that have already been parsed
+        or submitted, are skipped. The pool is only created once there are
+        at least two files to parse (a single file is parsed as quickly by
+        this process).
+
+        :param module_names: the names of the modules.
+        :param prefetched: the names of the modules that have already been
+            handled. This set is updated with the given module names.
+        :param executor: the pool of worker processes, or None if it has not
+            been created yet.
+        :param pending: the results of the submitted files, indexed by the
+            file name. This dictionary is updated with the new files.
+
+        :returns: the pool of worker processes (if it has been created).
+
+        '''
+        file_infos = {}
+        for module in module_names:
+            module = module.lower()
+            if module in prefetched:
+                continue
+            prefetched.add(module)
             if module in self.ignores():
                 continue
             try:
-                mod_deps = self.get_module_info(module).get_used_module_names()
-                mod_deps = list(mod_deps)
-            except (FileNotFoundError, ModuleInfoError):
-                if module not in not_found:
-                    # We don't have any information about this module,
-                    # ignore it.
-                    # TODO 2120: allow a choice to abort or ignore.
-                    print(f"Could not find module '{module}'.")
-                    not_found.add(module)
-                    # Remove this module as dependencies from any other
-                    # module in our todo list, so the final result will
-                    # only contain known modules
-                    for dep in module_dependencies.values():
-                        if module in dep:
-                            dep.remove(module)
+                mod_info = self.get_module_info(module)
+            except FileNotFoundError:
                 continue
+            finfo = mod_info.file_info
+            if finfo.fparser_tree_created or finfo.filename in pending:
+                continue
+            file_infos[finfo.filename] = finfo
+        if not file_infos or (executor is None and len(file_infos) <= 1):
+            return executor
+        if executor is None:
+            executor = self._create_process_pool(self._num_processes)
+        for filename in file_infos:
+            pending[filename] = executor.submit(
+                _process_file, filename, self._cache_active,
+                self._cache_path, self._cache_max_size, False)
+        return executor
 
-            # Remove all dependencies which we don't know anything about:
-            mod_deps = [x for x in mod_deps if x not in not_found]
-
-            # Add the dependencies of `module` to the result dictionary:
-            module_dependencies[module] = mod_deps
-
-            # Remove all dependencies from the list of new dependencies
-            # of `module` that have already been handled:
-            module_dependencies_keys = module_dependencies.keys()
-            new_deps = [x for x in mod_deps
-                        if x not in module_dependencies_keys]
-
-            # Then append these really new modules to the list of modules
-            # that still need to be handled
-            for dep in new_deps:
-                if dep not in todo:
-                    todo.append(dep)
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _collect_prefetched(file_info: FileInfo,
+                            pending: Dict[str, Future]) -> None:
+        '''Waits for the fparser tree of the given file if the file has been
+        submitted to the pool of worker processes (see
+        `_prefetch_fparser_trees`) and stores it in the FileInfo object.
+        If the worker failed, nothing is stored so that the error is raised
+        when the file is parsed again by this process.
+
+        :param file_info: the file.
+        :param pending: the results of the submitted files, indexed by the
+            file name. The entry of the given file is removed.
 
-        return module_dependencies
+        '''
+        future = pending.pop(file_info.filename, None)
+        if future is None:
+            return
+        result = future.result()
+        if result is not None and not file_info.fparser_tree_created:
+            file_info.set_results(*result)
 
     # -------------------------------------------------------------------------
     def sort_modules(
@@ -42,8 +42,12 @@
     particular API and implementation. '''
 
 from dataclasses import dataclass
+import hashlib
 import inspect
+import json
 import os
+import sys
+import tempfile
 from collections import OrderedDict
 import abc
 from typing import Any, Dict
@@ -83,6 +87,10 @@ FORTRAN_INTENT_NAMES = ["inout", "out", "in"]
 # Mapping of access type to operator.
 REDUCTION_OPERATOR_MAPPING = {AccessType.SUM: "+"}
 
+# The name of the index of transformed kernels (used by the "hashed"
+# kernel-renaming scheme) in the kernel output directory.
+KERNEL_INDEX_FILE = "psyclone_kernel_index.json"
+
 
 def object_index(alist, item):
     '''
@@ -1624,6 +1632,11 @@ class CodedKern(Kern):
         case a check is performed that the transformed kernel already
         present is identical to the one that we would otherwise write
         to file. If this is not the case then we raise a GenerationError.)
+        If config.kernel_naming is "hashed" then the kernel is re-named
+        as for "multiple", but if an identical transformed kernel has
+        already been written to the kernel output directory (as recorded
+        in the index of kernel hashes in that directory) then that kernel
+        is used instead of writing a new one.
 
         :raises GenerationError: if config.kernel_naming == "single" and a \
                                  different, transformed version of this \
@@ -1632,8 +1645,6 @@ class CodedKern(Kern):
                                      is also flagged for module-inlining.
 
         '''
-        from psyclone.line_length import FortLineLength
-
         config = Config.get()
 
         # If this kernel has not been transformed we do nothing, also if the
@@ -1649,6 +1660,25 @@ class CodedKern(Kern):
         else:
             old_base_name = orig_mod_name[:]
 
+        code_hash = None
+        if config.kernel_naming == "hashed":
+            # Look for an identical transformed kernel. The hash is computed
+            # before the kernel is renamed, so it does not depend on the
+            # name it is given. If no identical kernel is found, the code
+            # is generated again once the kernel has been renamed below
+            # (rather than renaming the module, routine and metadata names
+            # in the Fortran text).
+            code_hash = hashlib.md5(
+                self._generate_kernel_code().encode()).hexdigest()
+            index = self._load_kernel_index(config.kernel_output_dir)
+            new_name = self._find_indexed_kernel(
+                config.kernel_output_dir, index.get(code_hash),
+                old_base_name)
+            if new_name:
+                self._rename_psyir(new_name[len(old_base_name):-8])
+                self.modified = False
+                return
+
         # We could create a hash of a string built from the name of the
         # Algorithm (module), the name/position of the Invoke and the
         # index of this kernel within that Invoke. However, that creates
@@ -1686,17 +1716,8 @@ class CodedKern(Kern):
         self.modified = False
 
         # If we reach this point the kernel needs to be written out into a
-        # file using a PSyIR back-end. At the moment there is no way to choose
-        # which back-end to use, so simply use the Fortran one (and limit the
-        # line length).
-        fortran_writer = FortranWriter(
-            check_global_constraints=config.backend_checks_enabled)
-        # Start from the root of the schedule as we want to output
-        # any module information surrounding the kernel subroutine
-        # as well as the subroutine itself.
-        new_kern_code = fortran_writer(self.get_kernel_schedule().root)
-        fll = FortLineLength()
-        new_kern_code = fll.process(new_kern_code)
+        # file using a PSyIR back-end.
+        new_kern_code = self._generate_kernel_code()
 
         if not fdesc:
             # If we've not got a file descriptor at this point then that's
@@ -1723,6 +1744,129 @@ class CodedKern(Kern):
             os.write(fdesc, new_kern_code.encode())
             # Close the new kernel file
             os.close(fdesc)
+            if code_hash:
+                self._update_kernel_index(
+                    config.kernel_output_dir, code_hash, new_name,
+                    hashlib.md5(new_kern_code.encode()).hexdigest())
+
+    def _generate_kernel_code(self):
+        '''
+        :returns: the Fortran code of the (transformed) kernel module.
+        :rtype: str
+
+        '''
+        from psyclone.line_length import FortLineLength
+
+        # At the moment there is no way to choose which back-end to use, so
+        # simply use the Fortran one (and limit the line length).
+        fortran_writer = FortranWriter(
+            check_global_constraints=Config.get().backend_checks_enabled)
+        # Start from the root of the schedule as we want to output
+        # any module information surrounding the kernel subroutine
+        # as well as the subroutine itself.
+        new_kern_code = fortran_writer(self.get_kernel_schedule().root)
+        fll = FortLineLength()
+        return fll.process(new_kern_code)
+
+    @staticmethod
+    def _load_kernel_index(kernel_output_dir):
+        '''
+        Loads the index of transformed kernels in the given kernel output
+        directory, which is used by the "hashed" kernel-renaming scheme. A
+        missing or damaged index is ignored.
+
+        :param str kernel_output_dir: the kernel output directory.
+
+        :returns: the name and the hash of the contents of the kernel file
+            for each kernel hash.
+        :rtype: Dict[str, Dict[str, str]]
+
+        '''
+        try:
+            with open(os.path.join(kernel_output_dir, KERNEL_INDEX_FILE),
+                      "r", encoding="utf-8") as file_in:
+                index = json.load(file_in)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(index, dict):
+            return {}
+        return index
+
+    @staticmethod
+    def _find_indexed_kernel(kernel_output_dir, entry, old_base_name):
+        '''
+        Checks that an entry of the index of transformed kernels still
+        describes a kernel file in the given kernel output directory. The
+        index can outlive the files it names (e.g. if they are removed, or
+        overwritten by a run using another kernel-renaming scheme), so the
+        hash of the contents of the file is compared with the one recorded
+        when it was written.
+
+        :param str kernel_output_dir: the kernel output directory.
+        :param entry: the index entry for the hash of the kernel code.
+        :type entry: Optional[Dict[str, str]]
+        :param str old_base_name: the name of the kernel module, without
+            any "_mod" suffix.
+
+        :returns: the name of the kernel file or None if the entry is
+            missing, damaged or out of date.
+        :rtype: Optional[str]
+
+        '''
+        if not isinstance(entry, dict):
+            return None
+        filename = entry.get("file")
+        file_hash = entry.get("file_hash")
+        if not (isinstance(filename, str) and isinstance(file_hash, str) and
+                filename.startswith(old_base_name + "_") and
+                filename.endswith("_mod.f90")):
+            return None
+        try:
+            with open(os.path.join(kernel_output_dir, filename), "rb") \
+                    as file_in:
+                contents = file_in.read()
+        except OSError:
+            return None
+        if hashlib.md5(contents).hexdigest() != file_hash:
+            return None
+        return filename
+
+    @staticmethod
+    def _update_kernel_index(kernel_output_dir, code_hash, filename,
+                             file_hash):
+        '''
+        Adds a transformed kernel to the index of the given kernel output
+        directory. The index is written to a temporary file first and then
+        renamed, so concurrent PSyclone processes never read a partially
+        written index. If several processes update the index at the same
+        time an entry can be lost, which only means that an identical
+        kernel might be written again.
+
+        :param str kernel_output_dir: the kernel output directory.
+        :param str code_hash: the hash of the kernel code.
+        :param str filename: the name of the kernel file.
+        :param str file_hash: the hash of the contents of the kernel file.
+
+        '''
+        index = CodedKern._load_kernel_index(kernel_output_dir)
+        index[code_hash] = {"file": filename, "file_hash": file_hash}
+        tmp_name = None
+        try:
+            fdesc, tmp_name = tempfile.mkstemp(dir=kernel_output_dir,
+                                               suffix=".tmp")
+            with os.fdopen(fdesc, "w", encoding="utf-8") as file_out:
+                json.dump(index, file_out)
+            os.replace(tmp_name,
+                       os.path.join(kernel_output_dir, KERNEL_INDEX_FILE))
+        except OSError as err:
+            if tmp_name:
+                try:
+                    os.remove(tmp_name)
+                except OSError:
+                    pass
+            # TODO #11: Use logging for this
+            print(f"Unable to write kernel index in '{kernel_output_dir}' "
+                  f"- ignoring: {err}", file=sys.stderr)
 
     def _rename_psyir(self, suffix):
         '''Rename the PSyIR module and kernel names by adding the supplied
@@ -2343,7 +2487,7 @@ class Argument():
         :rtype: :py:class:`psyclone.psyGen.Argument`
 
         '''
-        nodes = self._call.preceding(reverse=True)
+        nodes = self._call.preceding_iter(reverse=True)
         return self._find_argument(nodes)
 
     def forward_write_dependencies(self, ignore_halos=False):
@@ -2361,7 +2505,7 @@ class Argument():
         :rtype: list of :py:class:`psyclone.psyGen.Argument`
 
         '''
-        nodes = self._call.following()
+        nodes = self._call.following_iter()
         results = self._find_write_arguments(nodes, ignore_halos=ignore_halos)
         return results
 
@@ -2381,7 +2525,7 @@ class Argument():
         :rtype: list of :py:class:`psyclone.psyGen.Argument`
 
         '''
-        nodes = self._call.preceding(reverse=True)
+        nodes = self._call.preceding_iter(reverse=True)
         results = self._find_write_arguments(nodes, ignore_halos=ignore_halos)
         return results
 
@@ -2395,7 +2539,7 @@ class Argument():
         :rtype: :py:class:`psyclone.psyGen.Argument`
 
         '''
-        nodes = self._call.following()
+        nodes = self._call.following_iter()
         return self._find_argument(nodes)
 
     def forward_read_dependencies(self):
@@ -2410,7 +2554,7 @@ class Argument():
         :rtype: list of :py:class:`psyclone.psyGen.Argument`
 
         '''
-        nodes = self._call.following()
+        nodes = self._call.following_iter()
         return self._find_read_arguments(nodes)
 
     def _find_argument(self, nodes):
@@ -2418,14 +2562,14 @@ class Argument():
         dependency with self. If one is not found return None
 
         :param nodes: the list of nodes that this method examines.
-        :type nodes: list of :py:class:`psyclone.psyir.nodes.Node`
+        :type nodes: Iterable[:py:class:`psyclone.psyir.nodes.Node`]
 
         :returns: An argument object or None.
         :rtype: :py:class:`psyclone.psyGen.Argument`
 
         '''
-        nodes_with_args = [x for x in nodes if
-                           isinstance(x, (Kern, HaloExchange, GlobalSum))]
+        nodes_with_args = (x for x in nodes if
+                           isinstance(x, (Kern, HaloExchange, GlobalSum)))
         for node in nodes_with_args:
             for argument in node.args:
                 if self._depends_on(argument):
@@ -2438,7 +2582,7 @@ class Argument():
         list. If self is not a writer then return an empty list.
 
         :param nodes: the list of nodes that this method examines.
-        :type nodes: list of :py:class:`psyclone.psyir.nodes.Node`
+        :type nodes: Iterable[:py:class:`psyclone.psyir.nodes.Node`]
 
         :returns: a list of arguments that have a read dependence on \
             this argument.
@@ -2450,8 +2594,8 @@ class Argument():
             return []
 
         # We only need consider nodes that have arguments
-        nodes_with_args = [x for x in nodes if
-                           isinstance(x, (Kern, HaloExchange, GlobalSum))]
+        nodes_with_args = (x for x in nodes if
+                           isinstance(x, (Kern, HaloExchange, GlobalSum)))
         access = DataAccess(self)
         arguments = []
         for node in nodes_with_args:
@@ -2477,7 +2621,7 @@ class Argument():
         list. If self is not a reader then return an empty list.
 
         :param nodes: the list of nodes that this method examines.
-        :type nodes: list of :py:class:`psyclone.psyir.nodes.Node`
+        :type nodes: Iterable[:py:class:`psyclone.psyir.nodes.Node`]
 
         :param bool ignore_halos: if `True` then any write dependencies \
             involving a halo exchange are ignored. Defaults to `False`.
@@ -2491,9 +2635,9 @@ class Argument():
             return []
 
         # We only need consider nodes that have arguments
-        nodes_with_args = [x for x in nodes if
+        nodes_with_args = (x for x in nodes if
                            isinstance(x, (Kern, GlobalSum)) or
-                           (isinstance(x, HaloExchange) and not ignore_halos)]
+                           (isinstance(x, HaloExchange) and not ignore_halos))
         access = DataAccess(self)
         arguments = []
         for node in nodes_with_args:
@@ -554,7 +554,18 @@ class CWriter(LanguageWriter):
         :rtype: str
 
         '''
-        result = ""
+        return "".join(self.filecontainer_chunks(node))
+
+    def filecontainer_chunks(self, node):
+        '''Generates the C code for a FileContainer instance one child
+        (e.g. function or OpenCL kernel) at a time.
+
+        :param node: a Container PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.FileContainer`
+
+        :returns: the chunks of the C code.
+        :rtype: Iterator[str]
+
+        '''
         for child in node.children:
-            result += self._visit(child)
-        return result
+            yield from self._visit_chunks(child)
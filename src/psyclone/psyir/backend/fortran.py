@@ -330,6 +330,22 @@ class FortranWriter(LanguageWriter):
         from psyclone.psyir.tools.call_tree_utils import CallTreeUtils
         self._call_tree_utils = CallTreeUtils()
 
+    def _needs_copy(self, node):
+        '''Extends the base class method since `routine_node` modifies the
+        symbol tables of the Routines that it visits.
+
+        :param node: the root of the sub-tree to be visited.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: whether the tree must be copied before lowering and
+            visiting the sub-tree.
+        :rtype: bool
+
+        '''
+        if node.walk(Routine, stop_type=Routine):
+            return True
+        return super()._needs_copy(node)
+
     @staticmethod
     def _reverse_map(reverse_dict, op_map):
         '''
@@ -1063,6 +1079,25 @@ class FortranWriter(LanguageWriter):
         :returns: the Fortran code as a string.
         :rtype: str
 
+        :raises VisitorError: if the attached symbol table contains
+            any non-routine symbols.
+        :raises VisitorError: if more than one child is a Routine Node
+            with is_program set to True.
+
+        '''
+        return "".join(self.filecontainer_chunks(node))
+
+    def filecontainer_chunks(self, node):
+        '''Generates the Fortran code for a FileContainer instance one
+        child (e.g. module or program) at a time. See
+        :py:meth:`filecontainer_node` for details.
+
+        :param node: a Container PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.FileContainer`
+
+        :returns: the chunks of the Fortran code.
+        :rtype: Iterator[str]
+
         :raises VisitorError: if the attached symbol table contains
             any non-routine symbols.
         :raises VisitorError: if more than one child is a Routine Node
@@ -1086,10 +1121,8 @@ class FortranWriter(LanguageWriter):
                 f"most one routine node that is a program, but found "
                 f"{program_nodes}.")
 
-        result = ""
         for child in node.children:
-            result += self._visit(child)
-        return result
+            yield from self._visit_chunks(child)
 
     def container_node(self, node):
         '''This method is called when a Container instance is found in
@@ -1103,6 +1136,25 @@ class FortranWriter(LanguageWriter):
         :returns: the Fortran code as a string.
         :rtype: str
 
+        :raises VisitorError: if the name attribute of the supplied \
+            node is empty or None.
+        :raises VisitorError: if any of the children of the supplied \
+            Container node are not Routines or CodeBlocks.
+
+        '''
+        return "".join(self.container_chunks(node))
+
+    def container_chunks(self, node):
+        '''Generates the Fortran code for a Container instance in chunks:
+        the module header and declarations, each of its routines and the end
+        of the module. See :py:meth:`container_node` for details.
+
+        :param node: a Container PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Container`
+
+        :returns: the chunks of the Fortran code.
+        :rtype: Iterator[str]
+
         :raises VisitorError: if the name attribute of the supplied \
             node is empty or None.
         :raises VisitorError: if any of the children of the supplied \
@@ -1121,17 +1173,17 @@ class FortranWriter(LanguageWriter):
                 f"to be either CodeBlocks or sub-classes of Routine but found:"
                 f" {[type(child).__name__ for child in node.children]}.")
 
-        result = f"{self._nindent}module {node.name}\n"
+        header = f"{self._nindent}module {node.name}\n"
 
         self._depth += 1
-
         # Generate module imports
         imports = ""
         for symbol in node.symbol_table.containersymbols:
             imports += self.gen_use(symbol, node.symbol_table)
 
         # Declare the Container's data
-        declarations = self.gen_decls(node.symbol_table, is_module_scope=True)
+        declarations = self.gen_decls(node.symbol_table,
+                                      is_module_scope=True)
 
         # Generate the access statement (PRIVATE or PUBLIC)
         declarations += self.gen_default_access_stmt(node.symbol_table)
@@ -1139,21 +1191,19 @@ class FortranWriter(LanguageWriter):
         # Accessibility statements for imported and routine symbols
         declarations += self.gen_access_stmts(node.symbol_table)
 
-        # Get the subroutine statements.
-        subroutines = ""
-        for child in node.children:
-            subroutines += self._visit(child)
-
-        result += (
+        yield (
+            f"{header}"
             f"{imports}"
             f"{self._nindent}implicit none\n"
             f"{declarations}\n"
-            f"{self._nindent}contains\n"
-            f"{subroutines}\n")
+            f"{self._nindent}contains\n")
 
+        # Get the subroutine statements.
+        for child in node.children:
+            yield from self._visit_chunks(child)
         self._depth -= 1
-        result += f"{self._nindent}end module {node.name}\n"
-        return result
+
+        yield f"\n{self._nindent}end module {node.name}\n"
 
     def routine_node(self, node):
         '''This method is called when a Routine node is found in
@@ -39,6 +39,7 @@
 '''
 
 import keyword
+import operator
 
 import sympy
 from sympy.parsing.sympy_parser import parse_expr
@@ -47,7 +48,8 @@ from psyclone.psyir.backend.fortran import FortranWriter
 from psyclone.psyir.backend.visitor import VisitorError
 from psyclone.psyir.frontend.sympy_reader import SymPyReader
 from psyclone.psyir.nodes import (
-    DataNode, Range, Reference, IntrinsicCall, Call)
+    BinaryOperation, DataNode, Range, Reference, IntrinsicCall, Call,
+    UnaryOperation)
 from psyclone.psyir.symbols import (ArrayType, ScalarType, SymbolTable)
 
 
@@ -93,6 +95,37 @@ class SymPyWriter(FortranWriter):
     # is set to True as the modifications will persist after the Writer!
     _DISABLE_LOWERING = True
 
+    # Whether expressions are converted into SymPy expressions directly
+    # (rather than by creating their string representation, which is then
+    # parsed by SymPy). Expressions that contain nodes that are not supported
+    # by the direct conversion are always converted using the parser.
+    _DIRECT_CONVERSION = True
+
+    # The methods that convert a PSyIR node directly into a SymPy
+    # expression, indexed by the name of the handler that would create the
+    # string representation of the node.
+    _DIRECT_CONVERTERS = {
+        "literal_node": "_literal_to_sympy",
+        "reference_node": "_reference_to_sympy",
+        "arrayreference_node": "_structure_to_sympy",
+        "structurereference_node": "_structure_to_sympy",
+        "arrayofstructuresreference_node": "_structure_to_sympy",
+        "binaryoperation_node": "_binaryoperation_to_sympy",
+        "unaryoperation_node": "_unaryoperation_to_sympy",
+        "intrinsiccall_node": "_intrinsiccall_to_sympy",
+        "range_node": "_range_to_sympy"}
+
+    # The arithmetic operators that can be converted directly.
+    _BINARY_OPERATORS = {
+        BinaryOperation.Operator.ADD: operator.add,
+        BinaryOperation.Operator.SUB: operator.sub,
+        BinaryOperation.Operator.MUL: operator.mul,
+        BinaryOperation.Operator.DIV: operator.truediv,
+        BinaryOperation.Operator.POW: operator.pow}
+    _UNARY_OPERATORS = {
+        UnaryOperation.Operator.MINUS: operator.neg,
+        UnaryOperation.Operator.PLUS: operator.pos}
+
     # A list of all reserved Python keywords (Fortran variables that are the
     # same as a reserved name must be renamed, otherwise parsing will fail).
     # This class attribute will get initialised in __init__:
@@ -487,17 +520,28 @@ class SymPyWriter(FortranWriter):
         is_list = isinstance(list_of_expressions, (tuple, list))
         if not is_list:
             list_of_expressions = [list_of_expressions]
-        expression_str_list = self._to_str(
-            list_of_expressions, identical_variables=identical_variables,
-            all_variables_positive=all_variables_positive)
+
+        # Create the type map in `self._sympy_type_map`, which is required
+        # for all expressions to use the same SymPy symbols and functions.
+        self._create_type_map(list_of_expressions,
+                              identical_variables=identical_variables,
+                              all_variables_positive=all_variables_positive)
 
         result = []
-        for expr in expression_str_list:
+        for expr in list_of_expressions:
+            if self._DIRECT_CONVERSION:
+                try:
+                    result.append(self._to_sympy(expr))
+                    continue
+                except NotImplementedError:
+                    # Use the string representation instead
+                    pass
+            expr_str = super().__call__(expr)
             try:
-                result.append(parse_expr(expr, self.type_map))
+                result.append(parse_expr(expr_str, self.type_map))
             except SyntaxError as err:
-                raise VisitorError(f"Invalid SymPy expression: '{expr}'.") \
-                    from err
+                raise VisitorError(f"Invalid SymPy expression: "
+                                   f"'{expr_str}'.") from err
 
         if is_list:
             return result
@@ -553,18 +597,48 @@ class SymPyWriter(FortranWriter):
         :returns: the code as string.
         :rtype: str
 
+        '''
+        unique_name, sig, num_dims, all_dims = self._get_structure_access(node)
+        if all_dims:
+            indices_str = self.gen_indices(all_dims)
+            # Create the corresponding SymPy function, which will store
+            # the signature and num_dims, so that the correct Fortran
+            # representation can be recreated later.
+            self._sympy_type_map[unique_name] = \
+                self._create_sympy_array_function(unique_name, sig, num_dims)
+            return f"{unique_name}({','.join(indices_str)})"
+
+        # Not an array access. We use the unique name  for the string,
+        # but the required symbol is mapped to the original name, which means
+        # if the SymPy expression is converted to a string (in order to be
+        # parsed), it will use the original structure reference syntax:
+        self._sympy_type_map[unique_name] = sympy.Symbol(sig.to_language())
+        return unique_name
+
+    # -------------------------------------------------------------------------
+    def _get_structure_access(self, node):
+        '''Determines the unique name used for an access to a (structure or
+        array) reference (e.g. ``a_b`` for ``a(i)%b(j)``), together with the
+        information required to convert it back to PSyIR.
+
+        :param node: a StructureReference or ArrayReference PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Reference`
+
+        :returns: the unique name, the signature of the access, the number
+            of indices for each component of the signature and the list of
+            all indices (which is empty if this is not an array access).
+        :rtype: Tuple[str, :py:class:`psyclone.core.Signature`, List[int],
+                      List[:py:class:`psyclone.psyir.nodes.Node`]]
+
         '''
         sig, indices = node.get_signature_and_indices()
 
         out = []
         num_dims = []
         all_dims = []
-        is_array = False
         for i, name in enumerate(sig):
             num_dims.append(len(indices[i]))
-            for index in indices[i]:
-                all_dims.append(index)
-                is_array = True
+            all_dims.extend(indices[i])
             out.append(name)
         flat_name = "_".join(out)
 
@@ -574,21 +648,7 @@ class SymPyWriter(FortranWriter):
         except KeyError:
             unique_name = self._symbol_table.new_symbol(flat_name,
                                                         tag=str(sig)).name
-        if is_array:
-            indices_str = self.gen_indices(all_dims)
-            # Create the corresponding SymPy function, which will store
-            # the signature and num_dims, so that the correct Fortran
-            # representation can be recreated later.
-            self._sympy_type_map[unique_name] = \
-                self._create_sympy_array_function(unique_name, sig, num_dims)
-            return f"{unique_name}({','.join(indices_str)})"
-
-        # Not an array access. We use the unique name  for the string,
-        # but the required symbol is mapped to the original name, which means
-        # if the SymPy expression is converted to a string (in order to be
-        # parsed), it will use the original structure reference syntax:
-        self._sympy_type_map[unique_name] = sympy.Symbol(sig.to_language())
-        return unique_name
+        return unique_name, sig, num_dims, all_dims
 
     # -------------------------------------------------------------------------
     def literal_node(self, node):
@@ -778,3 +838,233 @@ class SymPyWriter(FortranWriter):
         result += f",{step}"
 
         return result
+
+    # -------------------------------------------------------------------------
+    def _to_sympy(self, node):
+        '''Converts a PSyIR expression directly into a SymPy expression,
+        without creating and parsing its string representation. The result
+        is the same as the one the SymPy parser creates for the string
+        representation of the expression.
+
+        :param node: a PSyIR expression.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: the SymPy expression, or a tuple of three expressions for
+            a Range.
+        :rtype: Union[:py:class:`sympy.core.basic.Basic`,
+                      Tuple[:py:class:`sympy.core.basic.Basic`, ...]]
+
+        :raises NotImplementedError: if the expression contains a node that
+            cannot be converted directly.
+
+        '''
+        method_name = self._get_handler_name(type(node))
+        try:
+            converter = getattr(self, self._DIRECT_CONVERTERS[method_name])
+        except KeyError as err:
+            raise NotImplementedError(
+                f"Node '{type(node).__name__}' cannot be converted directly "
+                f"into SymPy.") from err
+        return converter(node)
+
+    # -------------------------------------------------------------------------
+    def _literal_to_sympy(self, node):
+        '''Converts an integer or real Literal into a SymPy number. Any
+        precision information is ignored.
+
+        :param node: a Literal PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Literal`
+
+        :returns: the SymPy representation of the literal.
+        :rtype: Union[:py:class:`sympy.core.numbers.Integer`,
+                      :py:class:`sympy.core.numbers.Float`]
+
+        :raises NotImplementedError: if the literal is not an integer or a
+            real value.
+
+        '''
+        intrinsic = node.datatype.intrinsic
+        try:
+            if intrinsic == ScalarType.Intrinsic.INTEGER:
+                return sympy.Integer(node.value)
+            if intrinsic == ScalarType.Intrinsic.REAL:
+                return sympy.Float(node.value)
+        except ValueError as err:
+            raise NotImplementedError(
+                f"Unsupported literal '{node.value}'.") from err
+        raise NotImplementedError(f"Unsupported literal '{node.value}'.")
+
+    # -------------------------------------------------------------------------
+    def _reference_to_sympy(self, node):
+        '''Converts a Reference into the corresponding SymPy symbol, or into
+        a call of the corresponding SymPy function with the triple-array
+        indices ``lower,upper,1`` for each dimension if it is an array
+        expression (see :py:meth:`reference_node`).
+
+        :param node: a Reference PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Reference`
+
+        :returns: the SymPy representation of the reference.
+        :rtype: :py:class:`sympy.core.basic.Basic`
+
+        :raises NotImplementedError: if the reference is not in the type map.
+
+        '''
+        try:
+            name = self._symbol_table.lookup_with_tag(node.name).name
+        except KeyError:
+            name = node.name
+        try:
+            sympy_object = self._sympy_type_map[name]
+        except KeyError as err:
+            raise NotImplementedError(
+                f"Reference '{name}' is not in the type map.") from err
+        if not node.is_array:
+            return sympy_object
+
+        bounds = [sympy.Symbol(self.lower_bound),
+                  sympy.Symbol(self.upper_bound), sympy.Integer(1)]
+        return sympy_object(*(bounds * len(node.symbol.shape)))
+
+    # -------------------------------------------------------------------------
+    def _structure_to_sympy(self, node):
+        '''Converts an ArrayReference, StructureReference or
+        ArrayOfStructuresReference into a SymPy symbol or function call (see
+        :py:meth:`arrayofstructuresreference_node`).
+
+        :param node: a StructureReference or ArrayReference PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Reference`
+
+        :returns: the SymPy representation of the reference.
+        :rtype: :py:class:`sympy.core.basic.Basic`
+
+        '''
+        unique_name, sig, num_dims, all_dims = self._get_structure_access(node)
+        if all_dims:
+            indices = self._indices_to_sympy(all_dims)
+            function = self._create_sympy_array_function(unique_name, sig,
+                                                         num_dims)
+            self._sympy_type_map[unique_name] = function
+            return function(*indices)
+
+        symbol = sympy.Symbol(sig.to_language())
+        self._sympy_type_map[unique_name] = symbol
+        return symbol
+
+    # -------------------------------------------------------------------------
+    def _indices_to_sympy(self, indices):
+        '''Converts the indices of an array access into a list of SymPy
+        expressions, using three expressions for each index (see
+        :py:meth:`gen_indices`).
+
+        :param indices: list of PSyIR nodes.
+        :type indices: List[:py:class:`psyclone.psyir.symbols.Node`]
+
+        :returns: the SymPy expressions for the indices.
+        :rtype: List[:py:class:`sympy.core.basic.Basic`]
+
+        :raises NotImplementedError: if the format of an index is not
+            supported.
+
+        '''
+        result = []
+        for index in indices:
+            if isinstance(index, DataNode):
+                expression = self._to_sympy(index)
+                result.extend([expression, expression, sympy.Integer(1)])
+            elif isinstance(index, Range):
+                result.extend(self._to_sympy(index))
+            else:
+                raise NotImplementedError(
+                    f"Unsupported index '{index}'.")
+        return result
+
+    # -------------------------------------------------------------------------
+    def _range_to_sympy(self, node):
+        '''Converts a Range into a tuple of three SymPy expressions (see
+        :py:meth:`range_node`).
+
+        :param node: a Range PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Range`
+
+        :returns: the SymPy expressions for start, stop and step.
+        :rtype: Tuple[:py:class:`sympy.core.basic.Basic`, ...]
+
+        '''
+        if node.parent and node.parent.is_lower_bound(
+                node.parent.index_of(node)):
+            start = sympy.Symbol(self.lower_bound)
+        else:
+            start = self._to_sympy(node.start)
+
+        if node.parent and node.parent.is_upper_bound(
+                node.parent.index_of(node)):
+            stop = sympy.Symbol(self.upper_bound)
+        else:
+            stop = self._to_sympy(node.stop)
+
+        return (start, stop, self._to_sympy(node.step))
+
+    # -------------------------------------------------------------------------
+    def _binaryoperation_to_sympy(self, node):
+        '''Converts an arithmetic BinaryOperation into a SymPy expression.
+
+        :param node: a BinaryOperation PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.BinaryOperation`
+
+        :returns: the SymPy representation of the operation.
+        :rtype: :py:class:`sympy.core.basic.Basic`
+
+        :raises NotImplementedError: if the operator is not supported.
+
+        '''
+        try:
+            oper = self._BINARY_OPERATORS[node.operator]
+        except KeyError as err:
+            raise NotImplementedError(
+                f"Unsupported binary operator '{node.operator}'.") from err
+        return oper(self._to_sympy(node.children[0]),
+                    self._to_sympy(node.children[1]))
+
+    # -------------------------------------------------------------------------
+    def _unaryoperation_to_sympy(self, node):
+        '''Converts an arithmetic UnaryOperation into a SymPy expression.
+
+        :param node: a UnaryOperation PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.UnaryOperation`
+
+        :returns: the SymPy representation of the operation.
+        :rtype: :py:class:`sympy.core.basic.Basic`
+
+        :raises NotImplementedError: if the operator is not supported.
+
+        '''
+        try:
+            oper = self._UNARY_OPERATORS[node.operator]
+        except KeyError as err:
+            raise NotImplementedError(
+                f"Unsupported unary operator '{node.operator}'.") from err
+        return oper(self._to_sympy(node.children[0]))
+
+    # -------------------------------------------------------------------------
+    def _intrinsiccall_to_sympy(self, node):
+        '''Converts a call to one of the intrinsics that have a SymPy
+        equivalent (e.g. ``MAX``) into a SymPy expression. As in
+        :py:meth:`intrinsiccall_node`, argument names are ignored.
+
+        :param node: an IntrinsicCall PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.IntrinsicCall`
+
+        :returns: the SymPy representation of the intrinsic call.
+        :rtype: :py:class:`sympy.core.basic.Basic`
+
+        :raises NotImplementedError: if the intrinsic has no SymPy
+            equivalent.
+
+        '''
+        try:
+            function = getattr(sympy, self._intrinsic_to_str[node.intrinsic])
+        except KeyError as err:
+            raise NotImplementedError(
+                f"Unsupported intrinsic '{node.intrinsic.name}'.") from err
+        return function(*[self._to_sympy(arg) for arg in node.arguments])
@@ -42,6 +42,7 @@ back ends.
 '''
 
 import inspect
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from psyclone.errors import PSycloneError
 from psyclone.psyir.nodes import Node, Schedule, Container
@@ -92,6 +93,11 @@ class PSyIRVisitor():
     # is set to True as the modifications will persist after the Writer!
     _DISABLE_LOWERING = False
 
+    # Maps a (visitor class, node class) pair to the name of the method that
+    # handles this node class in this visitor (or None if there is no such
+    # method), so that it only needs to be determined once.
+    _HANDLER_CACHE: Dict[Tuple[type, type], Optional[str]] = {}
+
     def __init__(self, skip_nodes=False, indent_string="  ",
                  initial_indent_depth=0, check_global_constraints=True,
                  disable_copy=False):
@@ -172,6 +178,21 @@ class PSyIRVisitor():
 
         :raises TypeError: if the provided argument is not a PSyIR Node.
 
+        '''
+        return self._visit(self._prepare(node))
+
+    def _prepare(self, node: Node) -> Node:
+        '''Prepares the provided node for visiting: unless lowering is
+        disabled or not required, the DSL concepts are lowered into language
+        level nodes (in a copy of the tree unless copying is disabled).
+
+        :param node: A PSyIR node.
+
+        :returns: the (possibly lowered copy of the) node to visit.
+
+        :raises TypeError: if the provided argument is not a PSyIR Node.
+        :raises VisitorError: if the lowering of the node fails.
+
         '''
         if not isinstance(node, Node):
             raise TypeError(
@@ -181,7 +202,14 @@ class PSyIRVisitor():
         # If we are not lowering, we can proceed visiting the PSyIR without the
         # need to make a deep-copy of it.
         if self._DISABLE_LOWERING:
-            return self._visit(node)
+            return node
+
+        # Similarly, if nothing in the provided sub-tree needs to be lowered
+        # and this visitor does not modify it, there is no need to copy (or
+        # lower) anything. This is often the case when a single statement or
+        # expression is written.
+        if not self._needs_copy(node):
+            return node
 
         # The visitor must not alter the provided node but if there are any
         # DSL concepts then these will need to be lowered in-place and this
@@ -208,7 +236,108 @@ class PSyIRVisitor():
                 f"their in-tree modifications. Original error was '{err}'."
                 ) from err
 
-        return self._visit(lowered_node)
+        return lowered_node
+
+    def stream(self, node: Node) -> Iterator[str]:
+        '''Like calling the visitor directly, but yields the text
+        representation of the PSyIR tree in consecutive chunks rather than
+        returning it as a single string. Each chunk consists of complete
+        lines and joining all chunks gives the same text as calling the
+        visitor. This allows large outputs (e.g. a module with many
+        routines) to be written out (and post-processed line by line)
+        without holding the text of the whole tree in memory.
+
+        :param node: A PSyIR node.
+
+        :returns: the chunks of the text representation of the PSyIR tree.
+
+        :raises TypeError: if the provided argument is not a PSyIR Node.
+
+        '''
+        yield from self._visit_chunks(self._prepare(node))
+
+    def _visit_chunks(self, node: Node) -> Iterator[str]:
+        '''Yields the text representation of the provided node sub-tree in
+        consecutive chunks. By default the whole sub-tree forms a single
+        chunk. A visitor can split up the output of a node that has a
+        handler '<name>_node' by also implementing a generator method
+        '<name>_chunks' for it (the handler then just joins its chunks).
+        Nodes with comments attached are always visited as a whole.
+
+        :param node: A PSyIR node.
+
+        :returns: the chunks of the text representation of the node.
+
+        '''
+        method_name = self._get_handler_name(type(node))
+        chunks_method = None
+        if method_name and not (isinstance(node, CommentableMixin) and
+                                (node.preceding_comment or
+                                 node.inline_comment)):
+            chunks_method = getattr(
+                self, method_name[:-len("_node")] + "_chunks", None)
+        if chunks_method is None:
+            yield self._visit(node)
+            return
+        # Check global constraints for this node (if validation enabled).
+        if self._validate_nodes:
+            node.validate_global_constraints()
+        yield from chunks_method(node)
+
+    def _needs_copy(self, node: Node) -> bool:
+        '''Determines whether this visitor needs to work on a copy of the
+        tree in order not to modify the provided node. This is the case if
+        any node in the sub-tree implements its own lowering (i.e. is not
+        language-level already). Visitors that modify the tree themselves
+        must extend this method accordingly.
+
+        :param node: the root of the sub-tree to be visited.
+
+        :returns: whether the tree must be copied before lowering and
+            visiting the sub-tree.
+        '''
+        default_lowering = Node.lower_to_language_level
+        for child in node.walk(Node):
+            if type(child).lower_to_language_level is not default_lowering:
+                return True
+        return False
+
+    @staticmethod
+    def _candidate_method_names(node_type: type) -> List[str]:
+        '''
+        :param node_type: the class of a PSyIR node.
+
+        :returns: the names of the methods that can handle a node of the
+            given class, in the order in which they are tried.
+        '''
+        # Make a list of the node's ancestor classes (including
+        # itself) in method resolution order (mro), apart from the
+        # base "object" class.
+        possible_method_names = [curr_class.__name__.lower()+"_node"
+                                 for curr_class in inspect.getmro(node_type)]
+        possible_method_names.remove("object_node")
+        return possible_method_names
+
+    def _get_handler_name(self, node_type: type) -> Optional[str]:
+        '''Determines which method of this visitor handles nodes of the
+        given class. The result is cached for each visitor class.
+
+        :param node_type: the class of a PSyIR node.
+
+        :returns: the name of the handler method or None if there is none.
+        '''
+        key = (type(self), node_type)
+        try:
+            return PSyIRVisitor._HANDLER_CACHE[key]
+        except KeyError:
+            pass
+        handler_name = None
+        for method_name in self._candidate_method_names(node_type):
+            if callable(getattr(type(self), method_name, None)):
+                handler_name = method_name
+                break
+        PSyIRVisitor._HANDLER_CACHE[key] = handler_name
+        return handler_name
 
     def _visit(self, node):
         '''Implements the PSyIR callbacks. Callbacks are implemented by using
@@ -218,7 +347,8 @@ class PSyIRVisitor():
         until there are no more parent classes. Names are not
         modified, other than making them lower case, apart from the
         `Return` class which is changed to `return_node` because
-        `return` is a Python keyword.
+        `return` is a Python keyword. The method used for each class of
+        node is only looked up once per visitor class.
 
         :param node: A PSyIR node.
         :type node: :py:class:`psyclone.psyir.nodes.Node`
@@ -242,68 +372,48 @@ class PSyIRVisitor():
         if self._validate_nodes:
             node.validate_global_constraints()
 
-        # Make a list of the node's ancestor classes (including
-        # itself) in method resolution order (mro), apart from the
-        # base "object" class.
-        possible_method_names = [curr_class.__name__.lower()+"_node"
-                                 for curr_class in inspect.getmro(type(node))]
-        possible_method_names.remove("object_node")
-
-        # Try to call methods using the class names in the order of
-        # the class hierarchy (starting from the current class name).
-        for method_name in possible_method_names:
-            try:
-                # pylint: disable=eval-used
-                node_result = eval(f"self.{method_name}(node)")
-
-                # We can only proceed to add comments if the Visitor
-                # returned a string, otherwise we just return
-                if not isinstance(node_result, str):
-                    return node_result
-
-                result = ""
-
-                # Add preceding comment if available
-                if isinstance(node, CommentableMixin):
-                    parent = node.parent
-                    valid_locations = (Schedule, Container)
-                    valid = parent and isinstance(parent, valid_locations)
-                    # And is in a location that allows line comments, e.g.
-                    # Schedules, Container and Standalone nodes (no-parent)
-                    if not parent or valid:
-                        if node.preceding_comment and self._COMMENT_PREFIX:
-                            lines = node.preceding_comment.split('\n')
-                            for line in lines:
-                                result += (self._nindent +
-                                           self._COMMENT_PREFIX +
-                                           line + "\n")
-
-                result += node_result
-
-                # Add inline comment if available
-                if isinstance(node, CommentableMixin):
-                    if node.inline_comment and self._COMMENT_PREFIX:
-                        if result[-1] != "\n":
-                            raise VisitorError(
-                                f"An inline_comment can only be added to a "
-                                f"construct that finishes with a '\\n', "
-                                f"indicating that the line has ended, but"
-                                f" node '{node}' results in '{result}'.")
-                        # Add the comment before the last line break
-                        result = (result[:-1] + "  " + self._COMMENT_PREFIX +
-                                  node.inline_comment + "\n")
-
-                return result
-
-            except AttributeError as excinfo:
-                if f"attribute '{method_name}'" in str(excinfo):
-                    # This attribute error is because the method that
-                    # was tried does not exist.
-                    pass
-                else:
-                    # The method does exist but it has raised an
-                    # attribute error so re-raise it here.
-                    raise AttributeError(excinfo) from excinfo
+        method_name = self._get_handler_name(type(node))
+        if method_name is not None:
+            node_result = getattr(self, method_name)(node)
+
+            # We can only proceed to add comments if the Visitor
+            # returned a string, otherwise we just return
+            if not isinstance(node_result, str):
+                return node_result
+
+            result = ""
+
+            # Add preceding comment if available
+            if isinstance(node, CommentableMixin):
+                parent = node.parent
+                valid_locations = (Schedule, Container)
+                valid = parent and isinstance(parent, valid_locations)
+                # And is in a location that allows line comments, e.g.
+                # Schedules, Container and Standalone nodes (no-parent)
+                if not parent or valid:
+                    if node.preceding_comment and self._COMMENT_PREFIX:
+                        lines = node.preceding_comment.split('\n')
+                        for line in lines:
+                            result += (self._nindent +
+                                       self._COMMENT_PREFIX +
+                                       line + "\n")
+
+            result += node_result
+
+            # Add inline comment if available
+            if isinstance(node, CommentableMixin):
+                if node.inline_comment and self._COMMENT_PREFIX:
+                    if result[-1] != "\n":
+                        raise VisitorError(
+                            f"An inline_comment can only be added to a "
+                            f"construct that finishes with a '\\n', "
+                            f"indicating that the line has ended, but"
+                            f" node '{node}' results in '{result}'.")
+                    # Add the comment before the last line break
+                    result = (result[:-1] + "  " + self._COMMENT_PREFIX +
+                              node.inline_comment + "\n")
+
+            return result
 
         if self._skip_nodes:
             # We haven't found a handler for this node but '_skip_nodes' is
@@ -317,7 +427,8 @@ class PSyIRVisitor():
 
         raise VisitorError(
             f"Unsupported node '{type(node).__name__}' found: method names "
-            f"attempted were {possible_method_names}.")
+            f"attempted were "
+            f"{self._candidate_method_names(type(node))}.")
 
 
 # For AutoAPI documentation generation
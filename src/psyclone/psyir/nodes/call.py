@@ -422,6 +422,35 @@ class Call(Statement, DataNode):
                 new_argument_names.append((id(child), None))
         self._argument_names = new_argument_names
 
+    def __getstate__(self):
+        '''
+        Pickling support. The internal _argument_names list is keyed by the
+        id of each argument, which is not preserved when unpickling, so only
+        the names are stored.
+
+        :returns: the state of this node.
+        :rtype: Dict[str, Any]
+
+        '''
+        self._reconcile()
+        state = self.__dict__.copy()
+        state["_argument_names"] = [name for _, name in self._argument_names]
+        return state
+
+    def __setstate__(self, state):
+        '''
+        Restores the state of an unpickled Call, re-associating each argument
+        name with the id of the corresponding (new) argument node.
+
+        :param state: the state returned by __getstate__.
+        :type state: Dict[str, Any]
+
+        '''
+        self.__dict__.update(state)
+        self._argument_names = [
+            (id(arg), name) for arg, name in zip(self.arguments,
+                                                 state["_argument_names"])]
+
     def node_str(self, colour=True):
         '''
         Construct a text representation of this node, optionally containing
@@ -122,7 +122,7 @@ class DataSharingAttributeMixin(metaclass=abc.ABCMeta):
             if (isinstance(symbol, DataSymbol) and
                     isinstance(self.dir_body[0], Loop) and
                     symbol in self.dir_body[0].explicitly_private_symbols):
-                if any(ref.symbol is symbol for ref in self.preceding()
+                if any(ref.symbol is symbol for ref in self.preceding_iter()
                        if isinstance(ref, Reference)):
                     # If it's used before the loop, make it firstprivate
                     fprivate.add(symbol)
@@ -152,12 +152,12 @@ class DataSharingAttributeMixin(metaclass=abc.ABCMeta):
             # If one such scalar is potentially read before it is written, it
             # will be considered firstprivate.
 
-            has_been_read = False
-            last_read_position = 0
+            # The position of the last read is only computed if it is
+            # needed, since abs_position has to search the whole tree.
+            last_read_node = None
             for access in accesses:
                 if access.access_type == AccessType.READ:
-                    has_been_read = True
-                    last_read_position = access.node.abs_position
+                    last_read_node = access.node
 
                 if access.access_type == AccessType.WRITE:
                     # Check if the write access is outside a loop. In this case
@@ -187,9 +187,9 @@ class DataSharingAttributeMixin(metaclass=abc.ABCMeta):
                     symbol = access.node.scope.symbol_table.lookup(name)
 
                     # If it has been read before we have to check if ...
-                    if has_been_read:
+                    if last_read_node is not None:
                         loop_pos = loop_ancestor.loop_body.abs_position
-                        if last_read_position < loop_pos:
+                        if last_read_node.abs_position < loop_pos:
                             # .. it was before the loop, so it is fprivate
                             fprivate.add(symbol)
                         else:
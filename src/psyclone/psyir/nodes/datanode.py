@@ -46,7 +46,55 @@ class DataNode(Node):
     Abstract node representing a general PSyIR expression that represents a
     value, which has a datatype.
 
+    DataNodes are hashable: the hash is a structural hash of the whole
+    subtree that is cached and discarded whenever the subtree is modified.
+    It is also used to quickly reject unequal expressions in __eq__. Since
+    equal expressions have the same hash, expressions can be used as keys
+    of a dictionary (e.g. to group identical expressions), but they must
+    then not be modified while they are used as keys.
+
     '''
+    # Expressions are too small to be worth caching their variable accesses
+    # (see Node.enable_access_cache).
+    _access_cache_supported = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # A class that defines __eq__ without defining __hash__ is made
+        # unhashable by Python. Sub-classes extend __eq__ (and
+        # _structural_hash_key) but keep using the structural hash.
+        if cls.__hash__ is None:
+            cls.__hash__ = DataNode.__hash__
+
+    def __eq__(self, other):
+        '''
+        Checks whether two DataNodes are equal. Nodes with a different
+        structural hash can not be equal, otherwise the nodes are compared
+        as described in :py:meth:`psyclone.psyir.nodes.Node.__eq__`.
+
+        :param object other: the object to check equality to.
+
+        :returns: whether other is equal to self.
+        :rtype: bool
+
+        '''
+        if (isinstance(other, DataNode) and
+                self.structural_hash != other.structural_hash):
+            return False
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return self.structural_hash
+
+    @property
+    def structural_hash(self):
+        '''
+        :returns: a hash of the structure of this expression, which is the
+            same for all expressions that compare equal.
+        :rtype: int
+        '''
+        return self._get_structural_hash()
+
     @property
     def datatype(self):
         '''
@@ -38,6 +38,7 @@ Directive node, which is used pre-lowering to represent Task Directives."""
 
 import itertools
 import math
+import time
 from collections import namedtuple
 
 from psyclone.errors import GenerationError, InternalError
@@ -68,6 +69,7 @@ from psyclone.psyir.nodes.omp_clauses import (
 )
 from psyclone.psyir.nodes.omp_directives import (
     OMPParallelDirective,
+    OMPSerialDirective,
 )
 from psyclone.psyir.nodes.omp_task_directive import (
     OMPTaskDirective
@@ -145,6 +147,11 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
         IntrinsicCall.Intrinsic.UBOUND,
     ]
 
+    # The number of tasks whose clauses have been computed and the total
+    # time (in seconds) taken to compute them (see clause_timing).
+    _clause_computations = 0
+    _clause_computation_time = 0.0
+
     def __init__(self, children=None, parent=None):
         super().__init__(
             children=children, parent=parent
@@ -164,11 +171,13 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
         # "chunked" loop variables.
         self._parent_loop_vars = []
         self._parent_loops = []
+        self._parent_loop_steps = {}
         self._proxy_loop_vars = {}
         self._child_loop_vars = []
         self._parent_parallel = None
         self._parallel_private = None
         self._parallel_firstprivate = None
+        self._parallel_private_names = None
 
         # We need to do extra steps when inside a Kern to correctly identify
         # symbols.
@@ -254,6 +263,24 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
             if new_ref not in dependency_list:
                 dependency_list.append(new_ref)
 
+    @staticmethod
+    def clause_timing():
+        '''
+        :returns: the number of tasks whose clauses have been computed (when
+            they were lowered) and the total time in seconds that this took.
+        :rtype: Dict[str, Union[int, float]]
+        '''
+        return {"tasks": DynamicOMPTaskDirective._clause_computations,
+                "seconds": DynamicOMPTaskDirective._clause_computation_time}
+
+    @staticmethod
+    def reset_clause_timing():
+        '''
+        Resets the statistics returned by clause_timing.
+        '''
+        DynamicOMPTaskDirective._clause_computations = 0
+        DynamicOMPTaskDirective._clause_computation_time = 0.0
+
     def _find_parent_loop_vars(self):
         """
         Finds the loop variable of each parent loop inside the same
@@ -263,27 +290,77 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
         :raises GenerationError: if no ancestor OMPParallelDirective is
                                  found.
         """
-        anc = self.ancestor((OMPParallelDirective, Loop))
-        while isinstance(anc, Loop):
-            # Store the loop variable of each parent loop
-            var = anc.variable
-            self._parent_loop_vars.append(var)
-            self._parent_loops.append(anc)
-            # Recurse up the tree
-            anc = anc.ancestor((OMPParallelDirective, Loop))
-
-        if not isinstance(anc, OMPParallelDirective):
-            raise GenerationError("Failed to find an ancestor "
-                                  "OMPParallelDirective which is required "
-                                  "to compute dependencies of a "
-                                  "(Dynamic)OMPTaskDirective.")
+        # The parent loops are the same for all the tasks with the same
+        # closest ancestor Loop, and the data-sharing attributes of the
+        # parallel region are the same for all tasks, so when the tasks of a
+        # serial region are lowered they are only computed once and then
+        # taken from the task context of that region.
+        first_anc = self.ancestor((OMPParallelDirective, Loop))
+        serial = self.ancestor(OMPSerialDirective)
+        context = serial.task_context if serial else None
+        key = ("parent_loops", id(first_anc))
+        if context is not None and key in context:
+            loop_vars, loops, anc, self._parent_loop_steps = context[key]
+        else:
+            loop_vars = []
+            loops = []
+            anc = first_anc
+            while isinstance(anc, Loop):
+                # Store the loop variable of each parent loop
+                loop_vars.append(anc.variable)
+                loops.append(anc)
+                # Recurse up the tree
+                anc = anc.ancestor((OMPParallelDirective, Loop))
+
+            if not isinstance(anc, OMPParallelDirective):
+                raise GenerationError("Failed to find an ancestor "
+                                      "OMPParallelDirective which is "
+                                      "required to compute dependencies "
+                                      "of a (Dynamic)OMPTaskDirective.")
+            self._parent_loop_steps = {}
+            if context is not None:
+                context[key] = (loop_vars, loops, anc,
+                                self._parent_loop_steps)
+
+        # These are copied as proxy loop variables can append to them.
+        self._parent_loop_vars = list(loop_vars)
+        self._parent_loops = list(loops)
 
         # Store the parent parallel directive node
         self._parent_parallel = anc
+        key = ("sharing_attributes", id(anc))
+        if context is not None and key in context:
+            (self._parallel_private, self._parallel_firstprivate,
+             self._parallel_private_names) = context[key]
+            return
         self._parallel_private, self._parallel_firstprivate, _ = \
             anc.infer_sharing_attributes()
         self._parallel_private = self._parallel_private.union(
                 self._parallel_firstprivate)
+        self._parallel_private_names = {sym.name for sym in
+                                        self._parallel_private}
+        if context is not None:
+            context[key] = (self._parallel_private,
+                            self._parallel_firstprivate,
+                            self._parallel_private_names)
+
+    def _get_parent_loop_step(self, loop):
+        """
+        Returns the step of a parent loop of this task. The steps are shared
+        between all the tasks with the same parent loops while a serial
+        region is lowered (see _find_parent_loop_vars).
+
+        :param loop: the parent loop.
+        :type loop: :py:class:`psyclone.psyir.nodes.Loop`
+
+        :returns: the value of the Literal step of the loop.
+        :rtype: int
+        """
+        step_val = self._parent_loop_steps.get(id(loop))
+        if step_val is None:
+            step_val = int(loop.step_expr.value)
+            self._parent_loop_steps[id(loop)] = step_val
+        return step_val
 
     def _handle_proxy_loop_index(self, index_list, dim, index,
                                  clause_lists):
@@ -357,10 +434,7 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
         :returns: True if ref is private, else False.
         :rtype: bool
         """
-        for parent_sym in self._parallel_private:
-            if ref.symbol.name == parent_sym.name:
-                return True
-        return False
+        return ref.symbol.name in self._parallel_private_names
 
     def _evaluate_readonly_baseref(
         self, ref, clause_lists
@@ -653,7 +727,7 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
                 # the Binary Operation. These Literals must both be
                 # Integer types, so we will convert them to integers
                 # and do some divison.
-                step_val = int(parent_loop.step_expr.value)
+                step_val = self._get_parent_loop_step(parent_loop)
                 literal_val = int(literal.value)
                 divisor = math.ceil(literal_val / step_val)
                 modulo = literal_val % step_val
@@ -708,7 +782,8 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
                     # the Binary Operation. These Literals must both be
                     # Integer types, so we will convert them to integers
                     # and do some divison.
-                    step_val = int(parent_loop.step_expr.value)
+                    step_val = self._get_parent_loop_step(
+                            parent_loop)
                     literal_val = int(literal.value)
                     divisor = math.ceil(literal_val / step_val)
                     modulo = literal_val % step_val
@@ -2137,6 +2212,7 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
                 )
 
         # Create the clauses
+        start = time.perf_counter()
         (
             private_clause,
             firstprivate_clause,
@@ -2144,6 +2220,9 @@ class DynamicOMPTaskDirective(OMPTaskDirective):
             in_clause,
             out_clause,
         ) = self._compute_clauses()
+        DynamicOMPTaskDirective._clause_computations += 1
+        DynamicOMPTaskDirective._clause_computation_time += \
+            time.perf_counter() - start
 
         # Replace the children with the new children
         old_children = self.pop_all_children()
@@ -142,6 +142,13 @@ class Literal(DataNode):
         is_eq = is_eq and self.value == other.value
         return is_eq
 
+    def _structural_hash_key(self):
+        '''
+        :returns: the value of this Literal, which is compared by __eq__.
+        :rtype: Tuple[str]
+        '''
+        return (self.value,)
+
     @property
     def datatype(self):
         '''
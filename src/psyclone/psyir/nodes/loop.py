@@ -426,6 +426,7 @@ class Loop(Statement):
         '''
         self._check_variable(var)
         self._variable = var
+        self._invalidate_cached_data()
 
     def replace_symbols_using(self, table_or_symbol):
         '''
@@ -514,7 +515,7 @@ class Loop(Statement):
             var_accesses.next_location()
 
         for child in self.loop_body.children:
-            child.reference_accesses(var_accesses)
+            child._cached_reference_accesses(var_accesses)
             var_accesses.next_location()
 
     def independent_iterations(self,
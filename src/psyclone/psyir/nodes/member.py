@@ -96,6 +96,13 @@ class Member(Node):
         is_eq = is_eq and self.name == other.name
         return is_eq
 
+    def _structural_hash_key(self):
+        '''
+        :returns: the name of this member, which is compared by __eq__.
+        :rtype: Tuple[str]
+        '''
+        return (self.name,)
+
     @property
     def name(self):
         '''
@@ -319,6 +319,35 @@ class ChildrenList(list):
         raise NotImplementedError("Sorting the Children of a Node is not "
                                   "supported.")
 
+    def __reduce__(self):
+        '''
+        Pickling support. The default list protocol would re-insert the items
+        through `extend` before the list attributes are restored, so instead
+        the list is rebuilt from its constructor arguments and the items are
+        restored by `__setstate__`.
+
+        :returns: the callable, arguments and state used to rebuild this list.
+        :rtype: Tuple[type, Tuple[Any, ...],
+                      List[:py:class:`psyclone.psyir.nodes.Node`]]
+
+        '''
+        return (self.__class__,
+                (self._node_reference, self._validation_function,
+                 self._validation_text),
+                list(self))
+
+    def __setstate__(self, items):
+        '''
+        Restores the items of an unpickled list. The items were valid children
+        (with their parent links already set) when the list was pickled, so
+        they are inserted directly without further validation or signalling.
+
+        :param items: the children to restore.
+        :type items: List[:py:class:`psyclone.psyir.nodes.Node`]
+
+        '''
+        super().extend(items)
+
 
 class Node():
     '''
@@ -356,6 +385,27 @@ class Node():
     _children_valid_format = None
     _text_name = None
     _colour = None
+    # Whether walk() results may be cached for the tree rooted at this node
+    # (see enable_walk_index) and, for any node in such a tree, the cache of
+    # walk() results itself. The cache maps each (my_type, stop_type) pair to
+    # the list of matching nodes and is discarded by update_signal().
+    _walk_index_enabled = False
+    _walk_index = None
+    # The cached structural hash of this node (see _get_structural_hash) as a
+    # (generation, hash) tuple. It is discarded by update_signal(), and all
+    # cached hashes are invalidated when the generation counter changes.
+    _structural_hash = None
+    _cache_generation = 0
+    # Whether the variable accesses of the nodes in the tree rooted at this
+    # node may be cached (see enable_access_cache) and, for any node in such
+    # a tree, the cache itself as a (generation, dict) tuple. The dictionary
+    # maps the options of a VariablesAccessInfo to the accesses of this node.
+    # Nodes whose accesses depend on more than their subtree (e.g. the
+    # symbol table of a ScopingNode), or which are too small to be worth
+    # caching (DataNodes), are never cached.
+    _access_cache_enabled = False
+    _access_cache = None
+    _access_cache_supported = True
 
     def __init__(self, ast=None, children=None, parent=None, annotations=None):
         if parent and not isinstance(parent, Node):
@@ -1069,6 +1119,12 @@ class Node():
         reduce the number of recursive calls. The recursion into the tree is
         also stopped if the (optional) 'depth' level is reached.
 
+        If the walk index has been enabled for the tree this node belongs to
+        (see :py:meth:`enable_walk_index`), walks that do not specify a
+        'depth' are answered from a cache that is kept up to date through
+        the tree-update signals, so repeated walks of an unmodified subtree
+        do not need to traverse it again.
+
         :param my_type: the class(es) for which the instances are collected.
         :type my_type: type | Tuple[type, ...]
         :param stop_type: class(es) at which recursion is halted (optional).
@@ -1081,23 +1137,158 @@ class Node():
         :rtype: List[:py:class:`psyclone.psyir.nodes.Node`]
 
         '''
-        local_list = []
-        if isinstance(self, my_type) and depth in [None, self.depth]:
-            local_list.append(self)
+        # The depth of a node depends on where its subtree is attached, which
+        # is not tracked by the update signals, so these walks are never
+        # cached.
+        if depth is None and self.root._walk_index_enabled:
+            if self._walk_index is None:
+                self._walk_index = {}
+            key = (my_type, stop_type)
+            nodes = self._walk_index.get(key)
+            if nodes is None:
+                nodes = list(self.walk_iter(my_type, stop_type))
+                self._walk_index[key] = nodes
+            # Return a copy so that callers are free to modify the list.
+            return nodes[:]
+
+        return list(self.walk_iter(my_type, stop_type, depth))
+
+    def walk_iter(self, my_type, stop_type=None, depth=None,
+                  postorder=False):
+        ''' Generator version of :py:meth:`walk`. It yields the nodes that
+        are instances of 'my_type' (with the same 'stop_type' and 'depth'
+        semantics as walk) one at a time, so callers can stop as soon as they
+        have found what they are looking for. The traversal is iterative and
+        therefore does not suffer from Python recursion costs on deeply
+        nested trees.
+
+        The tree must not be modified while the generator is in use.
+
+        :param my_type: the class(es) for which the instances are yielded.
+        :type my_type: type | Tuple[type, ...]
+        :param stop_type: class(es) at which the traversal is halted
+            (optional).
+        :type stop_type: Optional[type | Tuple[type, ...]]
+        :param depth: the depth value the instances must have (optional).
+        :type depth: Optional[int]
+        :param bool postorder: whether to yield each node after (rather than
+            before) its descendants. Defaults to False (pre-order, the same
+            order as walk).
+
+        :returns: the nodes that are instances of my_type, starting at and
+            including this node.
+        :rtype: Generator[:py:class:`psyclone.psyir.nodes.Node`]
+
+        '''
+        # The depth of each node is only computed if it is needed, and then
+        # it is obtained from the depth of its parent rather than by
+        # searching up the tree.
+        start_depth = self.depth if depth is not None else None
+        # Each entry holds a node, its depth and whether its children have
+        # already been pushed onto the stack (only used for post-order).
+        stack = [(self, start_depth, False)]
+        while stack:
+            node, node_depth, expanded = stack.pop()
+            if expanded:
+                yield node
+                continue
+            found = (isinstance(node, my_type) and
+                     depth in (None, node_depth))
+            if found and not postorder:
+                yield node
+            elif found:
+                stack.append((node, node_depth, True))
+
+            # Stop the traversal further into the tree if an instance of a
+            # class listed in stop_type is found or the requested depth has
+            # been reached.
+            if stop_type and isinstance(node, stop_type):
+                continue
+            if depth is not None and node_depth >= depth:
+                continue
+
+            child_depth = node_depth + 1 if depth is not None else None
+            for child in reversed(node.children):
+                stack.append((child, child_depth, False))
+
+    def enable_walk_index(self, enable=True):
+        ''' Enable (or disable) the caching of :py:meth:`walk` results for
+        the tree rooted at this node. Once enabled, the results of walking
+        any node in the tree are remembered by that node and reused until
+        the subtree below it is modified. This trades memory for speed and
+        is therefore opt-in: it is intended for scripts that walk large,
+        mostly unmodified trees many times.
+
+        The setting belongs to this node, so it only has effect while this
+        node is the root of the tree.
+
+        :param bool enable: whether to enable or disable the walk index.
+
+        :raises TypeError: if the enable argument is not a bool.
+
+        '''
+        if not isinstance(enable, bool):
+            raise TypeError(
+                f"The 'enable' argument of enable_walk_index() must be a "
+                f"bool but got '{type(enable).__name__}'.")
+        self._walk_index_enabled = enable
+        if not enable:
+            # Release any memory held by the existing caches.
+            for node in self.walk_iter(Node):
+                node._walk_index = None
+
+    @property
+    def walk_index_enabled(self):
+        '''
+        :returns: whether walk() results are cached for the tree that this
+            node belongs to.
+        :rtype: bool
+        '''
+        return self.root._walk_index_enabled
 
-        # Stop recursion further into the tree if an instance of a class
-        # listed in stop_type is found.
-        if stop_type and isinstance(self, stop_type):
-            return local_list
+    def enable_access_cache(self, enable=True):
+        ''' Enable (or disable) the caching of variable accesses for the
+        tree rooted at this node. Once enabled, the accesses collected by
+        :py:meth:`reference_accesses` for each statement in the tree are
+        remembered by that statement and reused until the subtree below it
+        is modified, so a VariablesAccessInfo of an unmodified subtree can
+        be created without analysing it again. This trades memory for speed
+        and is therefore opt-in: it is intended for scripts that repeatedly
+        analyse the same (mostly unmodified) code, e.g. when checking
+        whether loops can be parallelised.
 
-        # Stop recursion further into the tree if a depth level has been
-        # specified and it is reached.
-        if depth is not None and self.depth >= depth:
-            return local_list
+        The cache is kept up to date when the tree is modified, when the
+        symbol of a Reference or the variable of a Loop is changed and when
+        a symbol is renamed. Other changes to symbols (e.g. of their
+        interface) are not tracked, so the cache must be disabled (or
+        re-enabled, which discards it) after any such change.
 
-        for child in self.children:
-            local_list += child.walk(my_type, stop_type, depth=depth)
-        return local_list
+        The setting belongs to this node, so it only has effect while this
+        node is the root of the tree.
+
+        :param bool enable: whether to enable or disable the access cache.
+
+        :raises TypeError: if the enable argument is not a bool.
+
+        '''
+        if not isinstance(enable, bool):
+            raise TypeError(
+                f"The 'enable' argument of enable_access_cache() must be a "
+                f"bool but got '{type(enable).__name__}'.")
+        self._access_cache_enabled = enable
+        # Any existing cache is discarded, either to release its memory or
+        # so that it is rebuilt for the current state of the symbols.
+        for node in self.walk_iter(Node):
+            node._access_cache = None
+
+    @property
+    def access_cache_enabled(self):
+        '''
+        :returns: whether variable accesses are cached for the tree that
+            this node belongs to.
+        :rtype: bool
+        '''
+        return self.root._access_cache_enabled
 
     def get_sibling_lists(self, my_type, stop_type=None):
         '''
@@ -1121,7 +1312,7 @@ class Node():
         '''
         # Separate nodes by depth
         by_depth = {}
-        for node in self.walk(my_type, stop_type=stop_type):
+        for node in self.walk_iter(my_type, stop_type=stop_type):
             depth = node.depth
             if depth not in by_depth:
                 by_depth[depth] = []
@@ -1282,6 +1473,29 @@ class Node():
 
         return self.parent.following_node(same_routine_scope)
 
+    def _traversal_root(self, same_routine_scope):
+        '''
+        :param bool same_routine_scope: whether the traversal is restricted
+            to the nodes of the ancestor routine (if any).
+
+        :returns: the node that bounds the traversals of following() and
+            preceding(), i.e. the ancestor Routine of this node if
+            same_routine_scope is set and there is one, or the root of the
+            tree otherwise.
+        :rtype: :py:class:`psyclone.psyir.nodes.Node`
+
+        '''
+        if same_routine_scope:
+            # Import here to avoid circular dependencies
+            # pylint: disable=import-outside-toplevel
+            from psyclone.psyir.nodes import Routine
+            # If there is an ancestor Routine node then only return nodes
+            # that are within it.
+            routine_node = self.ancestor(Routine)
+            if routine_node:
+                return routine_node
+        return self.root
+
     def following(self, same_routine_scope=True, include_children=True):
         ''' Return all nodes after itself. Ordering is depth first. If the
         `same_routine_scope` argument is set to `True` (default) then only
@@ -1300,35 +1514,38 @@ class Node():
         :rtype: List[:py:class:`psyclone.psyir.nodes.Node`]
 
         '''
-        root = self.root
-        if same_routine_scope:
-            # Import here to avoid circular dependencies
-            # pylint: disable=import-outside-toplevel
-            from psyclone.psyir.nodes import Routine
-            # If there is an ancestor Routine node then only return nodes
-            # that are within it.
-            routine_node = self.ancestor(Routine)
-            if routine_node:
-                root = routine_node
+        return list(self.following_iter(same_routine_scope,
+                                        include_children))
 
-        if include_children:
-            starting_node = self
-        else:
-            starting_node = self.following_node(same_routine_scope)
-            if starting_node is None:
-                return []
-
-        all_nodes = root.walk(Node)
-        position = None
-        for index, node in enumerate(all_nodes):
-            if node is starting_node:
-                if include_children:
-                    position = index + 1  # Skip self
-                else:
-                    position = index
-                break
+    def following_iter(self, same_routine_scope=True, include_children=True):
+        ''' Generator version of :py:meth:`following`. The nodes are
+        produced in the same order, without traversing the part of the tree
+        that precedes this node and without building the list of all nodes,
+        so callers can stop as soon as they find the node they are looking
+        for.
 
-        return all_nodes[position:]
+        :param bool same_routine_scope: an optional (default `True`) argument
+            that restricts the returned nodes to those belonging to the same
+            ancestor routine.
+        :param bool include_children: an optional (default `True`) argument
+            that enables including own children, instead of starting from
+            the next sibiling.
+
+        :returns: the nodes that follow this one.
+        :rtype: Generator[:py:class:`psyclone.psyir.nodes.Node`]
+
+        '''
+        root = self._traversal_root(same_routine_scope)
+        if include_children:
+            descendants = self.walk_iter(Node)
+            next(descendants)  # Skip self
+            yield from descendants
+        node = self
+        while node is not root and node.parent is not None:
+            siblings = node.parent.children
+            for sibling in siblings[node.position + 1:]:
+                yield from sibling.walk_iter(Node)
+            node = node.parent
 
     def preceding(self, reverse=False, same_routine_scope=True):
         ''' Return all nodes before itself. Ordering is depth first. If the
@@ -1347,26 +1564,40 @@ class Node():
         :returns: the nodes preceding this one in the PSyIR tree.
         :rtype: List[:py:class:`psyclone.psyir.nodes.Node`]
         '''
-        root = self.root
-        if same_routine_scope:
-            # Import here to avoid circular dependencies
-            # pylint: disable=import-outside-toplevel
-            from psyclone.psyir.nodes import Routine
-            # If there is an ancestor Routine node then only return nodes
-            # that are within it.
-            routine_node = self.ancestor(Routine)
-            if routine_node:
-                root = routine_node
-        all_nodes = root.walk(Node)
-        position = None
-        for index, node in enumerate(all_nodes):
-            if node is self:
-                position = index
-                break
-        nodes = all_nodes[:position]
-        if reverse:
-            nodes.reverse()
-        return nodes
+        return list(self.preceding_iter(reverse, same_routine_scope))
+
+    def preceding_iter(self, reverse=False, same_routine_scope=True):
+        ''' Generator version of :py:meth:`preceding`. The nodes are
+        produced in the same order. In particular, when `reverse` is `True`
+        the nodes closest to this one are produced first, working back up
+        the tree, so callers looking for the closest match can stop without
+        traversing the whole tree.
+
+        :param bool reverse: an optional (default `False`) argument that
+            reverses the order of any returned nodes (i.e. makes them 'closest
+            first').
+        :param bool same_routine_scope: an optional (default `True`) argument
+            that restricts the returned nodes to those belonging to the same
+            ancestor routine.
+
+        :returns: the nodes preceding this one in the PSyIR tree.
+        :rtype: Generator[:py:class:`psyclone.psyir.nodes.Node`]
+        '''
+        root = self._traversal_root(same_routine_scope)
+        if not reverse:
+            for node in root.walk_iter(Node):
+                if node is self:
+                    return
+                yield node
+            return
+
+        node = self
+        while node is not root and node.parent is not None:
+            parent = node.parent
+            for sibling in reversed(parent.children[:node.position]):
+                yield from reversed(list(sibling.walk_iter(Node)))
+            yield parent
+            node = parent
 
     def immediately_precedes(self, node):
         '''
@@ -1375,9 +1606,10 @@ class Node():
         :returns: whether this node immediately precedes the given `node`.
         :rtype: bool
         '''
+        # Siblings are always in the same routine scope so there is no need
+        # to search the preceding nodes.
         return (
             self.sameParent(node)
-            and self in node.preceding()
             and self.position + 1 == node.position
         )
 
@@ -1388,9 +1620,10 @@ class Node():
         :returns: whether this node immediately follows the given `node`.
         :rtype: bool
         '''
+        # Siblings are always in the same routine scope so there is no need
+        # to search the following nodes.
         return (
             self.sameParent(node)
-            and self in node.following()
             and self.position == node.position + 1
         )
 
@@ -1490,7 +1723,39 @@ class Node():
             :py:class:`psyclone.core.VariablesAccessInfo`
         '''
         for child in self._children:
-            child.reference_accesses(var_accesses)
+            child._cached_reference_accesses(var_accesses)
+
+    def _cached_reference_accesses(self, var_accesses):
+        '''Adds the variable accesses of this node to var_accesses in the
+        same way as :py:meth:`reference_accesses`. If the access cache is
+        enabled for this tree (see :py:meth:`enable_access_cache`), the
+        accesses of this node are only collected once and then added from
+        the cache until the subtree is modified.
+
+        :param var_accesses: Stores the output results.
+        :type var_accesses: \
+            :py:class:`psyclone.core.VariablesAccessInfo`
+        '''
+        if not (self._access_cache_supported and
+                self.root._access_cache_enabled):
+            self.reference_accesses(var_accesses)
+            return
+
+        # Import here to avoid circular dependency
+        # pylint: disable=import-outside-toplevel
+        from psyclone.core import VariablesAccessInfo
+        generation = Node._cache_generation
+        if (self._access_cache is None or
+                self._access_cache[0] != generation):
+            self._access_cache = (generation, {})
+        cache = self._access_cache[1]
+        key = frozenset(var_accesses.options().items())
+        accesses = cache.get(key)
+        if accesses is None:
+            accesses = VariablesAccessInfo(options=var_accesses.options())
+            self.reference_accesses(accesses)
+            cache[key] = accesses
+        var_accesses.append(accesses)
 
     @property
     def scope(self):
@@ -1601,6 +1866,9 @@ class Node():
         self._parent = None
         self._has_constructor_parent = False
         self._annotations = other.annotations[:]
+        # The cached walk results refer to the nodes of the original tree.
+        self._walk_index = None
+        self._access_cache = None
         # Invalidate shallow copied children list
         self._children = ChildrenList(self, self._validate_child,
                                       self._children_valid_format)
@@ -1695,6 +1963,14 @@ class Node():
         (if any).
 
         '''
+        # Any cached walk results, structural hash and variable accesses for
+        # this node are now out of date. This is done before the recursion
+        # check since the node that is currently being updated may itself be
+        # modifying its children.
+        self._walk_index = None
+        self._structural_hash = None
+        self._access_cache = None
+
         # Ensure that update_signal does not get called recursively.
         if self._disable_tree_update:
             return
@@ -1709,6 +1985,62 @@ class Node():
         if self._parent:
             self._parent.update_signal()
 
+    def _structural_hash_key(self):
+        '''
+        :returns: the hashable attributes of this node (but not of its
+            children) that are compared by __eq__. A sub-class that adds
+            such an attribute to __eq__ should extend this method (any
+            subset of the compared attributes is correct).
+        :rtype: tuple
+
+        '''
+        return ()
+
+    def _get_structural_hash(self):
+        '''
+        Computes a hash of the subtree rooted at this node that is
+        consistent with __eq__, i.e. nodes that are equal have the same
+        hash. The hash is cached and discarded by update_signal() whenever
+        the subtree is modified.
+
+        :returns: the structural hash of this subtree.
+        :rtype: int
+
+        '''
+        generation = Node._cache_generation
+        if (self._structural_hash is None or
+                self._structural_hash[0] != generation):
+            value = hash((type(self), self._structural_hash_key(),
+                          tuple(child._get_structural_hash()
+                                for child in self._children)))
+            self._structural_hash = (generation, value)
+        return self._structural_hash[1]
+
+    def _invalidate_cached_data(self):
+        '''
+        Discards the cached structural hash and variable accesses of this
+        node and of all its ancestors. This must be called when an attribute
+        that they depend on is changed without modifying the tree (which
+        would trigger update_signal).
+
+        '''
+        node = self
+        while node is not None:
+            node._structural_hash = None
+            node._access_cache = None
+            node = node.parent
+
+    @staticmethod
+    def _invalidate_all_cached_data():
+        '''
+        Invalidates the cached structural hash and variable accesses of all
+        nodes. This is needed when a change can affect the cached data of
+        nodes that can not be easily identified, e.g. when a symbol is
+        renamed.
+
+        '''
+        Node._cache_generation += 1
+
     def _update_node(self):
         '''
         Specify how this node must be updated when an update_signal is
@@ -44,8 +44,6 @@ nodes.'''
 
 
 import abc
-import itertools
-import sympy
 
 from psyclone.configuration import Config
 from psyclone.core import AccessType
@@ -263,6 +261,21 @@ class OMPSerialDirective(OMPRegionDirective, metaclass=abc.ABCMeta):
     OpenMP SINGLE or OpenMP Master.
 
     '''
+    # While the children of this region are lowered, this dictionary stores
+    # information that is shared by all the tasks in the region (e.g. the
+    # data-sharing attributes of the enclosing parallel region), so that it
+    # is only computed once (see task_context).
+    _task_context = None
+
+    @property
+    def task_context(self):
+        '''
+        :returns: a dictionary in which the tasks of this region can store
+            information that is the same for all of them while this region
+            is lowered, or None if this region is not being lowered.
+        :rtype: Optional[dict]
+        '''
+        return self._task_context
 
     def _valid_dependence_literals(self, lit1, lit2):
         '''
@@ -331,9 +344,9 @@ class OMPSerialDirective(OMPRegionDirective, metaclass=abc.ABCMeta):
         function by searching through the preceding nodes for the last access
         to the symbol.
 
-        :param preceding_nodes: a list of nodes that precede the task in the
-                                tree.
-        :type preceding_nodes: List[:py:class:`psyclone.psyir.nodes.Node`]
+        :param preceding_nodes: the nodes that precede the task in the
+                                tree, closest first.
+        :type preceding_nodes: Iterable[:py:class:`psyclone.psyir.nodes.Node`]
         :param task: the OMPTaskDirective node being used in
                      _compute_accesses.
         :type task: :py:class:`psyclone.psyir.nodes.OMPTaskDirective`
@@ -408,9 +421,9 @@ class OMPSerialDirective(OMPRegionDirective, metaclass=abc.ABCMeta):
                     accesses for.
         :type ref: Union[:py:class:`psyclone.psyir.nodes.Reference,
                    :py:class:`psyclone.psyir.nodes.BinaryOperation]
-        :param preceding_nodes: a list of nodes that precede the task in the
-                                tree.
-        :type preceding_nodes: List[:py:class:`psyclone.psyir.nodes.Node`]
+        :param preceding_nodes: the nodes that precede the task in the
+                                tree, closest first.
+        :type preceding_nodes: Iterable[:py:class:`psyclone.psyir.nodes.Node`]
         :param task: the OMPTaskDirective node containing ref as a child.
         :type task: :py:class:`psyclone.psyir.nodes.OMPTaskDirective`
 
@@ -752,13 +765,16 @@ class OMPSerialDirective(OMPRegionDirective, metaclass=abc.ABCMeta):
 
         '''
         # pylint: disable=import-outside-toplevel
+        import sympy
         from psyclone.psyir.backend.sympy_writer import SymPyWriter
         # In this case we have two Reference/BinaryOperation as indices.
         # We need to attempt to find their value set and check the value
         # set matches.
-        # Find all the nodes before these tasks
-        preceding_t1 = task1.preceding(reverse=True)
-        preceding_t2 = task2.preceding(reverse=True)
+        # Find all the nodes before these tasks. They are only searched
+        # until the closest node that defines the index is found, so they
+        # are generated lazily instead of collecting the whole tree.
+        preceding_t1 = task1.preceding_iter(reverse=True)
+        preceding_t2 = task2.preceding_iter(reverse=True)
         # Get access list for each ref
         try:
             ref1_accesses = self._compute_accesses(ref1, preceding_t1, task1)
@@ -927,7 +943,35 @@ class OMPSerialDirective(OMPRegionDirective, metaclass=abc.ABCMeta):
                                       "currently supported inside the same "
                                       "parent serial region.")
 
-        pairs = itertools.combinations(tasks, 2)
+        # Find all References in each tasks' depend clauses.
+        inputs = []
+        outputs = []
+        for task in tasks:
+            inputs.append([x for x in task.input_depend_clause.children
+                           if isinstance(x, Reference)])
+            outputs.append([x for x in task.output_depend_clause.children
+                            if isinstance(x, Reference)])
+
+        # Two dependencies can only conflict if they refer to the same
+        # symbol (otherwise _check_dependency_pairing_valid accepts them
+        # immediately), so bucket the tasks by the symbols in their depend
+        # clauses and only check the pairs of tasks that share a symbol
+        # which is written by at least one of them. This avoids checking
+        # all combinations of tasks in large regions.
+        readers = {}
+        writers = {}
+        for index, task in enumerate(tasks):
+            for ref in inputs[index]:
+                readers.setdefault(ref.symbol, set()).add(index)
+            for ref in outputs[index]:
+                writers.setdefault(ref.symbol, set()).add(index)
+        candidates = set()
+        for symbol, writer_indices in writers.items():
+            for index1 in writer_indices:
+                for index2 in writer_indices | readers.get(symbol, set()):
+                    if index1 != index2:
+                        candidates.add((min(index1, index2),
+                                        max(index1, index2)))
 
         # List of tuples of dependent nodes that aren't handled by OpenMP
         unhandled_dependent_nodes = []
@@ -937,24 +981,21 @@ class OMPSerialDirective(OMPRegionDirective, metaclass=abc.ABCMeta):
         lowest_position_nodes = []
         highest_position_nodes = []
 
-        for pair in pairs:
-            task1 = pair[0]
-            task2 = pair[1]
-
-            # Find all References in each tasks' depend clauses
-            # Should we cache these instead?
-            task1_in = [x for x in task1.input_depend_clause.children
-                        if isinstance(x, Reference)]
-            task1_out = [x for x in task1.output_depend_clause.children
-                         if isinstance(x, Reference)]
-            task2_in = [x for x in task2.input_depend_clause.children
-                        if isinstance(x, Reference)]
-            task2_out = [x for x in task2.output_depend_clause.children
-                         if isinstance(x, Reference)]
-
-            inout = list(itertools.product(task1_in, task2_out))
-            outin = list(itertools.product(task1_out, task2_in))
-            outout = list(itertools.product(task1_out, task2_out))
+        # The pairs are checked in the same order as all combinations of
+        # tasks would be.
+        for index1, index2 in sorted(candidates):
+            task1 = tasks[index1]
+            task2 = tasks[index2]
+
+            # Only the pairs of References to the same symbol can be
+            # dependencies.
+            inout = [(ref1, ref2) for ref1 in inputs[index1]
+                     for ref2 in outputs[index2] if ref1.symbol is ref2.symbol]
+            outin = [(ref1, ref2) for ref1 in outputs[index1]
+                     for ref2 in inputs[index2] if ref1.symbol is ref2.symbol]
+            outout = [(ref1, ref2) for ref1 in outputs[index1]
+                      for ref2 in outputs[index2]
+                      if ref1.symbol is ref2.symbol]
             # Loop through each potential dependency pair and check they
             # will be handled correctly.
 
@@ -1087,8 +1128,13 @@ class OMPSerialDirective(OMPRegionDirective, metaclass=abc.ABCMeta):
         '''
         Checks that any task dependencies inside this node are valid.
         '''
-        # Perform parent ops
-        super().lower_to_language_level()
+        # Perform parent ops, sharing the task context between all the tasks
+        # that are lowered.
+        self._task_context = {}
+        try:
+            super().lower_to_language_level()
+        finally:
+            self._task_context = None
 
         # Validate any task dependencies in this OMPSerialRegion.
         self._validate_task_dependencies()
@@ -1482,7 +1528,8 @@ class OMPParallelDirective(OMPRegionDirective, DataSharingAttributeMixin):
         # Keep the first two children and compute the rest using the current
         # state of the node/tree (lowering it first in case new symbols are
         # created)
-        self._children = self._children[:2]
+        while len(self._children) > 2:
+            self._children.pop()
         for child in self.children:
             child.lower_to_language_level()
 
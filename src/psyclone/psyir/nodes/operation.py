@@ -95,6 +95,14 @@ class Operation(DataNode, metaclass=ABCMeta):
 
         return is_eq
 
+    def _structural_hash_key(self):
+        '''
+        :returns: the operator of this Operation, which is compared by
+            __eq__.
+        :rtype: Tuple[:py:class:`enum.Enum`]
+        '''
+        return (self.operator,)
+
     @property
     def operator(self):
         '''
@@ -146,7 +154,7 @@ class UnaryOperation(Operation):
         'MINUS', 'PLUS',
         # Logical Operators
         'NOT',
-        ])
+        ], qualname='UnaryOperation.Operator')
 
     # The numeric operators.
     _numeric_ops = (Operator.MINUS, Operator.PLUS)
@@ -226,7 +234,7 @@ class BinaryOperation(Operation):
         'EQ', 'NE', 'GT', 'LT', 'GE', 'LE',
         # Logical Operators
         'AND', 'OR', 'EQV', 'NEQV',
-        ])
+        ], qualname='BinaryOperation.Operator')
     # The numeric operators.
     _numeric_ops = (Operator.ADD, Operator.SUB, Operator.MUL, Operator.DIV,
                     Operator.REM, Operator.POW)
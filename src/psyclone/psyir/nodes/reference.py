@@ -84,6 +84,14 @@ class Reference(DataNode):
         is_eq = is_eq and (self.symbol.name == other.symbol.name)
         return is_eq
 
+    def _structural_hash_key(self):
+        '''
+        :returns: the name of the referenced symbol, which is compared by
+            __eq__.
+        :rtype: Tuple[str]
+        '''
+        return (self.symbol.name,)
+
     @property
     def is_array(self):
         '''
@@ -167,6 +175,7 @@ class Reference(DataNode):
                 f"The {type(self).__name__} symbol setter expects a PSyIR "
                 f"Symbol object but found '{type(symbol).__name__}'.")
         self._symbol = symbol
+        self._invalidate_cached_data()
 
     @property
     def name(self):
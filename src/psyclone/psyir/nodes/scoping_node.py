@@ -61,6 +61,10 @@ class ScopingNode(Node):
     '''
     # Polymorphic parameter to initialize the Symbol Table of the ScopingNode
     _symbol_table_class = SymbolTable
+    # The variable accesses of a ScopingNode include its symbol table, which
+    # can be modified without an update signal, so they are never cached
+    # (see Node.enable_access_cache).
+    _access_cache_supported = False
 
     def __init__(self, children=None, parent=None, symbol_table=None):
         self._symbol_table = None
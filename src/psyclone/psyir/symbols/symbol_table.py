@@ -45,6 +45,7 @@
 from collections import OrderedDict
 from collections.abc import Iterable
 import inspect
+import itertools
 import copy
 from typing import Any, List, Optional, Set, Union
 
@@ -63,6 +64,76 @@ from psyclone.psyir.symbols.typed_symbol import TypedSymbol
 DEFAULT_SENTINEL = object()
 
 
+class _SymbolsDict(OrderedDict):
+    '''
+    The OrderedDict used by the SymbolTable to store its symbols. It has a
+    `version` attribute that is given a new, globally unique, value every
+    time the dictionary is created or modified. This allows cached data
+    derived from the contents of one or more tables (see
+    :py:meth:`SymbolTable.get_symbols`) to be validated cheaply, even if
+    the dictionary is manipulated directly rather than through the
+    SymbolTable API. The `removal_version` attribute is similar but only
+    changes when entries are removed, i.e. when a name that was in use may
+    have become free (see :py:meth:`SymbolTable.next_available_name`).
+
+    '''
+    # Shared by all instances so that versions are never reused.
+    _version_counter = itertools.count(1)
+
+    def __init__(self, *args, **kwargs):
+        self.version = next(self._version_counter)
+        self.removal_version = self.version
+        super().__init__(*args, **kwargs)
+
+    def _modified(self, removal=False):
+        '''
+        Gives this dictionary a new version.
+
+        :param bool removal: whether entries may have been removed.
+
+        '''
+        self.version = next(self._version_counter)
+        if removal:
+            self.removal_version = self.version
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._modified()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._modified(removal=True)
+
+    def pop(self, *args):
+        self._modified(removal=True)
+        return super().pop(*args)
+
+    def popitem(self, last=True):
+        self._modified(removal=True)
+        return super().popitem(last)
+
+    def clear(self):
+        super().clear()
+        self._modified(removal=True)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._modified()
+
+    def setdefault(self, key, default=None):
+        self._modified()
+        return super().setdefault(key, default)
+
+    def move_to_end(self, key, last=True):
+        super().move_to_end(key, last)
+        self._modified()
+
+    def __reduce__(self):
+        # Copies (including pickled copies) must get a new version rather
+        # than the version of the original dictionary.
+        return (type(self), (list(self.items()),))
+
+
 class SymbolTable():
     # pylint: disable=too-many-public-methods
     '''Encapsulates the symbol table and provides methods to add new
@@ -89,7 +160,16 @@ class SymbolTable():
         # Dict of Symbol objects with the symbol names as keys. Make
         # this ordered so that different versions of Python always
         # produce code with declarations in the same order.
-        self._symbols = OrderedDict()
+        self._symbols = _SymbolsDict()
+        # Cache of the symbols in this and all ancestor symbol tables (see
+        # get_symbols), stored together with the versions of the symbol
+        # dictionaries from which it was built.
+        self._merged_symbols = None
+        # For each (normalised) root name given to next_available_name, the
+        # first numerical suffix that may still be free, stored together
+        # with the removal versions of the symbol dictionaries that were
+        # searched.
+        self._next_suffix = {}
         # Ordered list of the arguments.
         self._argument_list = []
         # Dict of tags. Some symbols can be identified with a tag.
@@ -105,6 +185,18 @@ class SymbolTable():
         self._default_visibility = None
         self.default_visibility = default_visibility
 
+    def __getstate__(self):
+        '''
+        :returns: the state of this table for pickling and copying, without
+            the caches, which are validated using version numbers that are
+            only unique within the current process.
+        :rtype: Dict[str, Any]
+        '''
+        state = self.__dict__.copy()
+        state["_merged_symbols"] = None
+        state["_next_suffix"] = {}
+        return state
+
     @property
     def default_visibility(self):
         '''
@@ -164,14 +256,7 @@ class SymbolTable():
         :rtype: :py:class:`psyclone.psyir.symbols.SymbolTable` or NoneType
 
         '''
-        # Validate the supplied scope_limit
-        if scope_limit is not None:
-            # pylint: disable=import-outside-toplevel
-            from psyclone.psyir.nodes import Node
-            if not isinstance(scope_limit, Node):
-                raise TypeError(
-                    f"The scope_limit argument '{scope_limit}', is not of "
-                    f"type `Node`.")
+        self._validate_scope_limit(scope_limit)
 
         # We use the Node with which this table is associated in order to
         # move up the Node hierarchy
@@ -183,6 +268,70 @@ class SymbolTable():
                     return search_next.symbol_table
         return None
 
+    @staticmethod
+    def _validate_scope_limit(scope_limit):
+        '''
+        :param scope_limit: the scope_limit argument to validate.
+        :type scope_limit: Optional[:py:class:`psyclone.psyir.nodes.Node`]
+
+        :raises TypeError: if the supplied scope_limit is not None or a Node.
+
+        '''
+        if scope_limit is not None:
+            # pylint: disable=import-outside-toplevel
+            from psyclone.psyir.nodes import Node
+            if not isinstance(scope_limit, Node):
+                raise TypeError(
+                    f"The scope_limit argument '{scope_limit}', is not of "
+                    f"type `Node`.")
+
+    def _scoped_tables(self, scope_limit=None):
+        '''
+        Generator over this symbol table followed by the symbol tables of
+        the enclosing scopes, innermost first. This allows searches through
+        the scopes to stop as soon as they find a match.
+
+        :param scope_limit: optional Node which limits the search space to
+            the symbol tables of the nodes within the given scope.
+        :type scope_limit: Optional[:py:class:`psyclone.psyir.nodes.Node`]
+
+        :returns: this symbol table and the symbol tables of its ancestors.
+        :rtype: Generator[:py:class:`psyclone.psyir.symbols.SymbolTable`]
+
+        '''
+        self._validate_scope_limit(scope_limit)
+        current = self
+        while current:
+            yield current
+            current = current.parent_symbol_table(scope_limit)
+
+    def _get_merged_symbols(self):
+        '''
+        Return the symbols from this symbol table and all the symbol tables
+        of its ancestors, as for get_symbols() without a scope_limit. The
+        result is cached and only rebuilt if any of the symbol tables in
+        scope have been modified, or the scopes themselves have changed,
+        since it was last computed. The returned dictionary must therefore
+        not be modified.
+
+        :returns: ordered dictionary of symbols indexed by symbol name.
+        :rtype: OrderedDict[str, :py:class:`psyclone.psyir.symbols.Symbol`]
+
+        '''
+        # pylint: disable=protected-access
+        tables = list(self._scoped_tables())
+        versions = tuple(table._symbols.version for table in tables)
+        if self._merged_symbols and self._merged_symbols[0] == versions:
+            return self._merged_symbols[1]
+
+        all_symbols = OrderedDict()
+        for table in tables:
+            for symbol_name, symbol in table._symbols.items():
+                if symbol_name not in all_symbols:
+                    all_symbols[symbol_name] = symbol
+        self._merged_symbols = (versions, all_symbols)
+        return all_symbols
+
     def get_symbols(self, scope_limit=None):
         '''Return symbols from this symbol table and all symbol tables
         associated with ancestors of the node that this symbol table
@@ -202,13 +351,15 @@ class SymbolTable():
         :rtype: OrderedDict[str] = :py:class:`psyclone.psyir.symbols.Symbol`
 
         '''
+        if scope_limit is None:
+            # Return a copy of the cached view so that it is not affected by
+            # any changes that the caller makes.
+            return OrderedDict(self._get_merged_symbols())
         all_symbols = OrderedDict()
-        current = self
-        while current:
-            for symbol_name, symbol in current.symbols_dict.items():
+        for table in self._scoped_tables(scope_limit):
+            for symbol_name, symbol in table.symbols_dict.items():
                 if symbol_name not in all_symbols:
                     all_symbols[symbol_name] = symbol
-            current = current.parent_symbol_table(scope_limit)
         return all_symbols
 
     def get_tags(self, scope_limit=None):
@@ -231,12 +382,10 @@ class SymbolTable():
 
         '''
         all_tags = OrderedDict()
-        current = self
-        while current:
-            for tag, symbol in current.tags_dict.items():
+        for table in self._scoped_tables(scope_limit):
+            for tag, symbol in table.tags_dict.items():
                 if tag not in all_tags:
                     all_tags[tag] = symbol
-            current = current.parent_symbol_table(scope_limit)
         return all_tags
 
     def shallow_copy(self):
@@ -540,22 +689,19 @@ class SymbolTable():
                 f"If supplied, argument 'other_table' should be of type "
                 f"SymbolTable but found '{type(other_table).__name__}'.")
 
+        # pylint: disable=protected-access
         if shadowing:
-            symbols = self._symbols
+            searched = [self._symbols]
         else:
             # If symbol shadowing is not permitted, the list of symbols names
             # that can't be used includes all the symbols from all the ancestor
             # symbol tables.
-            symbols = self.get_symbols()
-
-        # Construct the set of existing names.
-        existing_names = set(symbols.keys())
+            searched = [table._symbols for table in self._scoped_tables()]
 
         if other_table:
             # If a second symbol table has been supplied, include its entries
             # in the list of names to exclude.
-            other_names = set(other_table.symbols_dict.keys())
-            existing_names = existing_names.union(other_names)
+            searched.append(other_table._symbols)
 
         if root_name is not None:
             if not isinstance(root_name, str):
@@ -564,11 +710,27 @@ class SymbolTable():
                     f"but found '{type(root_name).__name__}'.")
         if not root_name:
             root_name = Config.get().psyir_root_name
-        candidate_name = root_name
-        idx = 1
-        while self._normalize(candidate_name) in existing_names:
-            candidate_name = f"{root_name}_{idx}"
+
+        # Names are only freed up by removing symbols, so if none of the
+        # searched dictionaries has had entries removed since the last
+        # search with this root name, the candidates that were found to be
+        # in use then are still in use and we can carry on from there.
+        # Since removal versions are globally unique this also detects a
+        # change in the set of searched dictionaries.
+        removal_versions = tuple(symbols.removal_version
+                                 for symbols in searched)
+        key = self._normalize(root_name)
+        idx = 0
+        if key in self._next_suffix:
+            versions, next_idx = self._next_suffix[key]
+            if versions == removal_versions:
+                idx = next_idx
+        candidate_name = root_name if idx == 0 else f"{root_name}_{idx}"
+        while any(self._normalize(candidate_name) in symbols
+                  for symbols in searched):
             idx += 1
+            candidate_name = f"{root_name}_{idx}"
+        self._next_suffix[key] = (removal_versions, idx)
         return candidate_name
 
     def add(self, new_symbol, tag=None):
@@ -607,7 +769,7 @@ class SymbolTable():
         #             f"table.")
 
         if tag:
-            if tag in self.get_tags():
+            if any(tag in table.tags_dict for table in self._scoped_tables()):
                 raise KeyError(
                     f"This symbol table, or an outer scope ancestor symbol "
                     f"table, already contains the tag '{tag}' for the symbol"
@@ -1041,7 +1203,7 @@ class SymbolTable():
                 f"a str but found '{type(name).__name__}'.")
 
         try:
-            symbol = self.get_symbols(scope_limit)[self._normalize(name)]
+            symbol = self._lookup_in_scope(self._normalize(name), scope_limit)
             if visibility:
                 if not isinstance(visibility, list):
                     vis_list = [visibility]
@@ -1072,6 +1234,29 @@ class SymbolTable():
                                f"Table.") from err
             return otherwise
 
+    def _lookup_in_scope(self, key, scope_limit):
+        '''
+        Search for the supplied (normalised) symbol name in this symbol table
+        and then in the symbol tables of the enclosing scopes, stopping at
+        the first match.
+
+        :param str key: the normalised name of the symbol.
+        :param scope_limit: optional Node which limits the search space to
+            the symbol tables of the nodes within the given scope.
+        :type scope_limit: Optional[:py:class:`psyclone.psyir.nodes.Node`]
+
+        :returns: the symbol with the given name in the closest scope.
+        :rtype: :py:class:`psyclone.psyir.symbols.Symbol`
+
+        :raises KeyError: if the name is not found in any of the tables.
+
+        '''
+        for table in self._scoped_tables(scope_limit):
+            symbol = table.symbols_dict.get(key)
+            if symbol is not None:
+                return symbol
+        raise KeyError(key)
+
     def lookup_with_tag(self, tag, scope_limit=None):
         '''Look up a symbol by its tag. The lookup can be limited by
         scope_limit (e.g. just show symbols up to a certain scope).
@@ -1097,7 +1282,10 @@ class SymbolTable():
                 f"to be a str but found '{type(tag).__name__}'.")
 
         try:
-            return self.get_tags(scope_limit)[tag]
+            for table in self._scoped_tables(scope_limit):
+                if tag in table.tags_dict:
+                    return table.tags_dict[tag]
+            raise KeyError(tag)
         except KeyError as err:
             raise KeyError(f"Could not find the tag '{tag}' in the Symbol "
                            f"Table.") from err
@@ -2017,6 +2205,11 @@ class SymbolTable():
         # expose a name attribute setter.
         # pylint: disable=protected-access
         symbol._name = name
+        # The structural hash and the variable accesses of any node that
+        # refers to this symbol include its name.
+        # pylint: disable-next=import-outside-toplevel
+        from psyclone.psyir.nodes import Node
+        Node._invalidate_all_cached_data()
 
         # Re-insert modified symbol
         self.add(symbol)
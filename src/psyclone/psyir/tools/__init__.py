@@ -36,13 +36,15 @@
 '''Tool module, containing all generic (API independent) tools.
 '''
 
+from psyclone.psyir.tools.affine_expression import AffineExpression
 from psyclone.psyir.tools.call_tree_utils import CallTreeUtils
 from psyclone.psyir.tools.dependency_tools import DTCode, DependencyTools
 from psyclone.psyir.tools.read_write_info import ReadWriteInfo
 from psyclone.psyir.tools.definition_use_chains import DefinitionUseChain
 
 # For AutoAPI documentation generation.
-__all__ = ['CallTreeUtils',
+__all__ = ['AffineExpression',
+           'CallTreeUtils',
            'DTCode',
            'DependencyTools',
            'DefinitionUseChain', 
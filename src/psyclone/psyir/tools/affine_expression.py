@@ -0,0 +1,336 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module contains the AffineExpression class, a light-weight
+representation of integer index expressions that is used by the
+DependencyTools to avoid the (comparatively expensive) use of SymPy for
+the most common array subscripts.
+
+'''
+
+from functools import reduce
+from math import gcd
+from typing import Dict, Optional, Set
+
+from psyclone.psyir.nodes import (BinaryOperation, Literal, Node, Range,
+                                  Reference, UnaryOperation)
+from psyclone.psyir.symbols import ScalarType
+
+
+class AffineExpression:
+    '''
+    An integer affine expression, i.e. a sum of terms that are each
+    multiplied by an integer coefficient, plus an integer constant. A term
+    is either a scalar variable (e.g. `i` or `n`) or a sub-expression that
+    is not affine (e.g. `map(df)` or `i*i`). The latter are treated as
+    opaque unknowns: two opaque terms are only considered to be the same
+    if their (debug) string representation is identical. For each opaque
+    term the names of all variables used in it are stored, so that it can
+    be checked whether the expression is affine in a given variable.
+
+    :param coefficients: the coefficient of each term, indexed by the name
+        of the variable or the string representation of the opaque term.
+    :param constant: the constant of the expression.
+    :param opaque_names: the names of all variables used in each opaque
+        term, indexed by the string representation of the term.
+
+    '''
+    def __init__(self, coefficients: Optional[Dict[str, int]] = None,
+                 constant: int = 0,
+                 opaque_names: Optional[Dict[str, Set[str]]] = None):
+        # Terms with a coefficient of 0 are removed, so that two expressions
+        # are identical if and only if they have the same dictionary.
+        self._coefficients = {}
+        if coefficients:
+            self._coefficients = {term: coeff for term, coeff in
+                                  coefficients.items() if coeff}
+        self._constant = constant
+        self._opaque_names = {}
+        if opaque_names:
+            self._opaque_names = {term: names for term, names in
+                                  opaque_names.items()
+                                  if term in self._coefficients}
+
+    # ------------------------------------------------------------------------
+    @staticmethod
+    def create(node: Node) -> Optional["AffineExpression"]:
+        '''
+        Creates the affine representation of the given PSyIR expression.
+        Any sub-expression that is not affine becomes an opaque term.
+
+        :param node: the PSyIR expression to convert.
+
+        :returns: the affine representation of the expression, or None if
+            the expression is a Range.
+
+        '''
+        if isinstance(node, Range):
+            return None
+        return AffineExpression._from_node(node)
+
+    # ------------------------------------------------------------------------
+    @staticmethod
+    def _from_node(node: Node) -> "AffineExpression":
+        '''
+        :param node: the PSyIR expression to convert.
+
+        :returns: the affine representation of the given expression.
+
+        '''
+        # pylint: disable=too-many-return-statements
+        if type(node) is Reference:
+            return AffineExpression({node.name: 1})
+
+        if (isinstance(node, Literal) and
+                node.datatype.intrinsic == ScalarType.Intrinsic.INTEGER):
+            try:
+                return AffineExpression(constant=int(node.value))
+            except ValueError:
+                pass
+
+        elif isinstance(node, UnaryOperation):
+            if node.operator == UnaryOperation.Operator.PLUS:
+                return AffineExpression._from_node(node.children[0])
+            if node.operator == UnaryOperation.Operator.MINUS:
+                return -AffineExpression._from_node(node.children[0])
+
+        elif isinstance(node, BinaryOperation):
+            operator = node.operator
+            if operator in (BinaryOperation.Operator.ADD,
+                            BinaryOperation.Operator.SUB,
+                            BinaryOperation.Operator.MUL):
+                lhs = AffineExpression._from_node(node.children[0])
+                rhs = AffineExpression._from_node(node.children[1])
+                if operator == BinaryOperation.Operator.ADD:
+                    return lhs + rhs
+                if operator == BinaryOperation.Operator.SUB:
+                    return lhs - rhs
+                if lhs.is_constant:
+                    return rhs.scale(lhs.constant)
+                if rhs.is_constant:
+                    return lhs.scale(rhs.constant)
+
+        # Anything else becomes an opaque term.
+        term = node.debug_string()
+        names = {ref.name for ref in node.walk(Reference)}
+        return AffineExpression({term: 1}, opaque_names={term: names})
+
+    # ------------------------------------------------------------------------
+    @property
+    def coefficients(self) -> Dict[str, int]:
+        ''':returns: the (non-zero) coefficient of each term.'''
+        return self._coefficients.copy()
+
+    # ------------------------------------------------------------------------
+    @property
+    def constant(self) -> int:
+        ''':returns: the constant of this expression.'''
+        return self._constant
+
+    # ------------------------------------------------------------------------
+    @property
+    def is_constant(self) -> bool:
+        ''':returns: whether this expression does not contain any term.'''
+        return not self._coefficients
+
+    # ------------------------------------------------------------------------
+    @property
+    def has_opaque_terms(self) -> bool:
+        ''':returns: whether this expression contains an opaque term.'''
+        return bool(self._opaque_names)
+
+    # ------------------------------------------------------------------------
+    def coefficient(self, name: str) -> int:
+        '''
+        :param name: the name of a variable.
+
+        :returns: the coefficient of the given variable (0 if it is not
+            used as a term of this expression).
+
+        '''
+        return self._coefficients.get(name, 0)
+
+    # ------------------------------------------------------------------------
+    def is_affine_in(self, name: str) -> bool:
+        '''
+        :param name: the name of a variable.
+
+        :returns: whether the given variable is not used in any of the
+            opaque terms of this expression.
+
+        '''
+        return all(name not in names for names in self._opaque_names.values())
+
+    # ------------------------------------------------------------------------
+    def scale(self, factor: int) -> "AffineExpression":
+        '''
+        :param factor: the factor by which to multiply this expression.
+
+        :returns: this expression multiplied by the given factor.
+
+        '''
+        return AffineExpression({term: factor*coeff for term, coeff in
+                                 self._coefficients.items()},
+                                factor*self._constant, self._opaque_names)
+
+    # ------------------------------------------------------------------------
+    def __neg__(self) -> "AffineExpression":
+        return self.scale(-1)
+
+    # ------------------------------------------------------------------------
+    def __add__(self, other: "AffineExpression") -> "AffineExpression":
+        coefficients = self._coefficients.copy()
+        for term, coeff in other._coefficients.items():
+            coefficients[term] = coefficients.get(term, 0) + coeff
+        opaque_names = self._opaque_names.copy()
+        opaque_names.update(other._opaque_names)
+        return AffineExpression(coefficients,
+                                self._constant + other._constant,
+                                opaque_names)
+
+    # ------------------------------------------------------------------------
+    def __sub__(self, other: "AffineExpression") -> "AffineExpression":
+        return self + (-other)
+
+    # ------------------------------------------------------------------------
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, AffineExpression):
+            return False
+        return (self._coefficients == other._coefficients and
+                self._constant == other._constant)
+
+    # ------------------------------------------------------------------------
+    def __str__(self) -> str:
+        terms = [f"{coeff}*{term}" for term, coeff in
+                 sorted(self._coefficients.items())]
+        return " + ".join(terms + [str(self._constant)])
+
+    # ------------------------------------------------------------------------
+    @staticmethod
+    def _split(expr1: "AffineExpression", expr2: "AffineExpression",
+               var_name: str):
+        '''
+        Rewrites the equation `expr1(x1) = expr2(x2)`, where `x1` and `x2`
+        are two (potentially different) values of the variable `var_name`,
+        as `a1*x1 - a2*x2 + rest = 0`.
+
+        :param expr1: the first expression.
+        :param expr2: the second expression.
+        :param var_name: the name of the variable.
+
+        :returns: the coefficients `a1` and `a2` and the remaining
+            expression `rest` (which does not depend on the variable).
+        :rtype: Tuple[int, int, :py:class:`AffineExpression`]
+
+        '''
+        coeff1 = expr1.coefficient(var_name)
+        coeff2 = expr2.coefficient(var_name)
+        # Subtracting the two expressions cancels all terms apart from the
+        # variable itself, which needs to be removed explicitly in case
+        # that the coefficients are the same.
+        rest = expr1 - expr2 - AffineExpression({var_name: coeff1 - coeff2})
+        return coeff1, coeff2, rest
+
+    # ------------------------------------------------------------------------
+    @staticmethod
+    def gcd_test(expr1: "AffineExpression", expr2: "AffineExpression",
+                 var_name: str) -> bool:
+        '''
+        Applies the GCD test to the equation `expr1(x1) = expr2(x2)`, where
+        `x1` and `x2` are two values of the variable `var_name`. All other
+        terms are assumed to be integer values that are the same in both
+        expressions. The equation `a1*x1 - a2*x2 + sum(c_k*t_k) + c = 0`
+        can only have an integer solution if the greatest common divisor
+        of all coefficients divides the constant `c`. E.g. `2*i` and
+        `2*i+1` can never be equal.
+
+        :param expr1: the first expression.
+        :param expr2: the second expression.
+        :param var_name: the name of the variable.
+
+        :returns: whether the two expressions are guaranteed to be
+            different for all values of the variable.
+
+        '''
+        coeff1, coeff2, rest = AffineExpression._split(expr1, expr2,
+                                                       var_name)
+        divisor = reduce(gcd, rest.coefficients.values(),
+                         gcd(coeff1, coeff2))
+        if divisor == 0:
+            # Only the constant is left.
+            return rest.constant != 0
+        return rest.constant % divisor != 0
+
+    # ------------------------------------------------------------------------
+    @staticmethod
+    def banerjee_test(expr1: "AffineExpression", expr2: "AffineExpression",
+                      var_name: str, lower: "AffineExpression",
+                      upper: "AffineExpression") -> bool:
+        '''
+        Applies the Banerjee test to the equation `expr1(x1) = expr2(x2)`,
+        where `x1` and `x2` are two values of the variable `var_name` in
+        the range `lower` to `upper` (inclusive). All other terms are
+        assumed to be the same in both expressions and in the bounds. The
+        test computes the minimum and maximum of `expr1(x1) - expr2(x2)`:
+        if the maximum is negative or the minimum positive, there is no
+        solution. E.g. `i` and `i+n` can never be equal for `i` in the
+        range `1` to `n`. Since the bounds can be symbolic, the test only
+        succeeds if the minimum or maximum simplifies to a constant.
+
+        :param expr1: the first expression.
+        :param expr2: the second expression.
+        :param var_name: the name of the variable.
+        :param lower: the lower bound of the variable.
+        :param upper: the upper bound of the variable.
+
+        :returns: whether the two expressions are guaranteed to be
+            different for all values of the variable within the bounds.
+
+        '''
+        coeff1, coeff2, rest = AffineExpression._split(expr1, expr2,
+                                                       var_name)
+
+        def bounds(coeff):
+            # Returns the minimum and maximum of coeff*x.
+            if coeff >= 0:
+                return lower.scale(coeff), upper.scale(coeff)
+            return upper.scale(coeff), lower.scale(coeff)
+
+        min1, max1 = bounds(coeff1)
+        min2, max2 = bounds(coeff2)
+        maximum = max1 - min2 + rest
+        if maximum.is_constant and maximum.constant < 0:
+            return True
+        minimum = min1 - max2 + rest
+        return minimum.is_constant and minimum.constant > 0
@@ -40,15 +40,13 @@
 
 from enum import IntEnum
 
-import sympy
-
 from psyclone.configuration import Config
 from psyclone.core import (AccessType, Signature, SymbolicMaths,
                            VariablesAccessInfo)
 from psyclone.errors import InternalError, LazyString
-from psyclone.psyir.backend.sympy_writer import SymPyWriter
 from psyclone.psyir.backend.visitor import VisitorError
 from psyclone.psyir.nodes import Loop, Node, Range
+from psyclone.psyir.tools.affine_expression import AffineExpression
 
 
 # pylint: disable=too-many-lines
@@ -147,6 +145,10 @@ class DependencyTools():
     :raises TypeError: if an invalid loop type is specified.
 
     '''
+    # Whether index expressions are first analysed using their affine
+    # representation, with SymPy only being used if this is not sufficient.
+    _AFFINE_FAST_PATH = True
+
     def __init__(self, loop_types_to_parallelise=None):
         if loop_types_to_parallelise:
             # Verify that all loop types specified are valid:
@@ -343,6 +345,17 @@ class DependencyTools():
         if isinstance(index_exp1, Range) or isinstance(index_exp2, Range):
             return not DependencyTools._ranges_overlap(index_exp1, index_exp2)
 
+        if DependencyTools._AFFINE_FAST_PATH:
+            difference = (AffineExpression.create(index_exp1) -
+                          AffineExpression.create(index_exp2))
+            if difference.is_constant:
+                return difference.constant != 0
+            if not difference.has_opaque_terms:
+                # The difference depends on variables, so it might be 0.
+                return False
+            # Opaque terms (e.g. `a(i+1)` and `a(1+i)`) might still be
+            # identical, so use SymPy.
+
         sym_maths = SymbolicMaths.get()
 
         # If the indices can be shown to be never equal, the accesses
@@ -388,8 +401,62 @@ class DependencyTools():
             independent integer value, and None otherwise.
         :rtype: Union[int, None]
 
+        '''
+        if DependencyTools._AFFINE_FAST_PATH:
+            expr_read = AffineExpression.create(index_read)
+            expr_written = AffineExpression.create(index_written)
+            if expr_read is None or expr_written is None:
+                # TODO 2168: at least one index is a range, see
+                # _get_sympy_dependency_distance.
+                return None
+            if (expr_read.is_affine_in(var_name) and
+                    expr_written.is_affine_in(var_name)):
+                # Solving `read(i) = written(i+d_i)` gives
+                # `d_i = (read(i) - written(i)) / c_i`, with `c_i` being the
+                # coefficient of `i` in the written expression.
+                coeff = expr_written.coefficient(var_name)
+                difference = expr_read - expr_written
+                if coeff == 0 or not difference.is_constant:
+                    if not difference.has_opaque_terms:
+                        # Either the variable is not used in the written
+                        # expression, or the distance depends on a variable.
+                        return None
+                    # Otherwise opaque terms might still be identical.
+                elif difference.constant % coeff == 0:
+                    return difference.constant // coeff
+                else:
+                    # A non-integer distance.
+                    return None
+
+        return DependencyTools._get_sympy_dependency_distance(
+            var_name, index_read, index_written)
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _get_sympy_dependency_distance(var_name, index_read, index_written):
+        '''Computes the dependency distance between two accesses to the
+        same variable using SymPy, see `_get_dependency_distance`.
+
+        :param str var_name: name of the one variable used in the two
+            index expressions.
+        :param index_read: the index expression of the variable read that
+            is to be compare.
+        :type index_read: :py:class:`psyclone.psyir.nodes.Node`
+        :param index_written: the index expression of the variable written
+            that is to be compare.
+        :type index_written: :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: the dependency distance in loop iterations if it is a
+            independent integer value, and None otherwise.
+        :rtype: Union[int, None]
+
         '''
         # pylint: disable=too-many-return-statements
+        # SymPy is only imported when required to reduce start-up time.
+        # pylint: disable=import-outside-toplevel
+        import sympy
+        from psyclone.psyir.backend.sympy_writer import SymPyWriter
+
         sympy_writer = SymPyWriter()
         try:
             sympy_expressions = sympy_writer([index_read, index_written])
@@ -472,6 +539,53 @@ class DependencyTools():
 
         return None
 
+    # -------------------------------------------------------------------------
+    def _independent_1_var(self, var_name, index_write, index_other,
+                           loop_bounds=None):
+        '''Checks if two index expressions, that only depend on the loop
+        variable `var_name` (and on variables that are not modified in the
+        loop), are independent of each other. This applies the GCD test
+        (e.g. `a(2*i)` and `a(2*i+1)` are independent) and, if the bounds
+        of the loop variable are known, the Banerjee test (e.g. `a(i)` and
+        `a(i+n)` are independent in a loop from 1 to n). See
+        :py:class:`psyclone.psyir.tools.affine_expression.AffineExpression`.
+
+        :param str var_name: the name of the loop variable.
+        :param index_write: the index expression of the write access.
+        :type index_write: :py:class:`psyclone.psyir.nodes.Node`
+        :param index_other: the index expression of the other access.
+        :type index_other: :py:class:`psyclone.psyir.nodes.Node`
+        :param loop_bounds: the lower and upper bound of the loop variable
+            of the loop to be parallelised (see `_get_loop_bounds`), if
+            known.
+        :type loop_bounds: Optional[Dict[str, Tuple[
+            :py:class:`psyclone.psyir.tools.affine_expression.AffineExpression`,
+            :py:class:`psyclone.psyir.tools.affine_expression.AffineExpression`
+            ]]]
+
+        :returns: whether the two index expressions are guaranteed to be
+            different in all iterations of the loop.
+        :rtype: bool
+
+        '''
+        if not self._AFFINE_FAST_PATH:
+            return False
+        expr_write = AffineExpression.create(index_write)
+        expr_other = AffineExpression.create(index_other)
+        if expr_write is None or expr_other is None:
+            # TODO 2168: ranges are not supported.
+            return False
+        if not (expr_write.is_affine_in(var_name) and
+                expr_other.is_affine_in(var_name)):
+            return False
+        if AffineExpression.gcd_test(expr_write, expr_other, var_name):
+            return True
+        bounds = loop_bounds.get(var_name) if loop_bounds else None
+        if bounds:
+            return AffineExpression.banerjee_test(expr_write, expr_other,
+                                                  var_name, *bounds)
+        return False
+
     # -------------------------------------------------------------------------
     @staticmethod
     def _independent_multi_subscript(var_name, write_access, other_access,
@@ -522,7 +636,7 @@ class DependencyTools():
 
     # -------------------------------------------------------------------------
     def _is_loop_carried_dependency(self, loop_variables, write_access,
-                                    other_access):
+                                    other_access, loop_bounds=None):
         '''Checks if there is any write access that is dependent with
         another (read or write) access in a different iteration. If there
         is a dependency, then the access to this array cannot be parallelised,
@@ -538,6 +652,13 @@ class DependencyTools():
         :param other_access: access information of the second single array
             access (for the same variable).
         :type other_access: :py:class:`psyclone.core.AccessInfo`
+        :param loop_bounds: the lower and upper bound of the loop variable
+            of the loop to be parallelised (see `_get_loop_bounds`), if
+            known.
+        :type loop_bounds: Optional[Dict[str, Tuple[
+            :py:class:`psyclone.psyir.tools.affine_expression.AffineExpression`,
+            :py:class:`psyclone.psyir.tools.affine_expression.AffineExpression`
+            ]]]
 
         :returns: whether there is a loop carried dependency between the
             pair of accesses, which prevents parallelisation.
@@ -590,6 +711,15 @@ class DependencyTools():
                     # can be parallelised.
                     if distance == 0:
                         return True
+                    # Otherwise the accesses might still never overlap,
+                    # e.g. `a(2*i) = a(2*i+1)`. This requires that the
+                    # variable is the loop variable (an inner loop variable
+                    # takes different values in the two accesses):
+                    if (loop_var in set_of_vars and
+                            self._independent_1_var(loop_var, index_write,
+                                                    index_other,
+                                                    loop_bounds)):
+                        return True
                 else:
                     # One subscript with several loop variables, e.g.
                     # a(i+j) in a nest of i and j loops. Assume that there
@@ -608,7 +738,8 @@ class DependencyTools():
         return False
 
     # -------------------------------------------------------------------------
-    def _array_access_parallelisable(self, loop_variables, var_info):
+    def _array_access_parallelisable(self, loop_variables, var_info,
+                                     loop_bounds=None):
         '''Tries to determine if the access pattern for an array
         given in `var_info` allows parallelisation along the first variable
         in `loop_variables`. The other elements of `loop_variables` specify
@@ -640,6 +771,13 @@ class DependencyTools():
         :param var_info: access information for this variable.
         :type var_info:
             :py:class:`psyclone.core.SingleVariableAccessInfo`
+        :param loop_bounds: the lower and upper bound of the loop variable
+            of the loop to be parallelised (see `_get_loop_bounds`), if
+            known.
+        :type loop_bounds: Optional[Dict[str, Tuple[
+            :py:class:`psyclone.psyir.tools.affine_expression.AffineExpression`,
+            :py:class:`psyclone.psyir.tools.affine_expression.AffineExpression`
+            ]]]
 
         :return: whether the variable can be used in parallel.
         :rtype: bool
@@ -662,7 +800,8 @@ class DependencyTools():
                     continue
                 if not self._is_loop_carried_dependency(loop_variables,
                                                         write_access,
-                                                        other_access):
+                                                        other_access,
+                                                        loop_bounds):
                     # There is a dependency. Try to give precise error
                     # messages:
                     if write_access is other_access:
@@ -781,6 +920,34 @@ class DependencyTools():
                           [var_info.var_name])
         return False
 
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _get_loop_bounds(loop):
+        '''Returns the lower and upper bound of the loop variable of the
+        given loop, if the sign of the step is known.
+
+        :param loop: the loop.
+        :type loop: :py:class:`psyclone.psyir.nodes.Loop`
+
+        :returns: the lower and upper bound of the loop variable as affine
+            expressions, indexed by the name of the loop variable.
+        :rtype: Dict[str, Tuple[
+            :py:class:`psyclone.psyir.tools.affine_expression.AffineExpression`,
+            :py:class:`psyclone.psyir.tools.affine_expression.AffineExpression`
+            ]]
+
+        '''
+        step = AffineExpression.create(loop.step_expr)
+        if step is None or not step.is_constant or step.constant == 0:
+            return {}
+        start = AffineExpression.create(loop.start_expr)
+        stop = AffineExpression.create(loop.stop_expr)
+        if start is None or stop is None:
+            return {}
+        if step.constant > 0:
+            return {loop.variable.name: (start, stop)}
+        return {loop.variable.name: (stop, start)}
+
     # -------------------------------------------------------------------------
     def can_loop_be_parallelised(self, loop,
                                  test_all_variables=False,
@@ -820,6 +987,7 @@ class DependencyTools():
 
         # Collect all variables used as loop variable:
         loop_vars = [loop.variable.name for loop in loop.walk(Loop)]
+        loop_bounds = self._get_loop_bounds(loop)
 
         result = True
         symbol_table = loop.scope.symbol_table
@@ -848,7 +1016,8 @@ class DependencyTools():
             if is_array:
                 # Handle arrays
                 par_able = self._array_access_parallelisable(loop_vars,
-                                                             var_info)
+                                                             var_info,
+                                                             loop_bounds)
             else:
                 # Handle scalar variable
                 par_able = self._is_scalar_parallelisable(var_info)
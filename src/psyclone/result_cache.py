@@ -0,0 +1,354 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module contains the ResultCache class which allows the psyclone
+command to skip re-processing an input file if neither the file nor
+anything else that affects the generated code has changed.
+
+'''
+
+import hashlib
+import json
+import os
+import re
+import sys
+import sysconfig
+import tempfile
+from typing import Dict, Iterable, List, Optional
+
+import fparser
+
+from psyclone.configuration import Config
+from psyclone.profiler import Profiler
+from psyclone.version import __VERSION__
+
+
+class ResultCache:
+    '''
+    A content-addressed cache of the code generated by the
+    code-transformation mode of PSyclone.
+
+    Each entry is stored in a file named after its key, which is a hashsum
+    of everything known before processing starts: the PSyclone and fparser
+    versions, the content (and name) of the input file, the content of the
+    transformation recipe and of the configuration file, and the
+    command-line settings. Since the files that are read while processing
+    a file are only known afterwards, an entry additionally stores:
+
+    - the hashsum of each Fortran source file that was accessed (e.g. to
+      resolve imports), of each file these files INCLUDE and of each
+      imported Python module that is not part of the standard library
+      (e.g. the recipe and any helper modules it imports);
+    - the file that each INCLUDE line was resolved to (or that it was not
+      found), so that an include file that is added to an earlier include
+      path invalidates the entry;
+    - a hashsum of the list of Fortran source files (and subdirectories)
+      in each directory that is searched for modules, so that a module
+      that is added (or removed) invalidates the entry.
+
+    The entry is only used if all of them are unchanged.
+
+    :param cache_path: the directory in which to store the cache entries.
+        It is created if it does not exist.
+
+    '''
+    #: Version of the layout of a cache entry.
+    CACHE_VERSION = 2
+
+    #: The extensions of the Fortran source files that are searched for
+    #: modules (see :py:class:`psyclone.parse.ModuleManager`).
+    FORTRAN_EXTENSIONS = (".F90", ".f90", ".X90", ".x90")
+
+    # The same pattern that fparser uses to find INCLUDE lines, but allowing
+    # for a trailing comment since the lines are not pre-processed here.
+    _INCLUDE_PATTERN = re.compile(
+        r"^\s*include\s*(?:\"([^\"]+)\"|'([^']+)')\s*(?:!.*)?$",
+        flags=re.IGNORECASE | re.MULTILINE)
+
+    def __init__(self, cache_path: str):
+        os.makedirs(cache_path, exist_ok=True)
+        self._cache_path = cache_path
+
+    @staticmethod
+    def _get_file_hash(filename: str) -> Optional[str]:
+        '''
+        :param filename: the name of the file to hash.
+
+        :returns: the hashsum of the content of the given file, or None if
+            the file can't be read.
+        '''
+        try:
+            with open(filename, "rb") as file_in:
+                return hashlib.md5(file_in.read()).hexdigest()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _find_recipe(recipe_file: str) -> str:
+        '''
+        Locates the recipe file in the same way as
+        :py:func:`psyclone.generator.load_script`, i.e. a recipe without
+        a path that does not exist in the current directory is searched
+        for in the Python path.
+
+        :param recipe_file: the name of the recipe file.
+
+        :returns: the path to the recipe file.
+        '''
+        filepath, filename = os.path.split(recipe_file)
+        if not filepath and not os.path.isfile(recipe_file):
+            for path in sys.path:
+                if os.path.isfile(os.path.join(path, filename)):
+                    return os.path.join(path, filename)
+        return recipe_file
+
+    def get_key(self, input_file: str, recipe_file: Optional[str],
+                line_length: str) -> str:
+        '''
+        Computes the key of the cache entry for processing the given input
+        file.
+
+        :param input_file: the file to be processed.
+        :param recipe_file: the transformation recipe, if any.
+        :param line_length: the line-length limit option.
+
+        :returns: the key of the cache entry.
+        '''
+        config = Config.get()
+        recipe_hash = None
+        if recipe_file:
+            recipe_hash = self._get_file_hash(self._find_recipe(recipe_file))
+        config_hash = None
+        if config.filename:
+            config_hash = self._get_file_hash(config.filename)
+        # pylint: disable=protected-access
+        content = [
+            ResultCache.CACHE_VERSION, __VERSION__, fparser.__version__,
+            os.path.basename(input_file), self._get_file_hash(input_file),
+            recipe_hash, config_hash, line_length, config.api,
+            config.backend_checks_enabled,
+            [os.path.abspath(path) for path in config.include_paths],
+            sorted(Profiler._options)]
+        return hashlib.md5(json.dumps(content).encode()).hexdigest()
+
+    @staticmethod
+    def _get_listing_hash(directory: str,
+                          exclude: Optional[str] = None) -> Optional[str]:
+        '''
+        :param directory: the name of a directory.
+        :param exclude: the absolute path of a file to ignore (the output
+            file, which might be written to a search path).
+
+        :returns: a hashsum of the names of the Fortran source files and of
+            the subdirectories in the given directory, or None if the
+            directory can't be read.
+        '''
+        try:
+            with os.scandir(directory) as all_entries:
+                names = sorted(
+                    entry.name for entry in all_entries
+                    if (entry.is_dir() or
+                        entry.name.endswith(ResultCache.FORTRAN_EXTENSIONS))
+                    and os.path.abspath(entry.path) != exclude)
+        except OSError:
+            return None
+        return hashlib.md5("\n".join(names).encode()).hexdigest()
+
+    @staticmethod
+    def _find_include_file(filename: str) -> Optional[str]:
+        '''
+        Locates an include file in the same way as fparser does, i.e. the
+        file is taken from the first include path that contains it.
+
+        :param filename: the name of the include file.
+
+        :returns: the path to the include file or None if it is not found.
+        '''
+        path = filename
+        for include_dir in Config.get().include_paths:
+            path = os.path.join(include_dir, filename)
+            if os.path.exists(path):
+                break
+        if not os.path.isfile(path):
+            return None
+        return path
+
+    @staticmethod
+    def get_include_files(
+            source_files: Iterable[str]) -> Dict[str, Optional[str]]:
+        '''
+        Finds the files that are included (directly or indirectly) by the
+        given Fortran source files.
+
+        :param source_files: the names of the Fortran source files.
+
+        :returns: the file that each include name is resolved to, or None if
+            the include file is not found.
+        '''
+        includes = {}
+        todo = list(source_files)
+        while todo:
+            try:
+                with open(todo.pop(), "r", encoding="utf-8",
+                          errors="replace") as file_in:
+                    source_code = file_in.read()
+            except OSError:
+                continue
+            for match in ResultCache._INCLUDE_PATTERN.finditer(source_code):
+                name = match.group(1) or match.group(2)
+                if name in includes:
+                    continue
+                includes[name] = ResultCache._find_include_file(name)
+                if includes[name]:
+                    todo.append(includes[name])
+        return includes
+
+    def _get_entry_path(self, key: str) -> str:
+        '''
+        :param key: the key of a cache entry.
+
+        :returns: the name of the file storing the entry with the given key.
+        '''
+        return os.path.join(self._cache_path, key + ".psyresult")
+
+    def load(self, key: str) -> Optional[str]:
+        '''
+        Returns the output stored in the cache entry with the given key if
+        the entry exists and none of the files, include files and search
+        paths it depends on has changed.
+
+        :param key: the key of the cache entry.
+
+        :returns: the cached output or None.
+        '''
+        try:
+            with open(self._get_entry_path(key), "r",
+                      encoding="utf-8") as file_in:
+                entry = json.load(file_in)
+            dependencies: Dict[str, str] = entry["dependencies"]
+            includes: Dict[str, Optional[str]] = entry["includes"]
+            directories: Dict[str, str] = entry["directories"]
+            output_file: Optional[str] = entry["output_file"]
+            output: str = entry["output"]
+            for name, path in includes.items():
+                if self._find_include_file(name) != path:
+                    return None
+            for directory, listing_hash in directories.items():
+                if (self._get_listing_hash(directory, output_file) !=
+                        listing_hash):
+                    return None
+            for filename, file_hash in dependencies.items():
+                if self._get_file_hash(filename) != file_hash:
+                    return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # No entry or an invalid one.
+            return None
+        return output
+
+    def store(self, key: str, output: str, source_files: Iterable[str],
+              search_paths: Iterable[str] = (),
+              output_file: Optional[str] = None) -> None:
+        '''
+        Stores the output of processing a file in the cache. The entry is
+        written to a temporary file first and then renamed so that
+        concurrent PSyclone processes never read a partially written entry.
+
+        :param key: the key of the cache entry.
+        :param output: the generated output.
+        :param source_files: the names of all Fortran source files the
+            output depends on (their include files and the imported Python
+            modules are added automatically).
+        :param search_paths: the directories that were searched for
+            modules.
+        :param output_file: the file the output was written to (if any),
+            which is ignored if it is in one of the search paths.
+        '''
+        if output_file:
+            output_file = os.path.abspath(output_file)
+        source_files = list(source_files)
+        includes = self.get_include_files(source_files)
+        dependencies = (source_files +
+                        [path for path in includes.values() if path] +
+                        self.get_python_dependencies())
+        entry = {"dependencies": {filename: self._get_file_hash(filename)
+                                  for filename in dependencies},
+                 "includes": includes,
+                 "directories": {directory:
+                                 self._get_listing_hash(directory,
+                                                        output_file)
+                                 for directory in search_paths},
+                 "output_file": output_file,
+                 "output": output}
+        tmp_name = None
+        try:
+            fd, tmp_name = tempfile.mkstemp(dir=self._cache_path,
+                                            suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as file_out:
+                json.dump(entry, file_out)
+            os.replace(tmp_name, self._get_entry_path(key))
+        except OSError as err:
+            if tmp_name:
+                try:
+                    os.remove(tmp_name)
+                except OSError:
+                    pass
+            # Failing to update the cache must not stop PSyclone.
+            # TODO #11: Use logging for this
+            print(f"Unable to write PSyclone result cache entry - ignoring: "
+                  f"{err}", file=sys.stderr)
+
+    @staticmethod
+    def get_python_dependencies() -> List[str]:
+        '''
+        :returns: the files of all currently imported Python modules that
+            are not part of the Python standard library. This includes the
+            recipe, all modules it imports (wherever they are found) and
+            the installed packages (e.g. fparser) that are used.
+        '''
+        paths = sysconfig.get_paths()
+        stdlib_dirs = {paths["stdlib"], paths["platstdlib"]}
+        site_dirs = {paths["purelib"], paths["platlib"]}
+        dependencies = []
+        for module in list(sys.modules.values()):
+            filename = getattr(module, "__file__", None)
+            if not filename or not os.path.isfile(filename):
+                continue
+            filename = os.path.abspath(filename)
+            if (any(filename.startswith(path + os.sep)
+                    for path in stdlib_dirs) and
+                    not any(filename.startswith(path + os.sep)
+                            for path in site_dirs)):
+                continue
+            dependencies.append(filename)
+        return dependencies
@@ -0,0 +1,185 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''Module containing tests for the psyclone-batch driver.'''
+
+import argparse
+import io
+import os
+
+import pytest
+
+from psyclone import batch
+from psyclone.configuration import Config
+from psyclone.parse import ModuleManager
+from psyclone.version import __VERSION__
+
+CODE = '''\
+module {0}
+  integer :: a
+end module {0}
+'''
+
+RECIPE = '''\
+def trans(psyir):
+    psyir.children[0].name = psyir.children[0].name + "_new"
+'''
+
+
+@pytest.fixture(name="batch_files")
+def fixture_batch_files(tmpdir, monkeypatch):
+    '''Creates a recipe, three Fortran files and a manifest listing them in
+    a temporary directory and changes into it.
+
+    :returns: the names of the input and output files.
+    :rtype: List[Tuple[str, str]]
+
+    '''
+    monkeypatch.chdir(tmpdir)
+    with open("batch_recipe.py", "w", encoding="utf-8") as fout:
+        fout.write(RECIPE)
+    file_pairs = []
+    for name in ["mod1", "mod2", "mod3"]:
+        with open(f"{name}.f90", "w", encoding="utf-8") as fout:
+            fout.write(CODE.format(name))
+        file_pairs.append((f"{name}.f90", f"{name}_out.f90"))
+    with open("manifest.txt", "w", encoding="utf-8") as fout:
+        fout.write("# A manifest\n\n")
+        for input_file, output_file in file_pairs:
+            fout.write(f"{input_file}   {output_file}  # a comment\n")
+    return file_pairs
+
+
+def test_read_manifest(batch_files, monkeypatch):
+    '''Test that the manifest is read correctly, from a file or from
+    stdin.'''
+    assert batch.read_manifest("manifest.txt") == batch_files
+    monkeypatch.setattr("sys.stdin", io.StringIO("a.f90 b.f90\n"))
+    assert batch.read_manifest("-") == [("a.f90", "b.f90")]
+
+    with open("manifest.txt", "a", encoding="utf-8") as fout:
+        fout.write("a.f90\n")
+    with pytest.raises(ValueError) as err:
+        batch.read_manifest("manifest.txt")
+    assert ("Line 6 of manifest 'manifest.txt' must contain an input and an "
+            "output file name but found 'a.f90'." in str(err.value))
+
+
+def test_run_version(capsys):
+    '''Test that the version is reported.'''
+    with pytest.raises(SystemExit):
+        batch.run(["--version"])
+    output, _ = capsys.readouterr()
+    assert f"psyclone-batch version: {__VERSION__}" in output
+
+
+@pytest.mark.usefixtures("clear_module_manager_instance")
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_run(batch_files, jobs):
+    '''Test that all files in the manifest are processed, either in the
+    main process or in a pool of worker processes.'''
+    batch.run(["-j", jobs, "-s", "batch_recipe.py", "-l", "output",
+               "manifest.txt"])
+    for input_file, output_file in batch_files:
+        with open(output_file, "r", encoding="utf-8") as fin:
+            name = os.path.splitext(input_file)[0]
+            assert f"module {name}_new\n" in fin.read()
+
+
+@pytest.mark.usefixtures("clear_module_manager_instance")
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_run_errors(batch_files, capsys, jobs):
+    '''Test that a file that can't be processed is reported without
+    stopping the processing of the other files.'''
+    with open(batch_files[1][0], "w", encoding="utf-8") as fout:
+        fout.write("this is not Fortran\n")
+    with open(batch_files[2][0], "a", encoding="utf-8") as fout:
+        fout.write("! " + "x" * 140 + "\n")
+    with pytest.raises(SystemExit) as err:
+        batch.run(["-j", jobs, "-l", "all", "manifest.txt"])
+    assert str(err.value) == "1"
+    assert os.path.exists(batch_files[0][1])
+    assert not os.path.exists(batch_files[1][1])
+    assert not os.path.exists(batch_files[2][1])
+    _, error = capsys.readouterr()
+    assert "Failed to process 'mod2.f90':\nTraceback" in error
+    assert "Failed to process 'mod3.f90'.\n" in error
+    assert "2 of 3 files could not be processed." in error
+
+
+def test_run_invalid_args(batch_files, capsys):
+    '''Test that invalid arguments are reported.'''
+    with pytest.raises(SystemExit) as err:
+        batch.run(["-j", "-1", "manifest.txt"])
+    assert str(err.value) == "1"
+    _, error = capsys.readouterr()
+    assert "The number of jobs must not be negative but got -1." in error
+
+    with pytest.raises(SystemExit) as err:
+        batch.run(["missing.txt"])
+    _, error = capsys.readouterr()
+    assert "No such file or directory: 'missing.txt'" in error
+
+    with pytest.raises(SystemExit) as err:
+        batch.run(["-I", "missing_dir", "manifest.txt"])
+    _, error = capsys.readouterr()
+    assert "Include path 'missing_dir' does not exist" in error
+    assert not os.path.exists(batch_files[0][1])
+
+
+@pytest.mark.usefixtures("clear_module_manager_instance")
+def test_run_module_index(batch_files):
+    '''Test that the --module-index option is passed on to the
+    ModuleManager.'''
+    batch.run(["--module-index", "modules.idx", "manifest.txt"])
+    assert ModuleManager.get().module_index_file == "modules.idx"
+    assert os.path.exists(batch_files[0][1])
+
+
+def test_init_worker(tmpdir, monkeypatch):
+    '''Test that a worker only sets up the configuration if it has not
+    inherited it.'''
+    args = argparse.Namespace(config=None, profile=["routines"],
+                              backend="disable-validation",
+                              include=[str(tmpdir)], module_index=None)
+    monkeypatch.setattr(batch, "_CONFIGURED", True)
+    batch._init_worker(args)
+    assert Config.get().include_paths != [str(tmpdir)]
+
+    monkeypatch.setattr(batch, "_CONFIGURED", False)
+    monkeypatch.setattr("psyclone.profiler.Profiler._options", [])
+    batch._init_worker(args)
+    assert Config.get().include_paths == [str(tmpdir)]
+    assert not Config.get().backend_checks_enabled
+    assert batch._CONFIGURED
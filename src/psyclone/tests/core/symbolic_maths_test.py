@@ -512,3 +512,132 @@ def test_symbolic_maths_array_and_array_index(fortran_reader):
 
     assert sym_maths.equal(psyir.children[0][1].rhs,
                            psyir.children[0][1].rhs)
+
+
+def test_symbolic_maths_cache(fortran_reader, monkeypatch):
+    '''Test that the results of symbolic comparisons are cached, that the
+    cache takes the options into account and that it only keeps the
+    least recently used entries.
+
+    '''
+    monkeypatch.setattr(SymbolicMaths, "_cache_max_size", 2)
+    SymbolicMaths.clear_cache()
+    exp1 = fortran_reader.psyir_from_expression("i + 1")
+    exp2 = fortran_reader.psyir_from_expression("j + 1")
+    exp3 = fortran_reader.psyir_from_expression("i+1")
+    sym_maths = SymbolicMaths.get()
+
+    assert not sym_maths.equal(exp1, exp2)
+    assert SymbolicMaths.cache_info() == {"hits": 0, "misses": 1,
+                                          "max_size": 2, "size": 1}
+    # A structurally identical query is found in the cache, also when
+    # asking a different question.
+    assert not sym_maths.equal(exp3, exp2)
+    assert sym_maths.never_equal(exp1, exp2) is False
+    assert SymbolicMaths.cache_info()["hits"] == 2
+
+    # The options are part of the key
+    assert sym_maths.equal(exp1, exp2, identical_variables={"i": "j"})
+    assert (sym_maths.greater_than(exp1, exp2, all_variables_positive=True)
+            == SymbolicMaths.Fuzzy.MAYBE)
+    assert SymbolicMaths.cache_info() == {"hits": 2, "misses": 3,
+                                          "max_size": 2, "size": 2}
+    # The first entry has been evicted
+    assert not sym_maths.equal(exp1, exp2)
+    assert SymbolicMaths.cache_info()["misses"] == 4
+
+    # The simplify function is not called for a cached entry
+    monkeypatch.setattr("sympy.simplify",
+                        lambda _: pytest.fail("simplify called"))
+    assert not sym_maths.equal(exp1, exp2)
+
+    SymbolicMaths.set_cache_max_size(1)
+    assert SymbolicMaths.cache_info()["size"] == 1
+    SymbolicMaths.clear_cache()
+    assert SymbolicMaths.cache_info() == {"hits": 0, "misses": 0,
+                                          "max_size": 1, "size": 0}
+
+
+def test_symbolic_maths_cache_key(fortran_reader, monkeypatch):
+    '''Test that the cache is keyed by the structure of the expressions
+    (without converting them to strings), but distinguishes references to
+    arrays and scalars, and that a hash collision does not return a wrong
+    result.
+
+    '''
+    SymbolicMaths.clear_cache()
+    psyir = fortran_reader.psyir_from_source(
+        "program test_prog\n"
+        "  integer :: a, b, x\n"
+        "  x = a - b\n"
+        "  x = a - b\n"
+        "end program test_prog\n")
+    assigns = psyir.children[0].children
+    # pylint: disable=protected-access
+    first = SymbolicMaths._subtract(assigns[0].rhs.children[0],
+                                    assigns[0].rhs.children[1])
+    monkeypatch.setattr(SymPyWriter, "_to_str",
+                        lambda *_args: pytest.fail("_to_str called"))
+    monkeypatch.setattr(SymPyWriter, "__call__",
+                        lambda *_args: pytest.fail("writer called"))
+    assert SymbolicMaths._subtract(assigns[1].rhs.children[0],
+                                   assigns[1].rhs.children[1]) == first
+    assert SymbolicMaths.cache_info()["hits"] == 1
+    monkeypatch.undo()
+
+    # The same expressions with whole-array references are not found.
+    psyir = fortran_reader.psyir_from_source(
+        "program test_prog\n"
+        "  integer :: a(10), b(10), x(10)\n"
+        "  x = a - b\n"
+        "end program test_prog\n")
+    rhs = psyir.children[0].children[0].rhs
+    result = SymbolicMaths._subtract(rhs.children[0], rhs.children[1])
+    assert result != first
+    assert SymbolicMaths.cache_info()["misses"] == 2
+
+    # All expressions have the same key: the expressions are compared.
+    monkeypatch.setattr(SymbolicMaths, "_expression_key",
+                        staticmethod(lambda _: 0))
+    exp1 = fortran_reader.psyir_from_expression("i + 1")
+    exp2 = fortran_reader.psyir_from_expression("i + 2")
+    assert SymbolicMaths.equal(exp1, exp1)
+    assert not SymbolicMaths.equal(exp1, exp2)
+    assert SymbolicMaths.cache_info()["misses"] == 4
+
+
+def test_symbolic_maths_cache_range(fortran_reader, monkeypatch):
+    '''Test that a cached result for ranges is not modified by the caller
+    and that the cache can be disabled.
+
+    '''
+    SymbolicMaths.clear_cache()
+    psyir = fortran_reader.psyir_from_source(
+        "program test_prog\n"
+        "  integer :: field(10), x\n"
+        "  x = field(1:2:3)\n"
+        "end program test_prog\n")
+    range1 = psyir.children[0][0].rhs.children[0]
+    # pylint: disable=protected-access
+    result = SymbolicMaths._subtract(range1, range1)
+    assert result == [0, 0, 0]
+    result.append(1)
+    assert SymbolicMaths._subtract(range1, range1) == [0, 0, 0]
+
+    monkeypatch.setattr(SymbolicMaths, "_cache_max_size", 0)
+    SymbolicMaths.clear_cache()
+    assert SymbolicMaths.equal(range1, range1)
+    assert SymbolicMaths.cache_info()["misses"] == 0
+
+
+def test_symbolic_maths_set_cache_max_size_errors(monkeypatch):
+    '''Test the error handling of set_cache_max_size.'''
+    monkeypatch.setattr(SymbolicMaths, "_cache_max_size", 2)
+    with pytest.raises(TypeError) as err:
+        SymbolicMaths.set_cache_max_size("1")
+    assert ("The maximum size of the cache must be an int but got 'str'."
+            in str(err.value))
+    with pytest.raises(ValueError) as err:
+        SymbolicMaths.set_cache_max_size(-1)
+    assert ("The maximum size of the cache must not be negative but got -1."
+            in str(err.value))
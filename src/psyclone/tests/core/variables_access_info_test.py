@@ -209,6 +209,44 @@ def test_variables_access_info_merge():
     assert var_accesses1.location == 2
 
 
+# -----------------------------------------------------------------------------
+def test_variables_access_info_append():
+    '''Tests that appending the accesses of another VariablesAccessInfo
+    gives the same result as adding them directly.
+    '''
+    node = Node()
+    # Create the accesses for 'c=a; b=a' in one instance:
+    direct = VariablesAccessInfo()
+    direct.add_access(Signature("c"), AccessType.WRITE, node)
+    direct.next_location()
+    direct.add_access(Signature("a"), AccessType.READ, node)
+    direct.add_access(Signature("b"), AccessType.WRITE, node)
+    direct.add_access(Signature("a"), AccessType.READ, node)
+    direct.next_location()
+
+    # And by appending the accesses for 'b=a' to the ones for 'c=a':
+    var_accesses = VariablesAccessInfo()
+    var_accesses.add_access(Signature("c"), AccessType.WRITE, node)
+    var_accesses.next_location()
+    other = VariablesAccessInfo()
+    other.add_access(Signature("a"), AccessType.READ, node)
+    other.add_access(Signature("b"), AccessType.WRITE, node)
+    other.add_access(Signature("a"), AccessType.READ, node)
+    other.next_location()
+    var_accesses.append(other)
+
+    assert var_accesses.location == direct.location == 2
+    # The order in which the variables are first accessed is kept:
+    assert list(var_accesses.keys()) == list(direct.keys())
+    for sig, var_info in direct.items():
+        assert ([str(access) for access in var_info.all_accesses] ==
+                [str(access) for access in var_accesses[sig].all_accesses])
+    # The accesses are copied and not shared with the other instance:
+    assert var_accesses[Signature("b")] is not other[Signature("b")]
+    assert var_accesses[Signature("b")][0] is not other[Signature("b")][0]
+    assert other[Signature("b")][0].location == 0
+
+
 # -----------------------------------------------------------------------------
 def test_constructor(fortran_reader):
     '''Test the optional constructor parameter (single node and list
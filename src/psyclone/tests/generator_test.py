@@ -47,6 +47,8 @@ import os
 import re
 import shutil
 import stat
+import subprocess
+import sys
 from sys import modules
 
 import pytest
@@ -61,11 +63,15 @@ from psyclone.domain.lfric import LFRicConstants
 from psyclone.domain.lfric.transformations import LFRicLoopFuseTrans
 from psyclone.errors import GenerationError
 from psyclone.generator import (
-    generate, main, check_psyir, add_builtins_use)
+    generate, main, check_psyir, add_builtins_use, code_transformation_mode)
+from psyclone.line_length import FortLineLength
+from psyclone.parse import algorithm, kernel, ModuleManager
 from psyclone.parse.algorithm import parse
 from psyclone.parse.utils import ParseError
 from psyclone.profiler import Profiler
 from psyclone.psyGen import PSyFactory
+from psyclone.psyir.backend.fortran import FortranWriter
+from psyclone.psyir.backend.visitor import VisitorError
 from psyclone.psyir.frontend.fortran import FortranReader
 from psyclone.version import __VERSION__
 
@@ -427,6 +433,88 @@ def test_no_script_gocean():
     assert "MODULE psy_single_invoke_test" in str(psy)
 
 
+def test_generate_kernel_cache(monkeypatch):
+    '''Test that the generate function parses (and raises) each kernel
+    file only once, even if its kernel is called several times.
+
+    '''
+    parsed_files = []
+    orig_parse_tree = kernel.get_kernel_parse_tree
+    orig_psyir_from_file = FortranReader.psyir_from_file
+
+    def count_parse_tree(filepath):
+        parsed_files.append(("fparser1", os.path.basename(filepath)))
+        return orig_parse_tree(filepath)
+
+    def count_psyir_from_file(self, filepath, *args, **kwargs):
+        parsed_files.append(("psyir", os.path.basename(filepath)))
+        return orig_psyir_from_file(self, filepath, *args, **kwargs)
+    monkeypatch.setattr(kernel, "get_kernel_parse_tree", count_parse_tree)
+    monkeypatch.setattr(FortranReader, "psyir_from_file",
+                        count_psyir_from_file)
+
+    alg, psy = generate(
+        os.path.join(BASE_PATH, "gocean1p0",
+                     "single_invoke_two_identical_kernels.f90"),
+        api="gocean")
+    # The algorithm file is only parsed by parse() (and its parse tree
+    # then used to create the algorithm PSyIR).
+    assert sorted(parsed_files) == [
+        ("fparser1", "compute_cu_mod.f90"),
+        ("psyir", "compute_cu_mod.f90")]
+    assert "call invoke_0(cu_fld, p_fld, u_fld)" in alg
+    assert str(psy).count("CALL compute_cu_code(") == 2
+
+
+@pytest.mark.parametrize("api, lfric_testing, stages", [
+    ("gocean", False, ["parse", "algorithm_psyir", "kernel_psyir",
+                       "algorithm_output", "psy_creation", "psy_output"]),
+    ("lfric", True, ["parse", "algorithm_psyir", "kernel_psyir",
+                     "algorithm_output", "psy_creation", "psy_output"]),
+    ("lfric", False, ["parse", "psy_creation", "algorithm_output",
+                      "psy_output"])])
+def test_generate_timing(api, lfric_testing, stages, monkeypatch):
+    '''Test that the generate function records the time taken by each
+    stage, and that the algorithm file is only parsed once.
+
+    '''
+    monkeypatch.setattr(generator, "LFRIC_TESTING", lfric_testing)
+    parsed_files = []
+    orig_parse_fp2 = algorithm.parse_fp2
+
+    def count_parse_fp2(filename):
+        parsed_files.append(filename)
+        return orig_parse_fp2(filename)
+    monkeypatch.setattr(algorithm, "parse_fp2", count_parse_fp2)
+    if api == "gocean":
+        filename = os.path.join(GOCEAN_BASE_PATH, "single_invoke.f90")
+    else:
+        filename = os.path.join(DYN03_BASE_PATH, "1_single_invoke.f90")
+    alg, _ = generate(filename, api=api)
+    assert parsed_files == [filename]
+    assert "invoke_0" in str(alg).lower()
+    timing = generator.generate_timing()
+    assert list(timing) == stages
+    assert all(seconds >= 0.0 for seconds in timing.values())
+    # A copy of the timing is returned, and it is reset by each call.
+    timing.clear()
+    generate(filename, api=api)
+    assert list(generator.generate_timing()) == stages
+
+
+def test_main_timing(capsys):
+    '''Test that the --timing option prints the time taken by each stage
+    to stderr.
+
+    '''
+    filename = os.path.join(GOCEAN_BASE_PATH, "single_invoke.f90")
+    main([filename, "-api", "gocean", "--timing"])
+    _, err = capsys.readouterr()
+    assert (f"Time taken by each stage of processing '{filename}':\n"
+            f"  parse: " in err)
+    assert re.search(r"  psy_output: \d+\.\d{3}s", err)
+
+
 def test_script_gocean(script_factory):
     '''Test that the generate function in generator.py returns
     successfully if a script (containing both trans_alg() and trans()
@@ -666,6 +754,19 @@ def test_wrong_flags_for_mode(capsys):
     assert ("The '-o' flag is not valid when using the psykal mode (-api/"
             "--psykal-dsl flag), use the -oalg, -opsy, -okern to specify the "
             "output destination of each psykal layer." in output)
+    with pytest.raises(SystemExit):
+        main([filename, "--psykal-dsl", "gocean", "--result-cache", "DIR"])
+    output, _ = capsys.readouterr()
+    assert ("The '--result-cache' flag is only supported in the "
+            "code-transformation mode" in output)
+
+    # The --timing flag has no argument.
+    filename = os.path.join(NEMO_BASE_PATH, "explicit_do_long_line.f90")
+    with pytest.raises(SystemExit):
+        main([filename, "--timing"])
+    output, _ = capsys.readouterr()
+    assert ("the psykal-mode arguments must not be present in the command"
+            in output)
 
 
 def test_main_profile(capsys):
@@ -1001,6 +1102,218 @@ def trans(psyir):
     assert "module newname\n" in new_code
 
 
+def test_code_transformation_streaming(tmpdir, monkeypatch, capsys):
+    ''' Test that the code-transformation mode writes the same code (with
+    the line length limited if requested) when it is generated in chunks,
+    and that no partial output file is left behind if the backend fails. '''
+    long_expr = " + ".join(["b"] * 60)
+    code = f'''
+        module test
+            real :: a, b
+        contains
+            subroutine one()
+                a = {long_expr}
+            end subroutine one
+            subroutine two()
+                a = 2
+            end subroutine two
+        end module test
+    '''
+    inputfile = str(tmpdir.join("code.f90"))
+    with open(inputfile, "w", encoding='utf-8') as my_file:
+        my_file.write(code)
+    expected = FortranWriter()(FortranReader().psyir_from_source(code))
+    outputfile = str(tmpdir.join("out.f90"))
+
+    code_transformation_mode(inputfile, None, outputfile)
+    with open(outputfile, "r", encoding='utf-8') as my_file:
+        assert my_file.read() == expected
+
+    code_transformation_mode(inputfile, None, outputfile,
+                             line_length="output")
+    with open(outputfile, "r", encoding='utf-8') as my_file:
+        output = my_file.read()
+    assert output == FortLineLength().process(expected)
+    assert all(len(line) <= 132 for line in output.split("\n"))
+
+    code_transformation_mode(inputfile, None, None)
+    assert capsys.readouterr().out == expected + "\n"
+
+    # Make the backend fail after the first routine has been written
+    def fail_two(self, node):
+        if node.name == "two":
+            raise VisitorError("failed")
+        return original(self, node)
+    original = FortranWriter.routine_node
+    monkeypatch.setattr(FortranWriter, "routine_node", fail_two)
+    with pytest.raises(VisitorError):
+        code_transformation_mode(inputfile, None, outputfile)
+    assert not os.path.exists(outputfile)
+
+
+@pytest.mark.usefixtures("clear_module_manager_instance")
+def test_code_transformation_result_cache(tmpdir, monkeypatch, capsys):
+    ''' Test that the code-transformation mode re-uses the cached output
+    if the input file and all files it depends on are unchanged. '''
+    module1 = '''
+        module module1
+            integer :: a
+        end module module1
+    '''
+    code = '''
+        module test
+            use module1
+        contains
+            subroutine mytest()
+                a = 1
+            end subroutine mytest
+        end module test
+    '''
+    recipe = '''
+RESOLVE_IMPORTS = True
+CALLS = []
+
+
+def trans(psyir):
+    CALLS.append(psyir)
+    '''
+    for filename, content in [("module1.f90", module1),
+                              ("code.f90", code),
+                              ("cache_recipe.py", recipe)]:
+        with open(tmpdir.join(filename), "w", encoding='utf-8') as my_file:
+            my_file.write(content)
+    monkeypatch.chdir(tmpdir)
+    cache_dir = str(tmpdir.join("cache"))
+    args = ["code.f90", "-s", "cache_recipe.py", "-o", "out.f90",
+            "--result-cache", cache_dir]
+
+    main(args)
+    recipe_calls = modules["cache_recipe"].CALLS
+    assert len(recipe_calls) == 1
+    assert len(os.listdir(cache_dir)) == 1
+    with open("out.f90", "r", encoding='utf-8') as my_file:
+        output = my_file.read()
+    assert "a = 1" in output
+    os.remove("out.f90")
+
+    # An unchanged run uses the cache instead of calling the recipe.
+    main(args)
+    assert len(recipe_calls) == 1
+    with open("out.f90", "r", encoding='utf-8') as my_file:
+        assert my_file.read() == output
+
+    # ... also when writing to stdout
+    main(args[:3] + args[5:])
+    assert len(recipe_calls) == 1
+    assert output in capsys.readouterr().out
+
+    # Changing a module that was read invalidates the entry.
+    with open("module1.f90", "a", encoding='utf-8') as my_file:
+        my_file.write("! changed")
+    main(args)
+    assert len(recipe_calls) == 2
+
+    # As does a different command-line option.
+    main(args + ["-l", "output"])
+    assert len(recipe_calls) == 3
+    assert len(os.listdir(cache_dir)) == 2
+
+
+@pytest.mark.usefixtures("clear_module_manager_instance")
+def test_code_transformation_result_cache_dependencies(tmpdir, monkeypatch):
+    ''' Test that a cache entry of the code-transformation mode is
+    invalidated by changes to include files, to the files in the search
+    paths and to Python modules imported by the recipe from anywhere, but
+    not by modules that were only read for another input file. '''
+    module1 = '''
+        module module1
+            integer :: a
+        end module module1
+    '''
+    code = '''
+        module test
+            use module1
+        contains
+            subroutine mytest()
+                include "inc.h"
+                a = b
+            end subroutine mytest
+        end module test
+    '''
+    code2 = '''
+        subroutine mytest2()
+            integer :: c
+            c = 1
+        end subroutine mytest2
+    '''
+    recipe = '''
+from cache_deps_helper import VALUE
+RESOLVE_IMPORTS = True
+CALLS = []
+
+
+def trans(psyir):
+    CALLS.append(psyir)
+    '''
+    for dirname in ["inc1", "inc2", "recipes", "helpers"]:
+        os.mkdir(tmpdir.join(dirname))
+    for filename, content in [("inc2/module1.f90", module1),
+                              ("inc2/inc.h", "integer :: b\n"),
+                              ("code.f90", code),
+                              ("code2.f90", code2),
+                              ("recipes/cache_deps_recipe.py", recipe),
+                              ("helpers/cache_deps_helper.py", "VALUE = 1")]:
+        with open(tmpdir.join(filename), "w", encoding='utf-8') as my_file:
+            my_file.write(content)
+    monkeypatch.chdir(tmpdir)
+    # The helper is imported from outside the directory of the recipe.
+    monkeypatch.syspath_prepend(str(tmpdir.join("helpers")))
+    monkeypatch.delitem(modules, "cache_deps_helper", raising=False)
+    cache_dir = str(tmpdir.join("cache"))
+    args = ["-s", "recipes/cache_deps_recipe.py", "-o", "out.f90",
+            "--result-cache", cache_dir, "-I", "inc1", "-I", "inc2"]
+
+    def run(input_file):
+        main([input_file] + args)
+        return len(modules["cache_deps_recipe"].CALLS)
+
+    assert run("code.f90") == 1
+    assert run("code2.f90") == 2
+    assert run("code.f90") == 2
+    assert run("code2.f90") == 2
+
+    # Changing the module only invalidates the entry of the file using it.
+    with open("inc2/module1.f90", "a", encoding='utf-8') as my_file:
+        my_file.write("! changed")
+    assert run("code2.f90") == 2
+    assert run("code.f90") == 3
+
+    # Changing an include file invalidates the entry.
+    with open("inc2/inc.h", "a", encoding='utf-8') as my_file:
+        my_file.write("! changed\n")
+    assert run("code.f90") == 4
+    assert run("code.f90") == 4
+
+    # As does adding an include file that takes precedence.
+    with open("inc1/inc.h", "w", encoding='utf-8') as my_file:
+        my_file.write("integer :: b\n")
+    assert run("code.f90") == 5
+    assert run("code.f90") == 5
+
+    # As does adding a Fortran file to a search path.
+    with open("inc1/other_mod.f90", "w", encoding='utf-8') as my_file:
+        my_file.write("module other_mod\nend module other_mod\n")
+    assert run("code.f90") == 6
+    assert run("code.f90") == 6
+
+    # As does changing a module imported by the recipe.
+    with open("helpers/cache_deps_helper.py", "a",
+              encoding='utf-8') as my_file:
+        my_file.write("\n# changed\n")
+    assert run("code.f90") == 7
+    assert run("code2.f90") == 8
+
+
 def test_generate_trans_error(tmpdir, capsys, monkeypatch):
     '''Test that a TransformationError exception in the generate function
     is caught and output as expected by the main function.  The
@@ -1358,6 +1671,18 @@ def test_main_include_path(capsys):
     assert str(inc_path2) in Config.get().include_paths
 
 
+@pytest.mark.usefixtures("clear_module_manager_instance")
+def test_main_module_index(tmpdir):
+    '''Test that the --module-index option sets the file of the module index
+    of the ModuleManager.
+
+    '''
+    alg_file = os.path.join(NEMO_BASE_PATH, "explicit_do.f90")
+    index_file = str(tmpdir.join("modules.idx"))
+    main([alg_file, "--module-index", index_file])
+    assert ModuleManager.get().module_index_file == index_file
+
+
 def test_utf_char(tmpdir):
     '''Test that the generate method works OK when both the Algorithm and
     Kernel code contain utf-encoded chars.
@@ -1642,3 +1967,23 @@ def test_generate_unresolved_container_gocean(tmpdir):
     assert ("alg.f90' must be named in a use statement (found "
             "['kind_params_mod', 'grid_mod', 'field_mod', 'module_mod'])."
             in str(info.value))
+
+
+def test_generator_lazy_imports():
+    '''Test that importing the generator module (which is what every
+    invocation of the psyclone command does) does not import SymPy or any
+    of the DSL APIs, since these are expensive to import and are not
+    required in the code-transformation mode. This is checked in a new
+    Python process as the modules are already imported by other tests.
+
+    '''
+    modules_to_check = ["sympy", "psyclone.dynamo0p3", "psyclone.gocean1p0",
+                        "psyclone.domain.lfric.algorithm"]
+    code = ("import sys\n"
+            "import psyclone.generator\n"
+            f"for name in {modules_to_check}:\n"
+            "    if name in sys.modules:\n"
+            "        print(name)\n")
+    output = subprocess.run([sys.executable, "-c", code], check=True,
+                            capture_output=True, text=True).stdout
+    assert output == ""
@@ -462,7 +462,7 @@ def test_parser_caseinsensitive2(monkeypatch):
     use = Use_Stmt("use testkern_mod, only : TESTKERN_TYPE")
     parser.update_arg_to_module_map(use)
 
-    def dummy_func(arg1, arg2, arg3, arg4):
+    def dummy_func(arg1, arg2, arg3, arg4, arg5):
         '''A dummy function used by monkeypatch to override the get_kernel_ast
         function. We don't care about the arguments as we just want to
         raise an exception.
@@ -36,11 +36,15 @@
 
 """Module containing tests for the FileInfo class."""
 
+from concurrent.futures import ProcessPoolExecutor
 import os
 import pytest
-from psyclone.psyir.nodes import Node
 
+from psyclone.configuration import Config
 from psyclone.parse import FileInfo
+from psyclone.parse.file_info import _CacheFileInfo
+from psyclone.psyir.backend.fortran import FortranWriter
+from psyclone.psyir.nodes import FileContainer, Node
 
 SOURCE_DUMMY = """\
 program main
@@ -465,9 +469,10 @@ def test_file_info_cachefile_pickle_dump_exception(tmpdir, monkeypatch):
 
 def test_file_info_source_psyir_test(tmpdir):
     """
-    Here, we generate a dummy psyir cached node to load it.
-    This is not yet possible (TODO #2786), but the code
-    for this already exists and is tested here.
+    Check that the PSyIR is stored in the cache file and that a new
+    FileInfo object creates its PSyIR from the cache (without running
+    fparser) and independently of any later modifications of the
+    originally created PSyIR.
 
     """
     filename = os.path.join(tmpdir, "testfile_g.f90")
@@ -488,23 +493,392 @@ def test_file_info_source_psyir_test(tmpdir):
 
     # Create cache
     file_info: FileInfo = FileInfo(filename, cache_active=True)
-    file_info.get_psyir()
+    psyir_node = file_info.get_psyir()
+    assert file_info._cache_data_save._psyir_data is not None
 
     # Load again for coverage case
-    file_info.get_psyir()
+    assert file_info.get_psyir() is psyir_node
+
+    # Modifying the PSyIR afterwards must not affect the cache
+    psyir_node.children[0].children[0].detach()
+    assert len(psyir_node.children[0].children) == 0
 
     # Load from cache
     file_info: FileInfo = FileInfo(filename, cache_active=True)
 
+    psyir_node2 = file_info.get_psyir(verbose=True)
+    assert file_info._cache_data_load is not None
+    assert file_info._cache_data_save is None
+    # The fparser tree was not required to create the PSyIR
+    assert file_info._fparser_tree is None
+    assert psyir_node2 is not psyir_node
+    assert isinstance(psyir_node2, FileContainer)
+    assert FortranWriter()(psyir_node2) == (
+        "program main\n"
+        "  real :: a\n\n"
+        "  a = 0.0\n\n"
+        "end program main\n")
+    assert file_info.get_psyir(verbose=True) is psyir_node2
+
     fparser_tree = file_info.get_fparser_tree(verbose=True)
     fparser_tree2 = file_info.get_fparser_tree(verbose=True)
     assert fparser_tree is fparser_tree2
 
-    psyir_node = Node("dummy")
-    file_info._cache_data_load._psyir_node = psyir_node
 
-    psyir_node2 = file_info.get_psyir(verbose=True)
-    assert psyir_node is psyir_node2
+def test_file_info_psyir_cache_corrupted(tmpdir, capsys):
+    """
+    Check that corrupted PSyIR data in a cache file is ignored and the
+    PSyIR is created from the source instead.
+
+    """
+    filename = os.path.join(tmpdir, "testfile_h.f90")
+    with open(filename, "w", encoding="utf-8") as fout:
+        fout.write(SOURCE_DUMMY)
+
+    file_info: FileInfo = FileInfo(filename, cache_active=True)
+    file_info.get_psyir()
+
+    file_info: FileInfo = FileInfo(filename, cache_active=True)
+    file_info._cache_load()
+    file_info._cache_data_load._psyir_data = b"GARBAGE"
+
+    psyir_node = file_info.get_psyir()
+    assert isinstance(psyir_node, FileContainer)
+    assert "Error while reading cached PSyIR - ignoring" in (
+        capsys.readouterr().out)
+
+
+def test_file_info_psyir_cache_not_serialisable(tmpdir, monkeypatch,
+                                                capsys):
+    """
+    Check that the fparser tree is still cached if the PSyIR can't be
+    serialised.
+
+    """
+    filename = os.path.join(tmpdir, "testfile_i.f90")
+    with open(filename, "w", encoding="utf-8") as fout:
+        fout.write(SOURCE_DUMMY)
+
+    def fun_exception(_1, protocol=None):
+        raise RecursionError("too deep")
+
+    file_info: FileInfo = FileInfo(filename, cache_active=True)
+    monkeypatch.setattr("pickle.dumps", fun_exception)
+    file_info.get_psyir(verbose=True)
+    assert "Unable to serialise PSyIR - ignoring: too deep" in (
+        capsys.readouterr().out)
+    monkeypatch.undo()
+
+    file_info: FileInfo = FileInfo(filename, cache_active=True)
+    file_info._cache_load()
+    assert file_info._cache_data_load._fparser_tree is not None
+    assert file_info._cache_data_load._psyir_data is None
+
+
+@pytest.mark.parametrize("attribute, value",
+                         [("CACHE_VERSION", -1),
+                          ("get_fingerprint", staticmethod(lambda: ()))])
+def test_file_info_cache_fingerprint_mismatch(tmpdir, monkeypatch,
+                                              attribute, value):
+    """
+    Check that a cache file is not used if it was written by a different
+    PSyclone version or with a different configuration.
+
+    """
+    filename = os.path.join(tmpdir, "testfile_j.f90")
+    with open(filename, "w", encoding="utf-8") as fout:
+        fout.write(SOURCE_DUMMY)
+
+    file_info: FileInfo = FileInfo(filename, cache_active=True)
+    file_info.get_psyir()
+
+    # The cache is used with the same fingerprint ...
+    file_info: FileInfo = FileInfo(filename, cache_active=True)
+    file_info.get_psyir()
+    assert file_info._cache_data_load is not None
+
+    # ... but not if it changes
+    monkeypatch.setattr(_CacheFileInfo, attribute, value)
+    file_info: FileInfo = FileInfo(filename, cache_active=True)
+    file_info.get_psyir(verbose=True)
+    assert file_info._cache_data_load is None
+    assert file_info._cache_data_save is not None
+
+
+def test_file_info_cache_fingerprint_config(tmpdir, monkeypatch):
+    """
+    Check that the fingerprint depends on the relevant configuration
+    settings.
+
+    """
+    fingerprint = _CacheFileInfo.get_fingerprint()
+    config = Config.get()
+    monkeypatch.setattr(config, "_include_paths", [str(tmpdir)])
+    assert _CacheFileInfo.get_fingerprint() != fingerprint
+
+
+def test_file_info_cache_integrity(tmpdir, capsys):
+    """
+    Check that a damaged cache file is detected by its checksum and
+    ignored.
+
+    """
+    filename = os.path.join(tmpdir, "testfile_k.f90")
+    with open(filename, "w", encoding="utf-8") as fout:
+        fout.write(SOURCE_DUMMY)
+
+    file_info: FileInfo = FileInfo(filename, cache_active=True)
+    file_info.get_psyir()
+    cache_filename = file_info._get_cache_filepath()
+    with open(cache_filename, "rb") as fin:
+        data = fin.read()
+    assert data.startswith(_CacheFileInfo.MAGIC)
+
+    # Truncate the cache file
+    with open(cache_filename, "wb") as fout:
+        fout.write(data[:-10])
+    file_info: FileInfo = FileInfo(filename, cache_active=True)
+    assert file_info._cache_load(verbose=True) is None
+    assert file_info._cache_data_load is None
+    assert "Cache file is damaged or has an unknown format" in (
+        capsys.readouterr().out)
+
+    # The cache file is restored when the PSyIR is created
+    file_info.get_psyir()
+    file_info: FileInfo = FileInfo(filename, cache_active=True)
+    file_info._cache_load()
+    assert file_info._cache_data_load is not None
+
+
+def test_file_info_cache_atomic_write(tmpdir, monkeypatch):
+    """
+    Check that the cache file is written via a temporary file which is
+    removed if the cache file can't be written.
+
+    """
+    filename = os.path.join(tmpdir, "testfile_l.f90")
+    with open(filename, "w", encoding="utf-8") as fout:
+        fout.write(SOURCE_DUMMY)
+
+    def fun_exception(_1, _2):
+        raise OSError("no replace")
+
+    file_info: FileInfo = FileInfo(filename, cache_active=True)
+    monkeypatch.setattr(os, "replace", fun_exception)
+    file_info.get_psyir()
+    monkeypatch.undo()
+    assert os.listdir(tmpdir) == ["testfile_l.f90"]
+
+    file_info: FileInfo = FileInfo(filename, cache_active=True)
+    file_info.get_psyir()
+    assert sorted(os.listdir(tmpdir)) == ["testfile_l.f90",
+                                          "testfile_l.psycache"]
+
+
+def _create_cached_file_info(source_path, cache_path, name, max_size=None):
+    """
+    Creates a source file with the given name and a FileInfo object for
+    it whose PSyIR is stored in the given cache directory.
+
+    :returns: the FileInfo object.
+
+    """
+    filename = os.path.join(source_path, name + ".f90")
+    with open(filename, "w", encoding="utf-8") as fout:
+        fout.write(SOURCE_DUMMY.replace("main", name))
+    file_info = FileInfo(filename, cache_active=True, cache_path=cache_path,
+                         cache_max_size=max_size)
+    file_info.get_psyir()
+    return file_info
+
+
+def test_file_info_cache_eviction(tmpdir):
+    """
+    Check that the least recently used cache files are removed if the
+    cache directory exceeds its maximum size, and that stale temporary
+    files are removed.
+
+    """
+    cache_path = str(tmpdir.mkdir("cache"))
+    cache_files = []
+    for idx, name in enumerate(["prog_a", "prog_b", "prog_c"]):
+        file_info = _create_cached_file_info(str(tmpdir), cache_path, name)
+        cache_files.append(file_info._get_cache_filepath())
+        # Make sure that the files have different modification times
+        os.utime(cache_files[-1], (1000 + idx, 1000 + idx))
+    size = os.path.getsize(cache_files[0])
+
+    # Using a cache file marks it as recently used
+    file_info = FileInfo(os.path.join(tmpdir, "prog_a.f90"),
+                         cache_active=True, cache_path=cache_path)
+    file_info._cache_load()
+    assert file_info._cache_data_load is not None
+    assert os.path.getmtime(cache_files[0]) > 2000
+
+    stale_tmp = os.path.join(cache_path, "x.psycache.123.tmp")
+    recent_tmp = os.path.join(cache_path, "y.psycache.123.tmp")
+    for tmp_filename in [stale_tmp, recent_tmp]:
+        with open(tmp_filename, "w", encoding="utf-8") as fout:
+            fout.write("incomplete")
+    os.utime(stale_tmp, (1000, 1000))
+
+    # Adding a fourth file exceeds the limit by two files
+    file_info = _create_cached_file_info(str(tmpdir), cache_path, "prog_d",
+                                         max_size=int(2.5*size))
+    assert sorted(os.listdir(cache_path)) == sorted(
+        [os.path.basename(cache_files[0]),
+         os.path.basename(file_info._get_cache_filepath()),
+         os.path.basename(recent_tmp), _CacheFileInfo.SIZE_FILE])
+
+    # Without a maximum size nothing is removed.
+    _create_cached_file_info(str(tmpdir), cache_path, "prog_e")
+    assert len(os.listdir(cache_path)) == 5
+
+
+def _get_cache_size(cache_path):
+    """
+    :returns: the total size of the cache files in the given directory and
+        the content of the file with the estimate of the size.
+
+    """
+    with open(os.path.join(cache_path, _CacheFileInfo.SIZE_FILE), "r",
+              encoding="utf-8") as fin:
+        size_file = fin.read()
+    return (sum(os.path.getsize(os.path.join(cache_path, name))
+                for name in os.listdir(cache_path)
+                if name.endswith(".psycache")), size_file)
+
+
+def test_file_info_cache_eviction_throttled(tmpdir, monkeypatch):
+    """
+    Check that writing a cache file only scans the cache directory if the
+    estimate of its total size exceeds the maximum size, if there is no
+    valid estimate or once per SCAN_INTERVAL files, and that files are then
+    removed until the size is below the eviction target.
+
+    """
+    cache_path = str(tmpdir.mkdir("cache"))
+    scans = []
+    orig_scandir = os.scandir
+
+    def counting_scandir(path):
+        scans.append(path)
+        return orig_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", counting_scandir)
+    monkeypatch.setattr(_CacheFileInfo, "SCAN_INTERVAL", 6)
+
+    # The first file scans the directory since there is no estimate yet.
+    _create_cached_file_info(str(tmpdir), cache_path, "prog_00",
+                             max_size=10**6)
+    assert len(scans) == 1
+    total_size, size_file = _get_cache_size(cache_path)
+    assert size_file == f"{total_size} 0\n"
+
+    # The next files only update the estimate.
+    for idx in range(1, 5):
+        _create_cached_file_info(str(tmpdir), cache_path, f"prog_{idx:02d}",
+                                 max_size=10**6)
+    assert len(scans) == 1
+    total_size, size_file = _get_cache_size(cache_path)
+    assert size_file == f"{total_size} 4\n"
+
+    # The directory is scanned again after SCAN_INTERVAL files.
+    _create_cached_file_info(str(tmpdir), cache_path, "prog_05",
+                             max_size=10**6)
+    assert len(scans) == 1
+    _create_cached_file_info(str(tmpdir), cache_path, "prog_06",
+                             max_size=10**6)
+    assert len(scans) == 2
+    total_size, size_file = _get_cache_size(cache_path)
+    assert size_file == f"{total_size} 0\n"
+
+    # Exceeding the maximum size (of about 10.5 files) removes files until
+    # the size is at most EVICTION_TARGET times the maximum size (i.e. 9
+    # files are kept), so the next file does not scan the directory again.
+    max_size = int(10.5 * total_size / 7)
+    for idx in range(7, 11):
+        _create_cached_file_info(str(tmpdir), cache_path, f"prog_{idx:02d}",
+                                 max_size=max_size)
+    assert len(scans) == 3
+    total_size, size_file = _get_cache_size(cache_path)
+    assert size_file == f"{total_size} 0\n"
+    _create_cached_file_info(str(tmpdir), cache_path, "prog_11",
+                             max_size=max_size)
+    assert len(scans) == 3
+    assert len([name for name in os.listdir(cache_path)
+                if name.endswith(".psycache")]) == 10
+
+    # A damaged estimate is ignored.
+    with open(os.path.join(cache_path, _CacheFileInfo.SIZE_FILE), "w",
+              encoding="utf-8") as fout:
+        fout.write("garbage")
+    _create_cached_file_info(str(tmpdir), cache_path, "prog_12",
+                             max_size=max_size)
+    assert len(scans) == 4
+
+
+def test_file_info_cache_size_errors(tmpdir, capsys, monkeypatch):
+    """
+    Check that errors while updating the estimate of the size of the cache
+    directory are ignored and that no temporary file is left behind.
+
+    """
+    cache_path = str(tmpdir.mkdir("cache"))
+    FileInfo._update_cache_size(os.path.join(cache_path, "missing"), 10, 1,
+                                verbose=True)
+    assert "Unable to scan cache directory" in capsys.readouterr().out
+
+    def raise_error(*_args, **_kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", raise_error)
+    FileInfo._update_cache_size(cache_path, 10, 1, verbose=True)
+    assert ("Unable to update cache size: disk full" in
+            capsys.readouterr().out)
+    assert os.listdir(cache_path) == []
+
+
+def test_file_info_cache_eviction_errors(tmpdir, capsys):
+    """
+    Check that errors while evicting cache files are ignored.
+
+    """
+    FileInfo._evict_cache_files(os.path.join(tmpdir, "missing"), 0,
+                                verbose=True)
+    assert "Unable to scan cache directory" in capsys.readouterr().out
+
+
+def _get_psyir_in_process(filename, cache_path):
+    """
+    Creates the PSyIR for the given file using the given cache directory.
+    This is executed in separate processes.
+
+    :returns: whether the cache was used.
+
+    """
+    file_info = FileInfo(filename, cache_active=True, cache_path=cache_path)
+    file_info.get_psyir()
+    return file_info._cache_data_load is not None
+
+
+def test_file_info_cache_concurrent(tmpdir):
+    """
+    Check that many processes can share the same cache directory.
+
+    """
+    filename = os.path.join(tmpdir, "testfile_m.f90")
+    with open(filename, "w", encoding="utf-8") as fout:
+        fout.write(SOURCE_DUMMY)
+    cache_path = str(tmpdir.mkdir("cache"))
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_get_psyir_in_process, [filename] * 8,
+                          [cache_path] * 8))
+
+    # There is exactly one (valid) cache file left
+    assert len(os.listdir(cache_path)) == 1
+    assert _get_psyir_in_process(filename, cache_path)
 
 
 def test_fparser_error():
@@ -50,7 +50,8 @@ from psyclone.domain.lfric.lfric_builtins import \
     BUILTIN_DEFINITIONS_FILE as fname
 from psyclone.parse.kernel import KernelType, get_kernel_metadata, \
     get_kernel_interface, KernelProcedure, Descriptor, \
-    BuiltInKernelTypeFactory, get_kernel_filepath, get_kernel_ast
+    BuiltInKernelTypeFactory, get_kernel_filepath, get_kernel_ast, \
+    get_kernel_parse_tree, KernelCache
 from psyclone.parse.utils import ParseError
 from psyclone.errors import InternalError
 
@@ -294,6 +295,62 @@ def test_getkernelast_multidir():
         False)
     assert isinstance(result, BeginSource)
 
+
+def test_getkernelast_kernel_cache(monkeypatch):
+    '''Test that get_kernel_ast only parses a kernel file once if a kernel
+    cache is supplied.
+
+    '''
+    parsed_files = []
+
+    def count_parse(filepath):
+        parsed_files.append(filepath)
+        return get_kernel_parse_tree(filepath)
+    monkeypatch.setattr("psyclone.parse.kernel.get_kernel_parse_tree",
+                        count_parse)
+    alg_file_name = os.path.join(LFRIC_BASE_PATH, "1_single_invoke.f90")
+    kernel_cache = KernelCache()
+    result1 = get_kernel_ast("testkern_mod", alg_file_name, [], False,
+                             kernel_cache)
+    result2 = get_kernel_ast("testkern_mod", alg_file_name, [], False,
+                             kernel_cache)
+    assert isinstance(result1, BeginSource)
+    assert result2 is result1
+    assert len(parsed_files) == 1
+    assert kernel_cache.cache_info() == {"hits": 1, "misses": 1,
+                                         "parse_trees": 1,
+                                         "kernel_psyirs": 0}
+    # Without a cache the file is parsed again.
+    get_kernel_ast("testkern_mod", alg_file_name, [], False)
+    assert len(parsed_files) == 2
+
+
+def test_kernel_cache_kernel_psyir(fortran_reader):
+    '''Test that the KernelCache stores a copy of a kernel PSyIR and
+    returns a new copy each time.
+
+    '''
+    kernel_cache = KernelCache()
+    filepath = os.path.join(LFRIC_BASE_PATH, "testkern_mod.F90")
+    assert kernel_cache.get_kernel_psyir(filepath, "testkern_type") is None
+    psyir = fortran_reader.psyir_from_source(CODE)
+    kernel_cache.add_kernel_psyir(filepath, "testkern_type", psyir)
+
+    copy1 = kernel_cache.get_kernel_psyir(
+        os.path.relpath(filepath), "TestKern_Type")
+    copy2 = kernel_cache.get_kernel_psyir(filepath, "testkern_type")
+    assert copy1 is not psyir
+    assert copy2 is not copy1
+    assert copy1.debug_string() == psyir.debug_string()
+    # Modifying the original does not affect the cached PSyIR.
+    psyir.children[0].detach()
+    assert copy2.children
+    # The cache is keyed by the kernel name as well.
+    assert kernel_cache.get_kernel_psyir(filepath, "other_type") is None
+    assert kernel_cache.cache_info() == {"hits": 2, "misses": 2,
+                                         "parse_trees": 0,
+                                         "kernel_psyirs": 1}
+
 # function get_kernel_interface
 
 
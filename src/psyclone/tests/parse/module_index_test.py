@@ -0,0 +1,222 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''Module containing py.test tests for the ModuleIndex.'''
+
+import json
+import os
+
+import pytest
+
+from psyclone.parse import FileInfo, ModuleIndex
+
+
+SOURCE = '''module a_mod
+  use b_mod, only: b
+  use, intrinsic :: iso_c_binding
+  USE c_mod
+  use b_mod
+  integer :: user = 1
+end module a_mod
+module d_mod
+end module d_mod
+'''
+
+
+def test_module_index_update_file(tmpdir):
+    '''Tests that the provided and used modules of a file are stored in the
+    index, and that the index is saved and loaded again.'''
+    filename = os.path.join(str(tmpdir), "a_mod.f90")
+    with open(filename, "w", encoding="utf-8") as f_out:
+        f_out.write(SOURCE)
+    index_file = os.path.join(str(tmpdir), "modules.idx")
+
+    index = ModuleIndex(index_file)
+    assert index.filename == index_file
+    with pytest.raises(KeyError):
+        index.get_provided_modules(filename)
+
+    index.update_file(FileInfo(filename))
+    assert index.get_provided_modules(filename) == ["a_mod", "d_mod"]
+    assert index.get_used_modules(filename) == ["b_mod", "iso_c_binding",
+                                                "c_mod"]
+    index.save()
+    with open(index_file, "r", encoding="utf-8") as f_in:
+        data = json.load(f_in)
+    assert data["version"] == ModuleIndex.INDEX_VERSION
+    assert list(data["files"]) == [os.path.abspath(filename)]
+
+    # An unchanged file is not read again.
+    index = ModuleIndex(index_file)
+    file_info = FileInfo(filename)
+    index.update_file(file_info)
+    assert not file_info.source_code_loaded
+    assert index.get_provided_modules(filename) == ["a_mod", "d_mod"]
+    assert not index._modified
+
+
+def test_module_index_modified_file(tmpdir):
+    '''Tests that a file is only scanned again if its content changed.'''
+    filename = os.path.join(str(tmpdir), "a_mod.f90")
+    with open(filename, "w", encoding="utf-8") as f_out:
+        f_out.write(SOURCE)
+    index = ModuleIndex(os.path.join(str(tmpdir), "modules.idx"))
+    index.update_file(FileInfo(filename))
+    entry = index._entries[os.path.abspath(filename)]
+
+    # Only the modification time changes: the file is read, but the
+    # entry is kept.
+    os.utime(filename, ns=(entry["mtime"] + 10**9, entry["mtime"] + 10**9))
+    file_info = FileInfo(filename)
+    index.update_file(file_info)
+    assert file_info.source_code_loaded
+    assert index._entries[os.path.abspath(filename)] is entry
+    assert entry["mtime"] == os.stat(filename).st_mtime_ns
+
+    # The content changes.
+    with open(filename, "w", encoding="utf-8") as f_out:
+        f_out.write("module e_mod\n  use f_mod\nend module e_mod\n")
+    index.update_file(FileInfo(filename))
+    assert index.get_provided_modules(filename) == ["e_mod"]
+    assert index.get_used_modules(filename) == ["f_mod"]
+
+    # The file is removed.
+    os.remove(filename)
+    index.update_file(FileInfo(filename))
+    with pytest.raises(KeyError):
+        index.get_provided_modules(filename)
+
+
+def test_module_index_update_directory(tmpdir):
+    '''Tests that updating a directory removes the entries of files that
+    are no longer in the directory, but keeps entries of other
+    directories.'''
+    os.makedirs(os.path.join(str(tmpdir), "sub"))
+    file_infos = []
+    for name in ["a_mod.f90", "b_mod.f90", os.path.join("sub", "c_mod.f90")]:
+        filename = os.path.join(str(tmpdir), name)
+        base = os.path.splitext(os.path.basename(name))[0]
+        with open(filename, "w", encoding="utf-8") as f_out:
+            f_out.write(f"module {base}\nend module {base}\n")
+        file_infos.append(FileInfo(filename))
+    index = ModuleIndex(os.path.join(str(tmpdir), "modules.idx"))
+    index.update_directory(str(tmpdir), file_infos[:2])
+    index.update_directory(os.path.join(str(tmpdir), "sub"), file_infos[2:])
+    assert len(index._entries) == 3
+
+    index.update_directory(str(tmpdir), file_infos[1:2])
+    assert (sorted(os.path.basename(path) for path in index._entries) ==
+            ["b_mod.f90", "c_mod.f90"])
+
+
+@pytest.mark.parametrize("content", ["not json",
+                                     '{"version": -1, "files": {}}',
+                                     '{"version": 1, "files": []}',
+                                     '{"files": {}}'])
+def test_module_index_invalid_file(tmpdir, content):
+    '''Tests that a damaged or outdated index file is ignored.'''
+    index_file = os.path.join(str(tmpdir), "modules.idx")
+    with open(index_file, "w", encoding="utf-8") as f_out:
+        f_out.write(content)
+    index = ModuleIndex(index_file)
+    assert index._entries == {}
+
+
+def test_module_index_invalid_entries(tmpdir):
+    '''Tests that damaged entries in the index file are treated as
+    missing.'''
+    filename = os.path.join(str(tmpdir), "a_mod.f90")
+    with open(filename, "w", encoding="utf-8") as f_out:
+        f_out.write(SOURCE)
+    index_file = os.path.join(str(tmpdir), "modules.idx")
+    index = ModuleIndex(index_file)
+    index.update_file(FileInfo(filename))
+    valid_entry = index._entries[filename]
+    index.save()
+
+    for key, value in [("mtime", None), ("size", "1"), ("hash", None),
+                       ("provides", "a_mod"), ("uses", [1])]:
+        entry = dict(valid_entry)
+        if value is None:
+            del entry[key]
+        else:
+            entry[key] = value
+        with open(index_file, "w", encoding="utf-8") as f_out:
+            json.dump({"version": ModuleIndex.INDEX_VERSION,
+                       "files": {filename: entry,
+                                 "other.f90": valid_entry,
+                                 "list.f90": []}}, f_out)
+        index = ModuleIndex(index_file)
+        assert list(index._entries) == ["other.f90"]
+        # The damaged entry is re-created.
+        index.update_file(FileInfo(filename))
+        assert index.get_provided_modules(filename) == ["a_mod", "d_mod"]
+
+
+def test_module_index_save_error(tmpdir, capsys):
+    '''Tests that an error when writing the index is reported, but
+    otherwise ignored.'''
+    filename = os.path.join(str(tmpdir), "a_mod.f90")
+    with open(filename, "w", encoding="utf-8") as f_out:
+        f_out.write(SOURCE)
+    index_file = os.path.join(str(tmpdir), "missing", "modules.idx")
+    index = ModuleIndex(index_file)
+    # Nothing is written if the index is unchanged.
+    index.save()
+    assert capsys.readouterr().err == ""
+
+    index.update_file(FileInfo(filename))
+    index.save()
+    assert (f"Unable to write module index '{index_file}' - ignoring"
+            in capsys.readouterr().err)
+    assert not os.path.exists(index_file)
+
+
+def test_module_index_save_tmp_file_removed(tmpdir, capsys, monkeypatch):
+    '''Tests that the temporary file is removed if the index can't be
+    written.'''
+    filename = os.path.join(str(tmpdir), "a_mod.f90")
+    with open(filename, "w", encoding="utf-8") as f_out:
+        f_out.write(SOURCE)
+    index_file = os.path.join(str(tmpdir), "modules.idx")
+    index = ModuleIndex(index_file)
+    index.update_file(FileInfo(filename))
+
+    def raise_error(*_args, **_kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", raise_error)
+    index.save()
+    assert "disk full" in capsys.readouterr().err
+    assert os.listdir(str(tmpdir)) == ["a_mod.f90"]
@@ -36,11 +36,17 @@
 
 '''Module containing py.test tests for the ModuleManager.'''
 
+from concurrent.futures import ProcessPoolExecutor
 import os
 import pytest
 
+from psyclone.configuration import Config
 from psyclone.errors import InternalError
-from psyclone.parse import FileInfo, ModuleInfo, ModuleManager
+from psyclone.parse import (
+    FileInfo, FileInfoFParserError, ModuleIndex, ModuleInfo, ModuleManager)
+from psyclone.parse import module_manager
+from psyclone.parse.module_manager import _init_worker, _process_file
+from psyclone.psyir.backend.fortran import FortranWriter
 
 
 # ----------------------------------------------------------------------------
@@ -159,6 +165,80 @@ def test_mod_manager_add_files_from_dir():
                                                   "d2/d4/e_mod.F90"}
 
 
+# ----------------------------------------------------------------------------
+@pytest.mark.usefixtures("change_into_tmpdir", "clear_module_manager_instance",
+                         "mod_man_test_setup_directories")
+def test_mod_manager_all_read_files():
+    '''Tests that all_read_files only reports the files whose source code
+    was read, both from the search path and from explicitly added files.
+
+    '''
+    mod_man = ModuleManager.get()
+    assert mod_man.all_read_files == []
+
+    mod_man.add_search_path("d1")
+    mod_man.add_files("d2/d_mod.X90")
+    assert mod_man.all_read_files == []
+
+    # Finding b_mod reads the files with similar names in d1 and d1/d3.
+    mod_man.get_module_info("b_mod")
+    assert "d1/d3/b_mod.F90" in mod_man.all_read_files
+    assert "d2/d_mod.X90" not in mod_man.all_read_files
+
+    mod_man.load_all_source_files()
+    assert mod_man.all_read_files[-1] == "d2/d_mod.X90"
+
+
+# ----------------------------------------------------------------------------
+@pytest.mark.usefixtures("change_into_tmpdir", "clear_module_manager_instance",
+                         "mod_man_test_setup_directories")
+def test_mod_manager_accessed_files():
+    '''Tests that accessed_files reports the files accessed to find a module
+    since clear_accessed_files was called, including modules that had been
+    found before, and that search_paths reports all search paths.
+
+    '''
+    mod_man = ModuleManager.get()
+    mod_man.add_search_path("d1")
+    mod_man.add_search_path("d1")
+    assert mod_man.search_paths == ["d1", "d1/d3"]
+    assert mod_man.accessed_files == []
+    mod_man.get_module_info("b_mod")
+    assert "d1/d3/b_mod.F90" in mod_man.accessed_files
+    assert "d1/a_mod.f90" in mod_man.accessed_files
+
+    mod_man.get_module_info("a_mod")
+
+    mod_man.clear_accessed_files()
+    assert mod_man.accessed_files == []
+    # a_mod has already been found and does not need to be searched again.
+    mod_man.get_module_info("a_mod")
+    assert mod_man.accessed_files == ["d1/a_mod.f90"]
+
+
+# ----------------------------------------------------------------------------
+@pytest.mark.usefixtures("change_into_tmpdir", "clear_module_manager_instance",
+                         "mod_man_test_setup_directories")
+def test_mod_manager_cache_settings():
+    '''Tests that the cache settings are passed on to all FileInfo objects
+    created by the ModuleManager.
+
+    '''
+    mod_man = ModuleManager.get(cache_active=True, cache_path="cache",
+                                cache_max_size=1000)
+    mod_man.add_search_path("d1")
+    mod_man.add_files("d2/d_mod.X90")
+    mod_man.get_module_info("a_mod")
+    mod_man.load_all_source_files()
+    file_infos = (list(mod_man._visited_files.values()) +
+                  list(mod_man._filepath_to_file_info.values()))
+    assert len(file_infos) == 2
+    for file_info in file_infos:
+        assert file_info._cache_active
+        assert file_info._cache_path == "cache"
+        assert file_info._cache_max_size == 1000
+
+
 # ----------------------------------------------------------------------------
 @pytest.mark.usefixtures("change_into_tmpdir", "clear_module_manager_instance",
                          "mod_man_test_setup_directories")
@@ -416,6 +496,320 @@ def test_mod_manager_add_files_and_more():
     assert "Module 'a_mod' already processed" in str(einfo.value)
 
 
+@pytest.mark.usefixtures("clear_module_manager_instance")
+def test_mod_manager_num_processes():
+    '''Tests setting the number of processes used by the ModuleManager.'''
+    mod_man = ModuleManager.get()
+    assert mod_man.num_processes == 1
+    mod_man.num_processes = 4
+    assert mod_man.num_processes == 4
+    with pytest.raises(TypeError) as err:
+        mod_man.num_processes = "4"
+    assert ("The number of processes must be an int but got 'str'."
+            in str(err.value))
+    with pytest.raises(ValueError) as err:
+        mod_man.num_processes = 0
+    assert ("The number of processes must be at least 1 but got 0."
+            in str(err.value))
+
+
+@pytest.mark.usefixtures("clear_module_manager_instance")
+def test_mod_manager_module_index_file(tmpdir):
+    '''Tests setting the file of the module index.'''
+    mod_man = ModuleManager.get()
+    assert mod_man.module_index_file is None
+    assert mod_man.module_index is None
+    index_file = os.path.join(str(tmpdir), "modules.idx")
+    mod_man.module_index_file = index_file
+    assert mod_man.module_index_file == index_file
+    assert isinstance(mod_man.module_index, ModuleIndex)
+    with pytest.raises(TypeError) as err:
+        mod_man.module_index_file = 1
+    assert ("The module index file must be a str or None but got 'int'."
+            in str(err.value))
+    mod_man.module_index_file = None
+    assert mod_man.module_index is None
+
+
+@pytest.mark.usefixtures("change_into_tmpdir", "clear_module_manager_instance",
+                         "mod_man_test_setup_directories")
+def test_mod_manager_module_index():
+    '''Tests that modules are found with the module index, and that files
+    are only read if the index is created or if they have changed.'''
+    # A module in a file with a dissimilar name is only found with the
+    # index. The .f90 file takes precedence over the .F90 file, even
+    # though the latter is in an earlier search path.
+    with open(os.path.join("d1", "zzz.F90"), "w", encoding="utf-8") as f_out:
+        f_out.write("module other_mod\nend module other_mod")
+    os.makedirs("d5")
+    with open(os.path.join("d5", "yyy.f90"), "w", encoding="utf-8") as f_out:
+        f_out.write("module other_mod\nend module other_mod")
+
+    mod_man = ModuleManager.get()
+    mod_man.module_index_file = "modules.idx"
+    mod_man.add_search_path(["d1", "d2", "d5"])
+    assert os.path.exists("modules.idx")
+    assert mod_man._remaining_search_paths == {}
+    # Creating the index reads all Fortran files.
+    assert len(mod_man.all_read_files) == 9
+    assert mod_man.module_index.get_used_modules("d1/d3/c_mod.x90") == \
+        ["a_mod", "b_mod"]
+
+    mod_info = mod_man.get_module_info("other_mod")
+    assert mod_info.filename == "d5/yyy.f90"
+    assert mod_man.get_module_info("other_mod") is mod_info
+    mod_info = mod_man.get_module_info("b_mod")
+    assert mod_info.filename == "d1/d3/b_mod.F90"
+    assert mod_man.get_module_info("b_mod") is mod_info
+    assert mod_man.get_module_info("e_mod").filename == "d2/d4/e_mod.F90"
+    with pytest.raises(FileNotFoundError):
+        mod_man.get_module_info("netcdf")
+    # Adding the same search path again does not change anything.
+    mod_man.add_search_path("d1")
+    assert mod_man.get_module_info("b_mod") is mod_info
+
+    # A new ModuleManager uses the index without reading any files.
+    ModuleManager._instance = None
+    mod_man = ModuleManager.get()
+    mod_man.module_index_file = "modules.idx"
+    mod_man.add_search_path(["d1", "d2", "d5"])
+    assert mod_man.get_module_info("other_mod").filename == "d5/yyy.f90"
+    assert mod_man.get_module_info("g_mod").filename == "d2/g_mod.F90"
+    assert mod_man.all_read_files == []
+
+    # Modified and new files are read (and added to the index).
+    os.remove(os.path.join("d5", "yyy.f90"))
+    with open(os.path.join("d2", "g_mod.F90"), "w",
+              encoding="utf-8") as f_out:
+        f_out.write("module h_mod\nend module h_mod")
+    with open(os.path.join("d2", "x.f90"), "w", encoding="utf-8") as f_out:
+        f_out.write("module g_mod\nend module g_mod")
+    ModuleManager._instance = None
+    mod_man = ModuleManager.get()
+    mod_man.module_index_file = "modules.idx"
+    mod_man.add_search_path(["d1", "d2", "d5"])
+    assert sorted(mod_man.all_read_files) == ["d2/g_mod.F90", "d2/x.f90"]
+    assert mod_man.get_module_info("other_mod").filename == "d1/zzz.F90"
+    assert mod_man.get_module_info("g_mod").filename == "d2/x.f90"
+    assert mod_man.get_module_info("h_mod").filename == "d2/g_mod.F90"
+
+
+@pytest.mark.usefixtures("change_into_tmpdir", "clear_module_manager_instance",
+                         "mod_man_test_setup_directories")
+def test_mod_manager_module_index_fallback():
+    '''Tests that modules in directories that were added before the module
+    index was enabled are still found.'''
+    mod_man = ModuleManager.get()
+    mod_man.add_search_path("d1")
+    mod_man.module_index_file = "modules.idx"
+    mod_man.add_search_path("d2")
+    assert list(mod_man._remaining_search_paths) == ["d1", "d1/d3"]
+    assert mod_man.get_module_info("d_mod").filename == "d2/d_mod.X90"
+    assert mod_man.get_module_info("b_mod").filename == "d1/d3/b_mod.F90"
+    with pytest.raises(FileNotFoundError):
+        mod_man.get_module_info("netcdf")
+
+
+@pytest.mark.usefixtures("change_into_tmpdir", "clear_module_manager_instance",
+                         "mod_man_test_setup_directories")
+def test_mod_manager_module_index_searched_dir():
+    '''Tests that enabling the module index for a directory that was
+    already searched (e.g. when the same search path is added again) keeps
+    the index entries of all files in this directory.'''
+    mod_man = ModuleManager.get()
+    mod_man.module_index_file = "modules.idx"
+    mod_man.add_search_path("d1")
+    num_entries = len(ModuleIndex("modules.idx")._entries)
+    assert num_entries > 1
+
+    ModuleManager._instance = None
+    mod_man = ModuleManager.get()
+    mod_man.add_search_path("d1")
+    # Search the directory without the index, so its files are visited.
+    assert mod_man.get_module_info("a_mod").filename == "d1/a_mod.f90"
+    mod_man.module_index_file = "modules.idx"
+    mod_man.add_search_path("d1")
+    assert len(ModuleIndex("modules.idx")._entries) == num_entries
+    assert mod_man.get_module_info("a_mod").filename == "d1/a_mod.f90"
+    # The module is found through the index without searching.
+    mod_man._remaining_search_paths.clear()
+    assert mod_man.get_module_info("b_mod").filename == "d1/d3/b_mod.F90"
+
+
+@pytest.mark.usefixtures("change_into_tmpdir", "clear_module_manager_instance",
+                         "mod_man_test_setup_directories")
+def test_mod_manager_get_files_by_name(monkeypatch):
+    '''Tests that get_files_by_name finds files case-insensitively and
+    only walks each directory tree once.'''
+    mod_man = ModuleManager.get()
+    walked = []
+    walk = os.walk
+
+    def counting_walk(directory):
+        walked.append(directory)
+        return walk(directory)
+
+    monkeypatch.setattr(os, "walk", counting_walk)
+    # A recursive search path is walked when it is added.
+    mod_man.add_search_path("d1")
+    assert walked == ["d1"]
+    assert (mod_man.get_files_by_name("B_MOD.f90", "d1") ==
+            [os.path.abspath(os.path.join("d1", "d3", "b_mod.F90"))])
+    assert (mod_man.get_files_by_name("a_mod.f90", os.path.abspath("d1")) ==
+            [os.path.abspath(os.path.join("d1", "a_mod.f90"))])
+    assert walked == ["d1"]
+
+    # Other directories are walked the first time they are searched.
+    assert (mod_man.get_files_by_name("e_mod.f90", "d2") ==
+            [os.path.abspath(os.path.join("d2", "d4", "e_mod.F90"))])
+    assert mod_man.get_files_by_name("missing.f90", "d2") == []
+    assert walked == ["d1", os.path.abspath("d2")]
+
+
+@pytest.mark.usefixtures("change_into_tmpdir", "clear_module_manager_instance",
+                         "mod_man_test_setup_directories")
+def test_mod_manager_parallel_processing(capsys):
+    '''Tests that the bulk methods of the ModuleManager create the same
+    results if several processes are used.
+
+    '''
+    files = ["d1/a_mod.f90", "d1/d3/b_mod.F90", "d1/d3/c_mod.x90",
+             "d2/d_mod.X90", "d2/d4/e_mod.F90"]
+    mod_man = ModuleManager.get()
+    mod_man.add_files(files)
+    mod_man.create_all_psyir_nodes()
+    expected = [FortranWriter()(file_info.get_psyir())
+                for file_info in mod_man.all_file_infos]
+
+    ModuleManager._instance = None
+    mod_man = ModuleManager.get()
+    mod_man.num_processes = 3
+    mod_man.add_files(files)
+    mod_man.load_all_source_files()
+    for file_info in mod_man.all_file_infos:
+        assert file_info.source_code_loaded
+        assert not file_info.fparser_tree_created
+
+    mod_man.create_all_fparser_trees(verbose=True)
+    assert "- Processing 5 files using 3 processes" in capsys.readouterr().out
+    for file_info in mod_man.all_file_infos:
+        assert file_info.fparser_tree_created
+        assert not file_info.psyir_created
+
+    mod_man.create_all_psyir_nodes()
+    assert [FortranWriter()(file_info.get_psyir())
+            for file_info in mod_man.all_file_infos] == expected
+
+    # Errors are raised in the same way as in serial mode
+    with open("d2/g_mod.f90", "w", encoding="utf-8") as fout:
+        fout.write("module g_mod\n  garbage\nend module g_mod\n")
+    mod_man.add_files(["d2/g_mod.f90", "d2/missing.f90"])
+    with pytest.raises(FileInfoFParserError) as err:
+        mod_man.create_all_fparser_trees()
+    assert "Failed to create fparser tree" in str(err.value)
+
+
+@pytest.mark.usefixtures("change_into_tmpdir", "clear_module_manager_instance",
+                         "mod_man_test_setup_directories")
+def test_mod_manager_parallel_dependencies():
+    '''Tests that get_all_dependencies_recursively returns the same result
+    if several processes are used.
+
+    '''
+    mod_man = ModuleManager.get()
+    mod_man.add_search_path("d1")
+    mod_man.add_search_path("d2")
+    expected = mod_man.get_all_dependencies_recursively(["d_mod", "e_mod"])
+
+    ModuleManager._instance = None
+    mod_man = ModuleManager.get()
+    mod_man.num_processes = 2
+    mod_man.add_search_path("d1")
+    mod_man.add_search_path("d2")
+    mod_man.add_ignore_module("b_mod")
+    # Ignored modules are still listed as dependencies
+    del expected["b_mod"]
+    assert mod_man.get_all_dependencies_recursively(
+        ["d_mod", "e_mod"]) == expected
+    for mod_name in expected:
+        assert mod_man.get_module_info(
+            mod_name).file_info.fparser_tree_created
+
+
+@pytest.mark.usefixtures("change_into_tmpdir", "clear_module_manager_instance")
+def test_mod_manager_parallel_dependencies_one_pool(monkeypatch):
+    '''Tests that get_all_dependencies_recursively only creates one pool of
+    worker processes, even if new modules are discovered at several levels
+    of the dependency graph, and that it is not created if there is only
+    one file to parse.
+
+    '''
+    # Each module at one level uses two modules at the next level.
+    names = [f"m{idx}_mod" for idx in range(15)]
+    os.mkdir("src")
+    for idx, name in enumerate(names):
+        uses = "".join(f"use {names[child]}\n"
+                       for child in [2*idx+1, 2*idx+2] if child < 15)
+        with open(os.path.join("src", name + ".f90"), "w",
+                  encoding="utf-8") as fout:
+            fout.write(f"module {name}\n{uses}end module {name}\n")
+    mod_man = ModuleManager.get()
+    mod_man.add_search_path("src")
+    expected = mod_man.get_all_dependencies_recursively(["m0_mod"])
+    assert len(expected) == 15
+
+    pools = []
+
+    class CountingPool(ProcessPoolExecutor):
+        '''A pool of worker processes that records its creation.'''
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(module_manager, "ProcessPoolExecutor", CountingPool)
+    ModuleManager._instance = None
+    mod_man = ModuleManager.get()
+    mod_man.num_processes = 2
+    mod_man.add_search_path("src")
+    result = mod_man.get_all_dependencies_recursively(["m0_mod"])
+    assert result == expected
+    assert len(pools) == 1
+    for name in names:
+        assert mod_man.get_module_info(name).file_info.fparser_tree_created
+
+    # A single module without dependencies does not need a pool.
+    ModuleManager._instance = None
+    mod_man = ModuleManager.get()
+    mod_man.num_processes = 2
+    mod_man.add_search_path("src")
+    assert mod_man.get_all_dependencies_recursively(["m14_mod"]) == \
+        {"m14_mod": []}
+    assert len(pools) == 1
+
+
+def test_mod_manager_init_worker(monkeypatch, tmpdir):
+    '''Tests that a worker process loads the config file of the main process
+    if it does not inherit the configuration.
+
+    '''
+    config_file = Config.get().filename
+    # A forked process inherits the configuration
+    monkeypatch.setattr(Config, "_instance", None)
+    _init_worker(config_file, [str(tmpdir)])
+    assert Config._instance is None
+    # Otherwise the config file is loaded
+    monkeypatch.setattr(Config, "_HAS_CONFIG_BEEN_INITIALISED", False)
+    _init_worker(config_file, [str(tmpdir)])
+    assert Config.get().filename == config_file
+    assert Config.get().include_paths == [str(tmpdir)]
+
+
+def test_mod_manager_process_file_error(tmpdir):
+    '''Tests that errors in a worker process are not raised.'''
+    assert _process_file(str(tmpdir.join("missing.f90")), False, None, None,
+                         True) is None
+
+
 @pytest.mark.usefixtures("change_into_tmpdir", "clear_module_manager_instance",
                          "mod_man_test_setup_directories")
 def test_mod_manager_load_all_module_infos_trigger_error_module_read_twice():
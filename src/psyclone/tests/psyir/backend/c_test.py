@@ -42,10 +42,10 @@ import pytest
 from psyclone.psyir.backend.c import CWriter
 from psyclone.psyir.backend.visitor import VisitorError
 from psyclone.psyir.nodes import (
-    ArrayReference, Assignment, BinaryOperation, CodeBlock, IfBlock, Literal,
-    Node, Reference, Return, Schedule, UnaryOperation, Loop,
-    OMPTaskloopDirective, OMPMasterDirective, OMPParallelDirective,
-    IntrinsicCall)
+    ArrayReference, Assignment, BinaryOperation, CodeBlock, FileContainer,
+    IfBlock, Literal, Node, Reference, Return, Routine, Schedule,
+    UnaryOperation, Loop, OMPTaskloopDirective, OMPMasterDirective,
+    OMPParallelDirective, IntrinsicCall)
 from psyclone.psyir.symbols import (
     ArgumentInterface, ArrayType, BOOLEAN_TYPE, CHARACTER_TYPE, DataSymbol,
     INTEGER_TYPE, REAL_TYPE, IntrinsicSymbol)
@@ -589,3 +589,23 @@ def test_cw_directive_with_clause(fortran_reader):
   }
 }
 ''' in cwriter(schedule.children[0])
+
+
+def test_cw_filecontainer():
+    '''Check that the CWriter writes the children of a FileContainer one
+    after the other, either in one go or one chunk per child.
+
+    '''
+    class MyCWriter(CWriter):
+        '''CWriter that writes Routines as a comment.'''
+        def routine_node(self, node):
+            ''':returns: a comment with the name of the routine.'''
+            return f"// {node.name}\n"
+
+    cwriter = MyCWriter()
+    file_container = FileContainer("test")
+    file_container.addchild(Routine.create("a"))
+    file_container.addchild(Routine.create("b"))
+    chunks = list(cwriter.stream(file_container))
+    assert chunks == ["// a\n", "// b\n"]
+    assert cwriter(file_container) == "".join(chunks)
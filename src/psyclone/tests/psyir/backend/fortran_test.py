@@ -2088,3 +2088,72 @@ def test_fw_schedule(fortran_reader, fortran_writer):
         schedule.addchild(child.copy().detach())
     result = fortran_writer(schedule)
     assert result == test_code
+
+
+def test_fw_needs_copy(fortran_reader, fortran_writer):
+    '''Test that the FortranWriter only copies the tree if the visited
+    sub-tree contains a Routine (since routine_node modifies the symbol
+    table of the Routine) or something that needs to be lowered.
+
+    '''
+    psyir = fortran_reader.psyir_from_source(
+        "subroutine foo()\n"
+        "  real :: a, b\n"
+        "  a = b\n"
+        "  b = a\n"
+        "end subroutine foo\n")
+    routine = psyir.children[0]
+    assert fortran_writer._needs_copy(psyir)
+    assert fortran_writer._needs_copy(routine)
+    assert not fortran_writer._needs_copy(routine.children[0])
+    # An OpenMP parallel directive is lowered
+    directive = OMPParallelDirective.create(
+        children=[routine.children[1].detach()])
+    routine.addchild(directive)
+    assert fortran_writer._needs_copy(directive)
+
+    # Writing the Routine does not modify its symbol table
+    table = routine.symbol_table
+    assert "subroutine foo" in fortran_writer(routine)
+    assert routine.symbol_table is table
+
+
+def test_fw_stream(fortran_reader, fortran_writer):
+    '''Test that the FortranWriter streams a file one module header, routine
+    and module end at a time, and that the chunks join up to the same code
+    as writing the file in one go.
+
+    '''
+    code = (
+        "module my_mod\n"
+        "  integer :: a\n"
+        "  contains\n"
+        "  subroutine foo()\n"
+        "    a = 1\n"
+        "  end subroutine foo\n"
+        "  subroutine bar()\n"
+        "    a = 2\n"
+        "  end subroutine bar\n"
+        "end module my_mod\n"
+        "program test\n"
+        "  use my_mod\n"
+        "  call foo()\n"
+        "end program test\n")
+    psyir = fortran_reader.psyir_from_source(code)
+    chunks = list(fortran_writer.stream(psyir))
+    assert len(chunks) == 5
+    assert chunks[0].startswith("module my_mod\n")
+    assert chunks[0].endswith("contains\n")
+    assert chunks[1].startswith("  subroutine foo()\n")
+    assert chunks[2].startswith("  subroutine bar()\n")
+    assert chunks[3] == "\nend module my_mod\n"
+    assert chunks[4].startswith("program test\n")
+    assert "".join(chunks) == fortran_writer(psyir)
+    # The indentation has been restored
+    assert fortran_writer._depth == 0
+
+    # Errors are raised when the affected chunk is generated
+    psyir.children[0].name = ""
+    with pytest.raises(VisitorError) as err:
+        list(fortran_writer.stream(psyir))
+    assert "Expected Container node name to have a value." in str(err.value)
@@ -44,6 +44,7 @@ from sympy import Function, Symbol
 from sympy.parsing.sympy_parser import parse_expr
 
 from psyclone.psyir.frontend.sympy_reader import SymPyReader
+from psyclone.psyir.backend import sympy_writer as sympy_writer_module
 from psyclone.psyir.backend.sympy_writer import SymPyWriter
 from psyclone.psyir.backend.visitor import VisitorError
 from psyclone.psyir.nodes import Assignment, Literal, Node
@@ -609,3 +610,69 @@ def test_sym_writer_identical_variables_errors():
         sympy_writer(Node(), identical_variables={"var": 1})
     assert ("Dictionary identical_variables contains a non-string key or "
             "value" in str(err.value))
+
+
+@pytest.mark.parametrize("expression", ["i + 1", "2 * i - j / 3",
+                                        "-i ** 2 + (j - k) * 1.5e3",
+                                        "i - (j - k)", "+i - 2_8",
+                                        "a(i + 1, j) - a(i, j)",
+                                        "a(i:j, :) + b", "b(2:)",
+                                        "MAX(i, j) - MIN(i, 3)",
+                                        "MOD(i, 2) + FLOOR(x) + EXP(x)",
+                                        "t%c(i)%d - t%e + lambda",
+                                        "sympy_lower + sympy_upper(i)"])
+def test_sym_writer_direct_conversion(fortran_reader, monkeypatch,
+                                      expression):
+    '''Test that expressions are converted into SymPy without using the
+    SymPy parser, and that the result is the same as when using the parser.
+
+    '''
+    source = f'''program test_prog
+                use my_mod
+                integer :: i, j, k, lambda, sympy_upper(10)
+                real :: a(10, 10), b(10, 10), x
+                type(my_type) :: t
+                x = {expression}
+                end program test_prog '''
+    psyir = fortran_reader.psyir_from_source(source)
+    expr = psyir.walk(Assignment)[0].rhs
+
+    monkeypatch.setattr(SymPyWriter, "_DIRECT_CONVERSION", False)
+    parsed_writer = SymPyWriter()
+    parsed = parsed_writer(expr)
+    monkeypatch.undo()
+
+    monkeypatch.setattr(sympy_writer_module, "parse_expr",
+                        lambda *_: pytest.fail("parser used"))
+    writer = SymPyWriter()
+    assert writer(expr) == parsed
+    assert writer.type_map == parsed_writer.type_map
+    assert writer.lower_bound == parsed_writer.lower_bound
+
+
+def test_sym_writer_direct_conversion_fallback(fortran_reader):
+    '''Test that the SymPy parser is used for expressions that contain
+    nodes that cannot be converted directly.
+
+    '''
+    source = '''program test_prog
+                real :: x
+                logical :: y
+                integer :: i
+                x = SQRT(x) + i
+                y = .true.
+                end program test_prog '''
+    psyir = fortran_reader.psyir_from_source(source)
+    exprs = [assign.rhs for assign in psyir.walk(Assignment)]
+    writer = SymPyWriter()
+    for expr in exprs:
+        with pytest.raises(NotImplementedError):
+            writer._to_sympy(expr)
+    result = writer(exprs)
+    assert result[0] == parse_expr("SQRT(x) + i", writer.type_map)
+    assert result[1] is True
+
+    # The parser reports errors as before
+    with pytest.raises(TypeError) as err:
+        writer(Literal("abc", CHARACTER_TYPE))
+    assert "SymPy cannot handle strings like 'abc'." in str(err.value)
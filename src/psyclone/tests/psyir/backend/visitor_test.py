@@ -259,6 +259,44 @@ def test_psyirvisitor_lower_dsl_concepts():
         "ancestors are Container or Schedule nodes.'." in str(excinfo.value))
 
 
+def test_psyirvisitor_no_copy_language_level(monkeypatch):
+    '''Test that the tree is not copied if nothing in the visited sub-tree
+    needs to be lowered, and that it is copied otherwise.
+
+    '''
+    class MyDSLNode(Return):
+        '''DSL concept that lowers to itself.'''
+        def lower_to_language_level(self):
+            ''':returns: this node.'''
+            return self
+
+    class MyVisitor(PSyIRVisitor):
+        '''Visitor that returns the visited node.'''
+        def node_node(self, node):
+            ''':returns: the visited node.'''
+            return node
+
+    schedule = Schedule()
+    return_node = Return()
+    dsl_node = MyDSLNode()
+    schedule.addchild(return_node)
+    schedule.addchild(dsl_node)
+    visitor = MyVisitor()
+    assert not visitor._needs_copy(return_node)
+    assert visitor._needs_copy(dsl_node)
+    assert visitor._needs_copy(schedule)
+
+    # The language-level node itself is visited
+    monkeypatch.setattr(Node, "copy", lambda _: pytest.fail("copied"))
+    assert visitor(return_node) is return_node
+    monkeypatch.undo()
+
+    # Otherwise a copy of the node is visited
+    result = visitor(dsl_node)
+    assert isinstance(result, MyDSLNode)
+    assert result is not dsl_node
+
+
 def test_psyirvisitor_visit_no_method1():
     '''Check that an exception is raised if the method for the Node class
     does not exist.
@@ -323,6 +361,85 @@ def test_psyirvisitor_visit_all_parents():
         "" in str(excinfo.value))
 
 
+def test_psyirvisitor_handler_cache():
+    '''Check that the method handling a class of nodes is only looked up
+    once per visitor class, and that each visitor class uses its own
+    methods.
+
+    '''
+    class Unsupported(Node):
+        '''Subclass of Node without a handler of its own.'''
+
+    class MyVisitor(PSyIRVisitor):
+        '''Visitor that handles all nodes.'''
+        def node_node(self, _):
+            ''':returns: a fixed string.'''
+            return "node"
+
+    class MyUnsupportedVisitor(MyVisitor):
+        '''Visitor with a handler for the Unsupported class.'''
+        def unsupported_node(self, _):
+            ''':returns: a fixed string.'''
+            return "unsupported"
+
+    assert MyVisitor()(Unsupported()) == "node"
+    assert (PSyIRVisitor._HANDLER_CACHE[(MyVisitor, Unsupported)] ==
+            "node_node")
+    assert MyUnsupportedVisitor()(Unsupported()) == "unsupported"
+    assert MyUnsupportedVisitor()(Node()) == "node"
+    assert (PSyIRVisitor._HANDLER_CACHE[(MyUnsupportedVisitor, Node)] ==
+            "node_node")
+
+    # A missing handler is cached as well
+    with pytest.raises(VisitorError):
+        PSyIRVisitor()(Unsupported())
+    assert PSyIRVisitor._HANDLER_CACHE[(PSyIRVisitor, Unsupported)] is None
+
+
+def test_psyirvisitor_stream():
+    '''Check that the stream method yields the text of a node in the
+    chunks provided by a '<name>_chunks' method (if there is one) and that
+    nodes with comments are always visited as a whole.
+
+    '''
+    class MyVisitor(PSyIRVisitor):
+        '''Visitor that writes Containers in chunks.'''
+        def container_node(self, node):
+            ''':returns: the joined chunks.'''
+            return "".join(self.container_chunks(node))
+
+        def container_chunks(self, node):
+            ''':returns: a header chunk and a chunk per child.'''
+            yield f"start {node.name}\n"
+            for child in node.children:
+                yield from self._visit_chunks(child)
+
+        def routine_node(self, node):
+            ''':returns: the name of the routine.'''
+            return f"{node.name}\n"
+
+    container = Container("my_mod")
+    container.addchild(Routine.create("a"))
+    container.addchild(Routine.create("b"))
+    visitor = MyVisitor()
+    assert list(visitor.stream(container)) == ["start my_mod\n", "a\n",
+                                               "b\n"]
+    assert "".join(visitor.stream(container)) == visitor(container)
+    # A node without a '<name>_chunks' method is a single chunk
+    assert list(visitor.stream(container.children[0])) == ["a\n"]
+
+    # A node with a comment is visited as a whole
+    container.preceding_comment = "my comment"
+    visitor._COMMENT_PREFIX = "# "
+    assert list(visitor.stream(container)) == [
+        "# my comment\nstart my_mod\na\nb\n"]
+
+    with pytest.raises(TypeError) as excinfo:
+        list(visitor.stream("hello"))
+    assert ("The PSyIR visitor functor method only accepts a PSyIR Node as "
+            "argument, but found 'str'." in str(excinfo.value))
+
+
 def test_psyirvisitor_visit_skip_nodes():
     '''Check that when the skip_nodes variable is set to true then child
     nodes are called irrespective of whether a parent node has a
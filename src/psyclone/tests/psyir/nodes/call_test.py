@@ -37,6 +37,7 @@
 ''' Performs py.test tests on the Call PSyIR node. '''
 
 import os
+import pickle
 import pytest
 from psyclone.configuration import Config
 from psyclone.core import Signature, VariablesAccessInfo
@@ -655,6 +656,18 @@ def test_copy():
     assert call._argument_names != call2._argument_names
 
 
+def test_call_pickle():
+    ''' Test that a Call (with named arguments) can be pickled. '''
+    op1 = Literal("1", INTEGER_TYPE)
+    op2 = Literal("2", INTEGER_TYPE)
+    call = Call.create(RoutineSymbol("name"), [op1, ("name2", op2)])
+    call2 = pickle.loads(pickle.dumps(call))
+    assert call2 == call
+    assert call2.argument_names == [None, "name2"]
+    assert call2._argument_names[1] == (id(call2.arguments[1]), "name2")
+    assert call2.arguments[1].parent is call2
+
+
 def test_call_get_callees_local(fortran_reader):
     '''
     Check that get_callees() works as expected when the target of the Call
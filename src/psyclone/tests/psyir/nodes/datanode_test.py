@@ -40,9 +40,11 @@
 '''
 import pytest
 
-from psyclone.psyir.nodes import DataNode, Reference, BinaryOperation
+from psyclone.psyir.nodes import (Assignment, BinaryOperation, DataNode,
+                                  IntrinsicCall, Literal, Node, Reference)
 from psyclone.psyir.symbols import (CHARACTER_TYPE, DataSymbol, UnresolvedType,
-                                    INTEGER_SINGLE_TYPE, REAL_TYPE)
+                                    INTEGER_SINGLE_TYPE, INTEGER_TYPE,
+                                    REAL_TYPE)
 
 
 def test_datanode_datatype():
@@ -79,3 +81,99 @@ def test_datanode_is_character():
     reference = Reference(DataSymbol("unknown", UnresolvedType()))
     assert not reference.is_character(unknown_as=False)
     assert reference.is_character(unknown_as=True)
+
+
+def test_datanode_structural_hash(fortran_reader):
+    '''Test that the structural hash is consistent with equality and that
+    expressions can be used as dictionary keys.
+
+    '''
+    code = '''subroutine test()
+    use some_mod
+    integer :: i, j
+    real, dimension(10) :: a
+    a(i) = a(i+1) + b%c(j)
+    a(j) = a(i+1) + b%c(i)
+    a(i) = a(1+i) + b%d(j)
+    a(i) = sqrt(a(i+1)) + 2
+    end subroutine test'''
+    psyir = fortran_reader.psyir_from_source(code)
+    assigns = psyir.walk(Assignment)
+    # Equal expressions in different statements have the same hash
+    assert assigns[0].lhs == assigns[2].lhs
+    assert hash(assigns[0].lhs) == hash(assigns[2].lhs)
+    assert assigns[0].lhs.structural_hash == assigns[2].lhs.structural_hash
+    assert assigns[0].rhs.children[0] == assigns[1].rhs.children[0]
+    assert hash(assigns[0].rhs.children[0]) == \
+        hash(assigns[1].rhs.children[0])
+    # Different expressions (references, operators, literals, members)
+    assert assigns[0].lhs != assigns[1].lhs
+    assert assigns[0].rhs != assigns[1].rhs
+    assert assigns[0].rhs != assigns[2].rhs
+    assert assigns[0].rhs.children[0] != assigns[2].rhs.children[0]
+    assert assigns[0].rhs.children[1] != assigns[2].rhs.children[1]
+    assert hash(assigns[0].rhs) != hash(assigns[1].rhs)
+    assert hash(assigns[0].rhs.children[1]) != \
+        hash(assigns[2].rhs.children[1])
+    # Copies are equal
+    copy = assigns[0].rhs.copy()
+    assert copy == assigns[0].rhs
+    assert hash(copy) == hash(assigns[0].rhs)
+    # Sub-classes of DataNode that define __eq__ remain hashable
+    sqrt = assigns[3].rhs.children[0]
+    assert isinstance(sqrt, IntrinsicCall)
+    assert hash(sqrt) == hash(sqrt.copy())
+    assert (hash(assigns[3].rhs.children[1]) ==
+            hash(Literal("2", INTEGER_TYPE)))
+
+    # Group all identical expressions:
+    groups = {}
+    for node in psyir.walk(DataNode):
+        groups.setdefault(node, []).append(node)
+    assert len(groups[assigns[0].lhs]) == 3
+    assert len(groups[assigns[0].rhs.children[0]]) == 3
+    i_symbol = psyir.children[0].symbol_table.lookup("i")
+    assert len(groups[Reference(i_symbol)]) == 8
+
+
+def test_datanode_structural_hash_invalidation(fortran_reader):
+    '''Test that the cached structural hash is discarded when an
+    expression changes.
+
+    '''
+    code = '''subroutine test()
+    integer :: i, j, k
+    real, dimension(10) :: a
+    a(i+1) = a(i+2)
+    end subroutine test'''
+    psyir = fortran_reader.psyir_from_source(code)
+    routine = psyir.children[0]
+    assign = routine.children[0]
+    lhs, rhs = assign.lhs, assign.rhs
+    old_hash = hash(lhs)
+    assert lhs._structural_hash is not None
+    assert lhs != rhs
+
+    # Modifying the tree
+    lhs.indices[0].children[1].replace_with(Literal("2", INTEGER_TYPE))
+    assert lhs._structural_hash is None
+    assert hash(lhs) != old_hash
+    assert lhs == rhs
+    assert hash(lhs) == hash(rhs)
+
+    # Changing the symbol of a reference
+    old_hash = hash(lhs)
+    i_ref = lhs.indices[0].children[0]
+    i_ref.symbol = routine.symbol_table.lookup("j")
+    assert lhs._structural_hash is None
+    assert hash(lhs) != old_hash
+    assert lhs != rhs
+
+    # Renaming a symbol invalidates all hashes
+    old_hash = hash(lhs)
+    old_generation = Node._cache_generation
+    routine.symbol_table.rename_symbol(routine.symbol_table.lookup("j"),
+                                       "new_j")
+    assert Node._cache_generation == old_generation + 1
+    assert hash(lhs) != old_hash
+    assert hash(lhs) == hash(lhs.copy())
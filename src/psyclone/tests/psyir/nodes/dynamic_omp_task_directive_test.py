@@ -42,7 +42,8 @@ from psyclone.errors import GenerationError, InternalError
 from psyclone.parse.algorithm import parse
 from psyclone.psyGen import PSyFactory
 from psyclone.psyir.nodes import Assignment, BinaryOperation, \
-        DynamicOMPTaskDirective, Literal, Loop, Reference
+        DynamicOMPTaskDirective, Literal, Loop, OMPParallelDirective, \
+        OMPSingleDirective, Reference
 from psyclone.psyir.symbols import DataSymbol, INTEGER_TYPE
 from psyclone.tests.utilities import Compile
 from psyclone.transformations import OMPSingleTrans, \
@@ -3409,6 +3410,112 @@ def test_find_parent_loop_vars_fail():
             "(Dynamic)OMPTaskDirective" in str(excinfo.value))
 
 
+def test_lowering_shares_task_context(fortran_reader, fortran_writer,
+                                      monkeypatch):
+    '''Tests that the data-sharing attributes of the parallel region are
+    only inferred once for all the tasks of a serial region, and that the
+    time taken to compute the clauses of the tasks is recorded.'''
+    code = '''
+    subroutine my_subroutine()
+        integer, dimension(10) :: a, b, c
+        integer :: i
+        do i = 1, 10
+            a(i) = 1
+        end do
+        do i = 1, 10
+            b(i) = a(i)
+        end do
+        do i = 1, 10
+            c(i) = b(i)
+        end do
+    end subroutine
+    '''
+    tree = fortran_reader.psyir_from_source(code)
+    routine = tree.children[0]
+    for loop in routine.children[:]:
+        tdir = DynamicOMPTaskDirective()
+        loop.replace_with(tdir)
+        tdir.children[0].addchild(loop)
+    OMPSingleTrans().apply(routine.children)
+    OMPParallelTrans().apply(routine.children)
+    single = routine.walk(OMPSingleDirective)[0]
+    assert single.task_context is None
+
+    calls = []
+    infer = OMPParallelDirective.infer_sharing_attributes
+
+    def counting_infer(self):
+        calls.append(self)
+        return infer(self)
+
+    monkeypatch.setattr(OMPParallelDirective, "infer_sharing_attributes",
+                        counting_infer)
+    DynamicOMPTaskDirective.reset_clause_timing()
+    assert DynamicOMPTaskDirective.clause_timing() == {"tasks": 0,
+                                                       "seconds": 0.0}
+    output = fortran_writer(tree)
+    assert output.count("!$omp task private(i)") == 3
+    # Once for all the tasks and once for the parallel directive itself.
+    assert len(calls) == 2
+    # The context is only available while the serial region is lowered.
+    assert single.task_context is None
+    timing = DynamicOMPTaskDirective.clause_timing()
+    assert timing["tasks"] == 3
+    assert timing["seconds"] > 0.0
+    DynamicOMPTaskDirective.reset_clause_timing()
+    assert DynamicOMPTaskDirective.clause_timing()["tasks"] == 0
+
+
+def test_task_context_parent_loops(fortran_reader):
+    '''Tests that the parent loops of the tasks of a serial region, and
+    their steps, are only found once and then taken from the task context
+    of the region.'''
+    code = '''
+    subroutine my_subroutine()
+        integer, dimension(10, 10) :: a, b, c
+        integer :: i, j
+        do j = 1, 10, 4
+            do i = 1, 10
+                b(i, j) = a(i, j + 1)
+            end do
+            do i = 1, 10
+                c(i, j) = b(i, j + 1)
+            end do
+        end do
+    end subroutine
+    '''
+    tree = fortran_reader.psyir_from_source(code)
+    routine = tree.children[0]
+    outer = routine.children[0]
+    for loop in outer.loop_body.children[:]:
+        tdir = DynamicOMPTaskDirective()
+        loop.replace_with(tdir)
+        tdir.children[0].addchild(loop)
+    OMPSingleTrans().apply(routine.children)
+    OMPParallelTrans().apply(routine.children)
+    single = routine.walk(OMPSingleDirective)[0]
+    tasks = routine.walk(DynamicOMPTaskDirective)
+
+    single._task_context = {}
+    for task in tasks:
+        task._compute_clauses()
+    context = single._task_context
+    loop_vars, loops, parallel, steps = context[("parent_loops",
+                                                 id(outer))]
+    assert loop_vars == [outer.variable]
+    assert loops == [outer]
+    assert parallel is routine.walk(OMPParallelDirective)[0]
+    assert steps == {id(outer): 4}
+    for task in tasks:
+        assert task._parent_loop_steps is steps
+
+    # Recomputing the clauses does not duplicate the parent loops.
+    tasks[0]._compute_clauses()
+    assert tasks[0]._parent_loop_vars == [outer.variable]
+    assert tasks[0]._parent_loops == [outer]
+    single._task_context = None
+
+
 def test_evaluate_readonly_ref_failcase(fortran_reader):
     '''Tests that the _evaluate_readonly_reference function fails
     when it is passed an ArrayOfStructureReference with an ArrayMember
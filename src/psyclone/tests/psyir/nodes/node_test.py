@@ -40,11 +40,13 @@
 
 import sys
 import os
+import pickle
 import re
 import pytest
 import graphviz
 
 from psyclone.domain.lfric.transformations import LFRicLoopFuseTrans
+from psyclone.core import VariablesAccessInfo
 from psyclone.errors import InternalError, GenerationError
 from psyclone.parse.algorithm import parse
 from psyclone.psyGen import PSyFactory, Kern
@@ -1087,6 +1089,22 @@ def test_children_sort():
     assert "Sorting the Children of a Node is not supported" in str(err.value)
 
 
+def test_children_pickle():
+    '''Check that a ChildrenList is restored without re-validating or
+    re-linking its items when a tree is unpickled.'''
+    testnode = Schedule()
+    testnode.addchild(Statement())
+    testnode.addchild(Statement())
+    newnode = pickle.loads(pickle.dumps(testnode))
+    assert isinstance(newnode.children, ChildrenList)
+    assert len(newnode.children) == 2
+    assert newnode.children._node_reference is newnode
+    assert all(child.parent is newnode for child in newnode.children)
+    # The validation is still in place
+    with pytest.raises(GenerationError):
+        newnode.children.append(Schedule())
+
+
 def test_children_trigger_update():
     '''Test that various modifications of ChildrenList all trigger a tree
     update. We do this by implementing a sub-class of Schedule that has a
@@ -1700,6 +1718,202 @@ def test_walk_depth(fortran_reader):
     assert len(psyir.walk(Loop, depth=depth)) == 0
 
 
+def test_walk_index(fortran_reader, monkeypatch):
+    '''Test that, when enabled, the walk index returns the cached results
+    for unmodified subtrees and is invalidated when the tree changes.'''
+    code = '''subroutine test_index()
+    integer :: i, j
+    integer :: arr(2,2)
+    do i = 1, 2
+      do j = 1, 2
+        arr(i,j) = 0
+      end do
+    end do
+    end subroutine'''
+    psyir = fortran_reader.psyir_from_source(code)
+    routine = psyir.children[0]
+    assert not routine.walk_index_enabled
+    routine.walk(Loop)
+    assert routine._walk_index is None
+
+    with pytest.raises(TypeError) as err:
+        psyir.enable_walk_index("yes")
+    assert ("The 'enable' argument of enable_walk_index() must be a bool but "
+            "got 'str'." in str(err.value))
+    psyir.enable_walk_index()
+    assert routine.walk_index_enabled
+    loops = routine.walk(Loop)
+    assert len(loops) == 2
+    # The result is a copy so modifying it does not affect the index.
+    routine.walk(Loop).pop()
+    assert routine.walk(Loop) == loops
+    assert len(routine.walk(Loop, stop_type=Loop)) == 1
+
+    # Subsequent walks are served from the index without a traversal.
+    calls = []
+
+    def fake_walk(node, my_type, stop_type=None, depth=None):
+        calls.append(node)
+        return []
+    monkeypatch.setattr(Node, "walk_iter", fake_walk)
+    assert routine.walk(Loop) == loops
+    assert not calls
+    # Other subtrees are traversed the first time they are walked.
+    assert routine.children[0].walk(Loop) == []
+    assert calls == [routine.children[0]]
+    # Walks with a depth are never cached.
+    assert routine.walk(Loop, depth=3) == []
+    assert calls[-1] is routine
+    monkeypatch.undo()
+
+    # Modifying the tree invalidates the index of all ancestors but not of
+    # the unmodified subtrees.
+    inner = loops[1]
+    inner.walk(Assignment)
+    new_loop = inner.copy()
+    assert new_loop._walk_index is None
+    inner.loop_body.addchild(new_loop)
+    assert routine._walk_index is None
+    assert inner._walk_index is None
+    assert new_loop._walk_index is None
+    assert len(routine.walk(Loop)) == 3
+    assert len(routine.walk(Assignment)) == 2
+    new_loop.walk(Assignment)
+    assert new_loop._walk_index is not None
+    new_loop.detach()
+    assert new_loop._walk_index is not None
+    assert len(routine.walk(Loop)) == 2
+
+    # Disabling the index releases the cached results.
+    psyir.enable_walk_index(False)
+    assert not routine.walk_index_enabled
+    assert routine._walk_index is None
+    assert len(routine.walk(Loop)) == 2
+
+
+def test_access_cache(fortran_reader, monkeypatch):
+    '''Test that, when enabled, the access cache returns the same accesses
+    as a fresh analysis, reuses them for unmodified subtrees and is
+    invalidated when the tree changes.'''
+    code = '''subroutine test_cache()
+    integer :: i, j, k
+    integer :: arr(2,2), brr(2,2)
+    do i = 1, 2
+      do j = 1, 2
+        arr(i,j) = brr(j,i)
+      end do
+      brr(i,1) = 0
+    end do
+    end subroutine'''
+    psyir = fortran_reader.psyir_from_source(code)
+    routine = psyir.children[0]
+    outer, inner = routine.walk(Loop)
+    assignment = inner.loop_body.children[0]
+    assert not routine.access_cache_enabled
+    expected = str(VariablesAccessInfo(outer))
+    assert outer._access_cache is None
+
+    with pytest.raises(TypeError) as err:
+        psyir.enable_access_cache("yes")
+    assert ("The 'enable' argument of enable_access_cache() must be a bool "
+            "but got 'str'." in str(err.value))
+    psyir.enable_access_cache()
+    assert routine.access_cache_enabled
+    assert str(VariablesAccessInfo(outer)) == expected
+    # Every statement caches its accesses, but not the expressions or the
+    # scoping nodes (e.g. the loop bodies).
+    assert outer._access_cache is not None
+    assert assignment._access_cache is not None
+    assert assignment.lhs._access_cache is None
+    assert outer.loop_body._access_cache is None
+    # Accesses with different options are cached separately.
+    var_info = VariablesAccessInfo(outer, options={"USE-ORIGINAL-NAMES": True})
+    assert len(outer._access_cache[1]) == 2
+    assert str(var_info) == expected
+
+    # Subsequent analyses use the cached accesses.
+    calls = []
+
+    def fake_accesses(node, var_accesses):
+        calls.append(node)
+    monkeypatch.setattr(Loop, "reference_accesses", fake_accesses)
+    assert str(VariablesAccessInfo(outer)) == expected
+    assert not calls
+    monkeypatch.undo()
+
+    # Modifying the tree invalidates the cache of all ancestors but not of
+    # the unmodified subtrees.
+    assignment.rhs.replace_with(Literal("1", INTEGER_TYPE))
+    assert outer._access_cache is None
+    assert inner._access_cache is None
+    assert assignment._access_cache is None
+    assert outer.loop_body.children[1]._access_cache is not None
+    assert str(VariablesAccessInfo(outer)) == "arr: WRITE, brr: WRITE, " \
+        "i: READ+WRITE, j: READ+WRITE"
+    # As does changing the variable of a loop or the symbol of a
+    # reference.
+    inner.variable = routine.symbol_table.lookup("k")
+    assert outer._access_cache is None
+    assert "k: READ+WRITE" in str(VariablesAccessInfo(outer))
+    assignment.lhs.symbol = routine.symbol_table.lookup("brr")
+    assert outer._access_cache is None
+    assert "arr" not in str(VariablesAccessInfo(outer))
+    # Renaming a symbol invalidates all caches.
+    routine.symbol_table.rename_symbol(routine.symbol_table.lookup("brr"),
+                                       "crr")
+    assert "crr: WRITE" in str(VariablesAccessInfo(outer))
+    # A copy does not share the cache of the original.
+    assert outer.copy()._access_cache is None
+
+    # Disabling the cache releases the cached accesses.
+    psyir.enable_access_cache(False)
+    assert not routine.access_cache_enabled
+    assert outer._access_cache is None
+    assert "crr: WRITE" in str(VariablesAccessInfo(outer))
+    assert outer._access_cache is None
+
+
+def test_walk_iter(fortran_reader):
+    '''Test that the walk_iter generator produces the same nodes as walk
+    (in pre- or post-order) and can be stopped early.'''
+    code = '''subroutine test_iter()
+    integer :: i, j
+    integer :: arr(2,2)
+    do i = 1, 2
+      do j = 1, 2
+        arr(i,j) = i + j * 2
+      end do
+    end do
+    arr(1,1) = 1
+    end subroutine'''
+    psyir = fortran_reader.psyir_from_source(code)
+    routine = psyir.children[0]
+    for my_type in [Node, Loop, Reference, (Assignment, Literal)]:
+        for stop_type in [None, Loop, Assignment]:
+            walked = routine.walk(my_type, stop_type)
+            assert list(routine.walk_iter(my_type, stop_type)) == walked
+            for depth in range(routine.depth, routine.depth + 8):
+                assert (list(routine.walk_iter(my_type, stop_type, depth)) ==
+                        routine.walk(my_type, stop_type, depth))
+
+    # In post-order the children come before their parent.
+    loops = list(routine.walk_iter(Loop, postorder=True))
+    assert loops == list(reversed(routine.walk(Loop)))
+    nodes = list(routine.walk_iter(Node, postorder=True))
+    assert nodes[-1] is routine
+    assert nodes.index(routine.children[1]) > nodes.index(routine.children[0])
+    assert (list(routine.walk_iter(Node, stop_type=Loop, postorder=True)) ==
+            [routine.children[0], routine.children[1].lhs.children[0],
+             routine.children[1].lhs.children[1], routine.children[1].lhs,
+             routine.children[1].rhs, routine.children[1], routine])
+    assert (list(routine.walk_iter(Loop, depth=routine.depth + 1,
+                                   postorder=True)) == [routine.children[0]])
+
+    # The generator can be stopped before visiting the whole tree.
+    iterator = routine.walk_iter(Assignment)
+    assert next(iterator) is routine.walk(Assignment)[0]
+
+
 def test_get_sibling_lists(fortran_reader):
     '''Tests the get_sibling_lists functionality.'''
 
@@ -1906,6 +2120,63 @@ def test_following(fortran_reader):
                                              include_children=False)
 
 
+def test_following_preceding_iter(fortran_reader):
+    '''Tests that the generator versions of following and preceding produce
+    the same nodes, in the same order, as a search of the list of all the
+    nodes in the tree.'''
+    psyir = fortran_reader.psyir_from_source('''
+    module my_mod
+        contains
+        subroutine test
+            integer :: i, j, val
+            do j = 1, 10
+               do i = 1, 10
+                  if (i == 3) then
+                    val = 1
+                  end if
+               end do
+               val = 2
+            end do
+            val = 3
+        end subroutine
+        subroutine test2
+            integer :: val
+            val = 4
+        end subroutine test2
+    end module
+    ''')
+    all_nodes = psyir.walk(Node)
+    routines = psyir.walk(Routine)
+    for start in all_nodes:
+        for same_routine in [True, False]:
+            root = psyir
+            if same_routine:
+                root = start.ancestor(Routine) or psyir
+            scope_nodes = root.walk(Node)
+            position = [id(x) for x in scope_nodes].index(id(start))
+            before = scope_nodes[:position]
+            assert list(start.preceding_iter(
+                same_routine_scope=same_routine)) == before
+            assert list(start.preceding_iter(
+                reverse=True, same_routine_scope=same_routine)) == \
+                list(reversed(before))
+            after = scope_nodes[position + 1:]
+            assert list(start.following_iter(
+                same_routine_scope=same_routine)) == after
+            after = scope_nodes[position + len(start.walk(Node)):]
+            assert list(start.following_iter(
+                same_routine_scope=same_routine,
+                include_children=False)) == after
+
+    # The closest preceding node is produced first without having to
+    # traverse the rest of the tree.
+    assignment = routines[1].children[0]
+    assert next(assignment.preceding_iter(reverse=True)) is routines[1]
+    nodes = assignment.preceding_iter(reverse=True, same_routine_scope=False)
+    assert next(nodes) is routines[1]
+    assert next(nodes) is routines[0].walk(Node)[-1]
+
+
 def test_is_descendent_of(fortran_reader):
     '''Test the is_descendent_of function of the Node class'''
     code = """
@@ -4738,6 +4738,81 @@ def test_omp_serial_validate_task_dependencies_add_taskwait(fortran_reader):
     assert taskwaits[1].position == 4
 
 
+def test_omp_serial_validate_task_dependencies_candidates(
+        fortran_reader, monkeypatch):
+    '''
+    Test that the task dependency checker only checks the pairs of tasks
+    that write to a symbol that the other task reads or writes.
+    '''
+    code = '''subroutine my_subroutine(grid_max, grid_min)
+        integer, dimension(100, 100) :: A, B, C, D
+        integer :: i, j
+        integer, intent(in) :: grid_max, grid_min
+
+        do i = grid_min, grid_max
+            do j = grid_min, grid_max
+                a(i, j) = i*grid_max + j
+            end do
+        end do
+        do i = grid_min, grid_max
+            do j = grid_min, grid_max
+                b(i, j) = j*grid_max + i
+            end do
+        end do
+        do i = grid_min+1, grid_max-1
+            do j = grid_min, grid_max
+                c(i, j) = a(i,j) * 3
+            end do
+        end do
+        do i = grid_min+1, grid_max-1
+            do j = grid_min, grid_max
+                d(i, j) = b(i,j) + a(i,j)
+            end do
+        end do
+    end subroutine
+    '''
+    tree = fortran_reader.psyir_from_source(code)
+
+    loop_trans = ChunkLoopTrans()
+    task_trans = OMPTaskTrans()
+
+    schedule = tree.walk(Schedule)[0]
+    for child in schedule.children[:]:
+        if isinstance(child, Loop):
+            loop_trans.apply(child)
+            task_trans.apply(child, {"force": True})
+
+    single_trans = OMPSingleTrans()
+    parallel_trans = OMPParallelTrans()
+    single_trans.apply(schedule.children)
+    parallel_trans.apply(schedule.children)
+    for task in tree.walk(DynamicOMPTaskDirective):
+        task.lower_to_language_level()
+    tasks = tree.walk(OMPTaskDirective)
+    sing = tree.walk(OMPSingleDirective)[0]
+
+    checked = []
+    original_check = OMPSingleDirective._check_dependency_pairing_valid
+
+    def check(self, node1, node2, task1, task2):
+        checked.append((node1, node2, tasks.index(task1), tasks.index(task2)))
+        return original_check(self, node1, node2, task1, task2)
+    monkeypatch.setattr(OMPSingleDirective, "_check_dependency_pairing_valid",
+                        check)
+    sing._validate_task_dependencies()
+
+    # Only the pairs of tasks that write 'a' or 'b' and read it are
+    # checked, in the order of the task pairs.
+    assert [(task1, task2) for _, _, task1, task2 in checked] == \
+        [(0, 2), (0, 3), (1, 3)]
+    for node1, node2, _, _ in checked:
+        assert node1.symbol is node2.symbol
+    # The result is unchanged: a taskwait is needed before the third task.
+    taskwaits = tree.walk(OMPTaskwaitDirective)
+    assert len(taskwaits) == 1
+    assert taskwaits[0].position == 2
+
+
 def test_omp_serial_check_dependency_valid_pairing_edgecase():
     '''
     Tests the edge case where two Reference to the same symbol
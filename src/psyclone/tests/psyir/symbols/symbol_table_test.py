@@ -39,6 +39,7 @@
 
 ''' Perform py.test tests on the psyclone.psyir.symbols.symbol_table file '''
 
+import copy
 import re
 import os
 from collections import OrderedDict
@@ -243,6 +244,54 @@ def test_next_available_name_4():
             "'str'." in str(excinfo.value))
 
 
+def test_next_available_name_suffix_index():
+    '''Test that next_available_name remembers the suffixes that are known
+    to be in use for each root name, and that this is discarded when names
+    may have become free or the tables that are searched change.
+
+    '''
+    inner_table, outer_table = create_hierarchy()
+    for idx in range(1, 100):
+        sym = inner_table.new_symbol("tmp")
+        assert sym.name == ("tmp" if idx == 1 else f"tmp_{idx - 1}")
+    # The next search starts from the last suffix found.
+    assert inner_table._next_suffix["tmp"][1] == 98
+    assert inner_table.next_available_name("TMP") == "TMP_99"
+    # Adding a symbol in an ancestor table is taken into account.
+    outer_table.add(symbols.DataSymbol("tmp_99", symbols.INTEGER_TYPE))
+    assert inner_table.next_available_name("tmp") == "tmp_100"
+    # Removing (or renaming) a symbol means the lower suffixes are searched
+    # again.
+    inner_table.remove(inner_table.lookup("tmp_5"))
+    assert inner_table.next_available_name("tmp") == "tmp_5"
+    inner_table.rename_symbol(inner_table.lookup("tmp_7"), "other")
+    assert inner_table.next_available_name("tmp") == "tmp_5"
+    inner_table.new_symbol("tmp")
+    assert inner_table.next_available_name("tmp") == "tmp_7"
+    # Removing from an ancestor table also counts.
+    outer_table.remove(outer_table.lookup("tmp_99"))
+    inner_table.new_symbol("tmp")
+    assert inner_table.next_available_name("tmp") == "tmp_99"
+    # Names in the ancestor tables are ignored with shadowing but those
+    # in other_table are avoided.
+    outer_table.add(symbols.DataSymbol("new", symbols.INTEGER_TYPE))
+    outer_table.add(symbols.DataSymbol("new_1", symbols.INTEGER_TYPE))
+    assert inner_table.next_available_name("new") == "new_2"
+    assert inner_table.next_available_name("new", shadowing=True) == "new"
+    other_table = symbols.SymbolTable()
+    other_table.add(symbols.DataSymbol("new", symbols.INTEGER_TYPE))
+    assert inner_table.next_available_name(
+        "new", shadowing=True, other_table=other_table) == "new_1"
+    # Detaching the scope means the ancestor table is no longer searched.
+    inner_table.node.detach()
+    assert inner_table.next_available_name("new") == "new"
+    # The index is not kept when the table is copied.
+    inner_table.next_available_name("tmp")
+    assert inner_table._next_suffix
+    assert not inner_table.deep_copy()._next_suffix
+    assert not copy.copy(inner_table)._next_suffix
+
+
 def test_new_symbol_5():
     '''Check that next_available_name in the SymbolTable class behaves as
     expected with the shadowing flag being a) explicitly set to
@@ -2348,6 +2397,90 @@ def test_get_symbols():
     assert all_symbols[symbol2.name] is symbol2
 
 
+def test_get_symbols_cache(monkeypatch):
+    '''Check that the merged view of the symbols in scope is cached and that
+    the cache is invalidated when any of the tables in scope, or the scopes
+    themselves, change.
+
+    '''
+    inner_table, outer_table = create_hierarchy()
+    merged = inner_table._get_merged_symbols()
+    assert list(merged.keys()) == ["symbol1", "symbol2", "my_kernel"]
+    # The cached view is reused while nothing changes.
+    assert inner_table._get_merged_symbols() is merged
+    # get_symbols() returns a copy that the caller is free to modify.
+    all_symbols = inner_table.get_symbols()
+    assert all_symbols == merged
+    assert all_symbols is not merged
+    del all_symbols["symbol1"]
+    assert "symbol1" in inner_table.get_symbols()
+
+    # Adding, removing and renaming symbols in any of the tables in scope
+    # invalidates the cache.
+    symbol3 = symbols.DataSymbol("symbol3", symbols.INTEGER_TYPE)
+    outer_table.add(symbol3)
+    assert "symbol3" in inner_table.get_symbols()
+    inner_table.rename_symbol(inner_table.lookup("symbol1"), "new1")
+    assert "new1" in inner_table.get_symbols()
+    assert "symbol1" not in inner_table.get_symbols()
+    outer_table.remove(symbol3)
+    assert "symbol3" not in inner_table.get_symbols()
+    # Including when the underlying dictionary is modified directly.
+    outer_table._symbols.pop("symbol2")
+    assert "symbol2" not in inner_table.get_symbols()
+
+    # Detaching the scope from its parent also invalidates the cache.
+    outer_table.add(symbol3)
+    assert "symbol3" in inner_table.get_symbols()
+    schedule = inner_table.node
+    schedule.detach()
+    assert "symbol3" not in inner_table.get_symbols()
+    # As does replacing the symbol table of the scope.
+    inner_table.detach()
+    new_table = symbols.SymbolTable()
+    new_table.attach(schedule)
+    assert not new_table.get_symbols()
+
+    # Copies of the symbol dictionaries get their own version.
+    new_table.add(symbols.DataSymbol("symbol4", symbols.INTEGER_TYPE))
+    table_copy = new_table.shallow_copy()
+    assert table_copy._symbols.version != new_table._symbols.version
+    assert "symbol4" in table_copy.get_symbols()
+
+
+def test_lookup_stops_at_first_scope(monkeypatch):
+    '''Check that lookup() searches the scopes from the innermost outwards
+    and stops at the first match without building the merged view of all
+    of the symbols in scope.
+
+    '''
+    inner_table, outer_table = create_hierarchy()
+    monkeypatch.setattr(inner_table, "get_symbols", None)
+    monkeypatch.setattr(inner_table, "_get_merged_symbols", None)
+    monkeypatch.setattr(outer_table, "parent_symbol_table", None)
+    # Found in the innermost table.
+    assert inner_table.lookup("symbol1").name == "symbol1"
+    # Found in the outer table, which is the last one searched.
+    assert inner_table.lookup("SYMBOL2").name == "symbol2"
+    assert inner_table.lookup_with_tag("symbol2_tag").name == "symbol2"
+    monkeypatch.undo()
+    # A shadowing symbol in the inner table is found first.
+    shadow = symbols.DataSymbol("symbol2", symbols.INTEGER_TYPE)
+    inner_table.add(shadow)
+    assert inner_table.lookup("symbol2") is shadow
+    assert outer_table.lookup("symbol2") is not shadow
+    with pytest.raises(KeyError):
+        inner_table.lookup("missing")
+    with pytest.raises(KeyError):
+        outer_table.lookup("symbol1")
+    # An invalid scope_limit is reported even if the symbol is found in the
+    # first table.
+    with pytest.raises(TypeError) as err:
+        inner_table.lookup("symbol1", scope_limit=2)
+    assert ("The scope_limit argument '2', is not of type `Node`."
+            in str(err.value))
+
+
 def test_get_tags():
     '''Check that the get_tags method in the SymbolTable class
     behaves as expected.
@@ -0,0 +1,174 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+''' Module containing tests for the AffineExpression class.'''
+
+import pytest
+
+from psyclone.psyir.nodes import Assignment
+from psyclone.psyir.tools.affine_expression import AffineExpression
+
+
+def get_expressions(fortran_reader, expressions):
+    '''Creates the PSyIR for the given Fortran expressions.
+
+    :param fortran_reader: a FortranReader instance.
+    :type fortran_reader: :py:class:`psyclone.psyir.frontend.FortranReader`
+    :param expressions: the Fortran expressions to convert.
+    :type expressions: List[str]
+
+    :returns: the PSyIR of the expressions.
+    :rtype: List[:py:class:`psyclone.psyir.nodes.Node`]
+
+    '''
+    assignments = "\n".join(f"x = {expr}" for expr in expressions)
+    source = f'''program test
+                 use some_mod
+                 integer :: i, j, n, x
+                 integer, dimension(10) :: map
+                 {assignments}
+                 end program test'''
+    psyir = fortran_reader.psyir_from_source(source)
+    return [assign.rhs for assign in psyir.walk(Assignment)]
+
+
+# -----------------------------------------------------------------------------
+@pytest.mark.parametrize("expression, coefficients, constant, opaque",
+                         [("3", {}, 3, False),
+                          ("i", {"i": 1}, 0, False),
+                          ("-i", {"i": -1}, 0, False),
+                          ("+i", {"i": 1}, 0, False),
+                          ("2*i-1", {"i": 2}, -1, False),
+                          ("(i+j)*3", {"i": 3, "j": 3}, 0, False),
+                          ("i-2*(i+n)+i", {"n": -2}, 0, False),
+                          ("0*j+5", {}, 5, False),
+                          ("map(j)+i", {"map(j)": 1, "i": 1}, 0, True),
+                          ("i*i", {"i * i": 1}, 0, True),
+                          ("n/2", {"n / 2": 1}, 0, True),
+                          ("1.5", {"1.5": 1}, 0, True),
+                          ("-(i*j)", {"i * j": -1}, 0, True),
+                          ])
+def test_affine_expression_create(expression, coefficients, constant, opaque,
+                                  fortran_reader):
+    '''Tests the conversion of PSyIR expressions to AffineExpression.'''
+    node = get_expressions(fortran_reader, [expression])[0]
+    affine = AffineExpression.create(node)
+    assert affine.coefficients == coefficients
+    assert affine.constant == constant
+    assert affine.is_constant is not coefficients
+    assert affine.has_opaque_terms is opaque
+
+
+# -----------------------------------------------------------------------------
+def test_affine_expression_range(fortran_reader):
+    '''Tests that a Range can not be converted.'''
+    source = '''program test
+                integer, dimension(10) :: a
+                a(2:5) = 0
+                end program test'''
+    psyir = fortran_reader.psyir_from_source(source)
+    assign = psyir.walk(Assignment)[0]
+    assert AffineExpression.create(assign.lhs.indices[0]) is None
+
+
+# -----------------------------------------------------------------------------
+def test_affine_expression_arithmetic(fortran_reader):
+    '''Tests the arithmetic operations, the comparison and the string
+    representation of AffineExpression.'''
+    expr1, expr2 = [AffineExpression.create(node) for node in
+                    get_expressions(fortran_reader, ["2*i+map(j)", "i-3"])]
+    assert str(expr1 + expr2) == "3*i + 1*map(j) + -3"
+    assert str(expr1 - expr2) == "1*i + 1*map(j) + 3"
+    assert str(-expr2) == "-1*i + 3"
+    assert str(expr2.scale(2)) == "2*i + -6"
+    assert expr1 - expr1 == AffineExpression()
+    assert expr1 != expr2
+    assert expr1 != "2*i+map(j)"
+    # The opaque term is removed if its coefficient becomes 0:
+    assert not (expr1 - expr1).has_opaque_terms
+    assert expr1.scale(0) == AffineExpression()
+    assert not expr1.scale(0).has_opaque_terms
+    assert expr1.coefficient("i") == 2
+    assert expr1.coefficient("j") == 0
+    # The variable j is only used in the opaque term:
+    assert expr1.is_affine_in("i")
+    assert not expr1.is_affine_in("j")
+    assert expr1.is_affine_in("n")
+
+
+# -----------------------------------------------------------------------------
+@pytest.mark.parametrize("expr1, expr2, independent",
+                         [("i", "i", False),
+                          ("2*i", "2*i+1", True),
+                          ("2*i", "4*i+1", True),
+                          ("2*i", "4*i+2", False),
+                          ("6*i+1", "4*i+2", True),
+                          ("2*i+2*n", "2*i+1", True),
+                          ("2*i+n", "2*i+1", False),
+                          ("2*i+2*map(j)", "2*i+1", True),
+                          ("i-i+2", "3", True),
+                          ("i-i+2", "2", False),
+                          ("n", "n+1", True),
+                          ])
+def test_affine_expression_gcd_test(expr1, expr2, independent,
+                                    fortran_reader):
+    '''Tests the GCD test.'''
+    affine1, affine2 = [AffineExpression.create(node) for node in
+                        get_expressions(fortran_reader, [expr1, expr2])]
+    assert AffineExpression.gcd_test(affine1, affine2, "i") is independent
+
+
+# -----------------------------------------------------------------------------
+@pytest.mark.parametrize("expr1, expr2, lower, upper, independent",
+                         [("i", "i", "1", "n", False),
+                          ("i", "i+10", "1", "10", True),
+                          ("i", "i+9", "1", "10", False),
+                          ("i", "i-10", "1", "10", True),
+                          ("i", "i+n", "1", "n", True),
+                          ("i", "i+n", "0", "n", False),
+                          ("i", "i+n", "1", "n+1", False),
+                          ("i", "i+n", "1", "m", False),
+                          ("-i", "-i+n", "1", "n", True),
+                          ("2*i", "i+2*n", "1", "n", True),
+                          ("i", "i+map(j)", "1", "map(j)", True),
+                          ])
+def test_affine_expression_banerjee_test(expr1, expr2, lower, upper,
+                                         independent, fortran_reader):
+    '''Tests the Banerjee test.'''
+    affine1, affine2, affine_lower, affine_upper = \
+        [AffineExpression.create(node) for node in
+         get_expressions(fortran_reader, [expr1, expr2, lower, upper])]
+    assert AffineExpression.banerjee_test(affine1, affine2, "i",
+                                          affine_lower,
+                                          affine_upper) is independent
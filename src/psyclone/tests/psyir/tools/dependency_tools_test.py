@@ -280,11 +280,18 @@ def test_partition(lhs, rhs, partition, fortran_reader):
                           ("a1(n-1)", "a1(n-2)", True),
                           ("a1(n)", "a1(5)", False),
                           ("a1(n)", "a1(m)", False),
+                          ("a1(n+m)", "a1(m+n+1)", True),
+                          # Opaque terms that are only identical after
+                          # simplification by SymPy:
+                          ("a1(indx(n+1,1))", "a1(indx(1+n,1)+1)", True),
                           ])
-def test_array_access_pairs_0_vars(lhs, rhs, is_dependent, fortran_reader):
+@pytest.mark.parametrize("fast_path", [True, False])
+def test_array_access_pairs_0_vars(lhs, rhs, is_dependent, fast_path,
+                                   fortran_reader, monkeypatch):
     '''Tests that array indices that do not use a loop variable are
-    handled correctly.
+    handled correctly, both with and without the affine fast path.
     '''
+    monkeypatch.setattr(DependencyTools, "_AFFINE_FAST_PATH", fast_path)
     source = f'''program test
                  integer, parameter :: n=10, m=11
                  real, dimension(n) :: a1
@@ -323,6 +330,11 @@ def test_array_access_pairs_0_vars(lhs, rhs, is_dependent, fortran_reader):
                           ("a1(2*i)", "a1(2*i+1)", None),
                           ("a1(i*i)", "a1(-1)", None),
                           ("a1(i-i+2)", "a1(2)", None),
+                          ("a1(-2*i+j)", "a1(j-2*i-4)", -2),
+                          ("a1(3*i)", "a1(3*i-2)", None),
+                          ("a1(indx(j,1)+i)", "a1(indx(j,1)+i-1)", 1),
+                          ("a1(indx(j+1,1)+i)", "a1(indx(1+j,1)+i-1)", 1),
+                          ("a1(indx(i,1)+i)", "a1(indx(i,1)+i)", None),
                           # Test the handling of array ranges. This is not
                           # yet supported (TODO #2168), so it will always
                           # return None, indicating an overlap.
@@ -338,9 +350,13 @@ def test_array_access_pairs_0_vars(lhs, rhs, is_dependent, fortran_reader):
                           # which we want to test:
                           ("a1(:)", "a1(mt%x(:) /= 1)+1", None),
                           ])
-def test_array_access_pairs_1_var(lhs, rhs, distance, fortran_reader):
-    '''Tests the array checks of can_loop_be_parallelised.
+@pytest.mark.parametrize("fast_path", [True, False])
+def test_array_access_pairs_1_var(lhs, rhs, distance, fast_path,
+                                  fortran_reader, monkeypatch):
+    '''Tests the array checks of can_loop_be_parallelised, both with and
+    without the affine fast path.
     '''
+    monkeypatch.setattr(DependencyTools, "_AFFINE_FAST_PATH", fast_path)
     source = f'''program test
                  use my_type_mod
                  integer i, j, k, d_i
@@ -472,6 +488,110 @@ def test_improved_dependency_analysis(lhs, rhs, is_parallelisable,
     assert result is is_parallelisable
 
 
+# -----------------------------------------------------------------------------
+@pytest.mark.parametrize("lhs, rhs, is_parallelisable",
+                         [  # GCD test:
+                          ("a1(2*k)", "a1(2*k+1)", True),
+                          ("a1(2*k)", "a1(4*k+1)", True),
+                          ("a1(2*k)", "a1(4*k+2)", False),
+                          ("a1(2*k+2*n)", "a1(2*k+1)", True),
+                          ("a1(2*k+n)", "a1(2*k+1)", False),
+                          # Banerjee test:
+                          ("a1(k)", "a1(k+n)", True),
+                          ("a1(k)", "a1(k-n)", True),
+                          ("a1(k)", "a1(k+n-1)", False),
+                          ("a1(2*k)", "a1(k+2*n)", True),
+                          ("a1(k)", "a1(indx(1,1)+k)", False),
+                          # The inner loop variable j takes several values:
+                          ("a1(j+1)", "a1(j)", False),
+                          ])
+def test_affine_dependency_analysis(lhs, rhs, is_parallelisable,
+                                    fortran_reader, monkeypatch):
+    '''Tests the GCD and Banerjee tests that are applied to affine
+    index expressions.
+    '''
+    source = f'''program test
+                 integer j, k, n
+                 integer, dimension(10, 10) :: indx
+                 real, dimension(n) :: a1
+                 do k = 1, n
+                    do j = 1, n
+                       {lhs} = {rhs}
+                    end do
+                 end do
+                 do k = n, 1, -1
+                    {lhs} = {rhs}
+                 end do
+                 end program test'''
+    psyir = fortran_reader.psyir_from_source(source)
+    dep_tools = DependencyTools()
+    for loop in psyir.children[0].children:
+        assert dep_tools.can_loop_be_parallelised(loop) is is_parallelisable
+
+    # Without the fast path SymPy can not show that any of these accesses
+    # are independent.
+    monkeypatch.setattr(DependencyTools, "_AFFINE_FAST_PATH", False)
+    for loop in psyir.children[0].children:
+        assert not dep_tools.can_loop_be_parallelised(loop)
+
+
+# -----------------------------------------------------------------------------
+def test_affine_dependency_analysis_loop_bounds(fortran_reader):
+    '''Tests that the loop bounds used by the Banerjee test are only the
+    ones passed in, and not the ones of a loop analysed before by the same
+    DependencyTools instance.
+    '''
+    source = '''program test
+                 integer k, n
+                 real, dimension(n) :: a1
+                 do k = 1, n
+                    a1(k) = a1(k+n)
+                 end do
+                 do k = 1, 2*n
+                    a1(k) = a1(k+n)
+                 end do
+                 end program test'''
+    psyir = fortran_reader.psyir_from_source(source)
+    loops = psyir.walk(Loop)
+    dep_tools = DependencyTools()
+    assert dep_tools.can_loop_be_parallelised(loops[0])
+    assert not dep_tools.can_loop_be_parallelised(loops[1])
+
+    # Analyse the accesses in the second loop directly, after the first
+    # loop has been analysed again.
+    assert dep_tools.can_loop_be_parallelised(loops[0])
+    var_info = VariablesAccessInfo(loops[1])[Signature("a1")]
+    assert not dep_tools._array_access_parallelisable(["k"], var_info)
+    bounds = DependencyTools._get_loop_bounds(loops[0])
+    assert dep_tools._array_access_parallelisable(["k"], var_info, bounds)
+    bounds = DependencyTools._get_loop_bounds(loops[1])
+    assert not dep_tools._array_access_parallelisable(["k"], var_info,
+                                                      bounds)
+
+
+# -----------------------------------------------------------------------------
+def test_get_loop_bounds(fortran_reader):
+    '''Tests that the bounds of a loop variable are only returned if the
+    sign of the step is known.
+    '''
+    source = '''program test
+                 integer i, n, s
+                 do i = 1, n
+                 end do
+                 do i = n, 1, -2
+                 end do
+                 do i = 1, n, s
+                 end do
+                 end program test'''
+    psyir = fortran_reader.psyir_from_source(source)
+    loops = psyir.walk(Loop)
+    bounds = DependencyTools._get_loop_bounds(loops[0])
+    assert [str(bound) for bound in bounds["i"]] == ["1", "1*n + 0"]
+    bounds = DependencyTools._get_loop_bounds(loops[1])
+    assert [str(bound) for bound in bounds["i"]] == ["1", "1*n + 0"]
+    assert DependencyTools._get_loop_bounds(loops[2]) == {}
+
+
 # -----------------------------------------------------------------------------
 @pytest.mark.parametrize("declaration, variable",
                          [("integer :: a", "a"),
@@ -39,14 +39,16 @@
 
 ''' Module containing tests for kernel transformations. '''
 
+import json
 import os
 import re
+import tempfile
 import pytest
 
 from psyclone.configuration import Config
 from psyclone.domain.lfric.lfric_builtins import LFRicBuiltIn
 from psyclone.generator import GenerationError
-from psyclone.psyGen import Kern
+from psyclone.psyGen import CodedKern, Kern
 from psyclone.psyir.nodes import Routine, FileContainer, IntrinsicCall, Call
 from psyclone.psyir.symbols import DataSymbol, INTEGER_TYPE
 from psyclone.psyir.transformations import TransformationError
@@ -267,6 +269,142 @@ def test_new_same_kern_single(kernel_outputdir, monkeypatch):
     assert out_files == [new_kernels[1].module_name+".f90"]
 
 
+def test_new_same_kern_hashed(kernel_outputdir, monkeypatch):
+    ''' Check that an identical transformed kernel is only written once
+    if kernel-naming is 'hashed', and that a different one is written to a
+    new file. '''
+    config = Config.get()
+    monkeypatch.setattr(config, "_kernel_naming", "hashed")
+    rtrans = ACCRoutineTrans()
+    _, invoke = get_invoke("4_multikernel_invokes.f90", api="lfric",
+                           idx=0)
+    new_kernels = invoke.schedule.coded_kernels()
+    for kern in new_kernels:
+        rtrans.apply(kern)
+    new_kernels[0].rename_and_write()
+    new_kernels[1].rename_and_write()
+    assert new_kernels[1].name == "testkern_0_code"
+    assert new_kernels[1].module_name == "testkern_0_mod"
+    assert (sorted(os.listdir(str(kernel_outputdir))) ==
+            ["psyclone_kernel_index.json", "testkern_0_mod.f90"])
+
+    # The same kernel in a different invoke (or PSyclone run) is reused.
+    _, invoke = get_invoke("4_multikernel_invokes.f90", api="lfric",
+                           idx=0)
+    kern = invoke.schedule.coded_kernels()[0]
+    rtrans.apply(kern)
+    with monkeypatch.context() as mpatch:
+        # No file must be opened.
+        mpatch.setattr(os, "open", None)
+        kern.rename_and_write()
+    assert kern.module_name == "testkern_0_mod"
+    assert not kern.modified
+
+    # A differently transformed kernel is written to a new file.
+    _, invoke = get_invoke("4_multikernel_invokes.f90", api="lfric",
+                           idx=0)
+    kern = invoke.schedule.coded_kernels()[0]
+    OMPDeclareTargetTrans().apply(kern)
+    kern.rename_and_write()
+    assert kern.module_name == "testkern_1_mod"
+    # All kernels are written to the kernel output directory.
+    assert config.kernel_output_dir == str(kernel_outputdir)
+    assert (sorted(os.listdir(str(kernel_outputdir))) ==
+            ["psyclone_kernel_index.json", "testkern_0_mod.f90",
+             "testkern_1_mod.f90"])
+    index = kern._load_kernel_index(str(kernel_outputdir))
+    assert sorted(entry["file"] for entry in index.values()) == [
+        "testkern_0_mod.f90", "testkern_1_mod.f90"]
+
+
+def test_new_kern_hashed_stale_index(kernel_outputdir, monkeypatch, capsys):
+    ''' Check that a damaged index or an index entry for a missing file is
+    ignored if kernel-naming is 'hashed', and that an error when writing
+    the index is reported but otherwise ignored. '''
+    config = Config.get()
+    monkeypatch.setattr(config, "_kernel_naming", "hashed")
+    index_file = os.path.join(str(kernel_outputdir),
+                              "psyclone_kernel_index.json")
+    with open(index_file, "w", encoding="utf-8") as ffile:
+        ffile.write("[1, 2]")
+    _, invoke = get_invoke("1_single_invoke.f90", api="lfric", idx=0)
+    kern = invoke.schedule.coded_kernels()[0]
+    ACCRoutineTrans().apply(kern)
+    kern.rename_and_write()
+    assert kern.module_name == "testkern_0_mod"
+
+    # Remove the kernel file: the index entry must not be used.
+    os.remove(os.path.join(str(kernel_outputdir), "testkern_0_mod.f90"))
+    with open(os.path.join(str(kernel_outputdir), "testkern_1_mod.f90"),
+              "w", encoding="utf-8") as ffile:
+        ffile.write("some code")
+    _, invoke = get_invoke("1_single_invoke.f90", api="lfric", idx=0)
+    kern = invoke.schedule.coded_kernels()[0]
+    ACCRoutineTrans().apply(kern)
+
+    def raise_error(*_args, **_kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(tempfile, "mkstemp", raise_error)
+    kern.rename_and_write()
+    assert kern.module_name == "testkern_0_mod"
+    assert os.path.isfile(os.path.join(str(kernel_outputdir),
+                                       "testkern_0_mod.f90"))
+    assert (f"Unable to write kernel index in '{kernel_outputdir}' - "
+            f"ignoring: disk full" in capsys.readouterr().err)
+
+
+def test_new_kern_hashed_changed_file(kernel_outputdir, monkeypatch):
+    ''' Check that an index entry is not used if kernel-naming is 'hashed'
+    and the file it names no longer contains the kernel that was written
+    (e.g. because it was overwritten by a run using another scheme). '''
+    config = Config.get()
+    monkeypatch.setattr(config, "_kernel_naming", "hashed")
+    _, invoke = get_invoke("1_single_invoke.f90", api="lfric", idx=0)
+    kern = invoke.schedule.coded_kernels()[0]
+    ACCRoutineTrans().apply(kern)
+    kern.rename_and_write()
+    assert kern.module_name == "testkern_0_mod"
+    kern_file = os.path.join(str(kernel_outputdir), "testkern_0_mod.f90")
+    with open(kern_file, "r", encoding="utf-8") as ffile:
+        kern_code = ffile.read()
+    with open(kern_file, "w", encoding="utf-8") as ffile:
+        ffile.write("some code")
+
+    _, invoke = get_invoke("1_single_invoke.f90", api="lfric", idx=0)
+    kern = invoke.schedule.coded_kernels()[0]
+    ACCRoutineTrans().apply(kern)
+    kern.rename_and_write()
+    assert kern.module_name == "testkern_1_mod"
+    with open(os.path.join(str(kernel_outputdir), "testkern_1_mod.f90"),
+              "r", encoding="utf-8") as ffile:
+        assert ffile.read() == kern_code.replace("testkern_0", "testkern_1")
+
+    # An entry in the format of an older index is ignored too.
+    index_file = os.path.join(str(kernel_outputdir),
+                              "psyclone_kernel_index.json")
+    with open(index_file, "r", encoding="utf-8") as ffile:
+        index = json.load(ffile)
+    with open(index_file, "w", encoding="utf-8") as ffile:
+        json.dump({key: "testkern_1_mod.f90" for key in index}, ffile)
+    _, invoke = get_invoke("1_single_invoke.f90", api="lfric", idx=0)
+    kern = invoke.schedule.coded_kernels()[0]
+    ACCRoutineTrans().apply(kern)
+    kern.rename_and_write()
+    assert kern.module_name == "testkern_2_mod"
+
+
+def test_kernel_index_write_error(kernel_outputdir, monkeypatch, capsys):
+    ''' Check that the temporary file is removed if writing the index of
+    transformed kernels fails. '''
+    def raise_error(*_args, **_kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", raise_error)
+    CodedKern._update_kernel_index(str(kernel_outputdir), "abc",
+                                   "testkern_0_mod.f90", "def")
+    assert os.listdir(str(kernel_outputdir)) == []
+    assert "ignoring: disk full" in capsys.readouterr().err
+
+
 # The following tests test the MarkRoutineForGPUMixin validation, for this
 # it uses the ACCRoutineTrans as instance of this Mixin.
 
@@ -0,0 +1,244 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''Module containing tests for the ResultCache class.'''
+
+import json
+import os
+import shutil
+import sys
+
+import fparser
+import pytest
+
+from psyclone.configuration import Config
+from psyclone.profiler import Profiler
+from psyclone.result_cache import ResultCache
+
+
+@pytest.fixture(name="cache_files")
+def fixture_cache_files(tmpdir, monkeypatch):
+    '''Creates an input file and a recipe in a temporary directory and
+    changes into it.
+
+    :returns: a result cache in the 'cache' sub-directory.
+    :rtype: :py:class:`psyclone.result_cache.ResultCache`
+
+    '''
+    monkeypatch.chdir(tmpdir)
+    for filename in ["input.f90", "recipe.py"]:
+        with open(filename, "w", encoding="utf-8") as fout:
+            fout.write(f"! {filename}\n")
+    return ResultCache(os.path.join(str(tmpdir), "cache"))
+
+
+def test_result_cache_constructor(tmpdir):
+    '''Test that the cache directory is created if required.'''
+    cache_path = os.path.join(str(tmpdir), "a", "b")
+    ResultCache(cache_path)
+    assert os.path.isdir(cache_path)
+    # An existing directory is fine as well
+    ResultCache(cache_path)
+
+
+def test_result_cache_get_key(cache_files, monkeypatch):
+    '''Test that the key depends on the content of the input files and on
+    the settings.'''
+    cache = cache_files
+    key = cache.get_key("input.f90", "recipe.py", "off")
+    assert key == cache.get_key("input.f90", "recipe.py", "off")
+
+    different_keys = {key,
+                      cache.get_key("input.f90", None, "off"),
+                      cache.get_key("input.f90", "recipe.py", "all")}
+    with open("recipe.py", "a", encoding="utf-8") as fout:
+        fout.write("# changed\n")
+    different_keys.add(cache.get_key("input.f90", "recipe.py", "off"))
+    with open("input.f90", "a", encoding="utf-8") as fout:
+        fout.write("! changed\n")
+    different_keys.add(cache.get_key("input.f90", "recipe.py", "off"))
+    monkeypatch.setattr(Profiler, "_options", ["routines"])
+    different_keys.add(cache.get_key("input.f90", "recipe.py", "off"))
+    monkeypatch.setattr(Config.get(), "_backend_checks_enabled", False)
+    different_keys.add(cache.get_key("input.f90", "recipe.py", "off"))
+    assert len(different_keys) == 7
+
+
+def test_result_cache_find_recipe(cache_files, tmpdir, monkeypatch):
+    '''Test that a recipe without a path is also found in the Python
+    path.'''
+    cache = cache_files
+    assert cache._find_recipe("recipe.py") == "recipe.py"
+    monkeypatch.chdir(os.path.join(str(tmpdir), "cache"))
+    monkeypatch.setattr(sys, "path", [])
+    assert cache._find_recipe("recipe.py") == "recipe.py"
+    monkeypatch.setattr(sys, "path", [str(tmpdir)])
+    assert (cache._find_recipe("recipe.py") ==
+            os.path.join(str(tmpdir), "recipe.py"))
+
+
+def test_result_cache_load_store(cache_files):
+    '''Test storing and loading of cache entries.'''
+    cache = cache_files
+    assert cache.load("key1") is None
+
+    cache.store("key1", "output1", ["recipe.py"])
+    assert cache.load("key1") == "output1"
+    # The entry was written without leaving any temporary file behind.
+    assert os.listdir("cache") == ["key1.psyresult"]
+
+    # Modifying a dependency invalidates the entry.
+    with open("recipe.py", "a", encoding="utf-8") as fout:
+        fout.write("# changed\n")
+    assert cache.load("key1") is None
+
+    # As does removing it.
+    cache.store("key2", "output2", ["recipe.py"])
+    assert cache.load("key2") == "output2"
+    os.remove("recipe.py")
+    assert cache.load("key2") is None
+
+    # Invalid entries are ignored.
+    with open(os.path.join("cache", "key3.psyresult"), "w",
+              encoding="utf-8") as fout:
+        fout.write("GARBAGE")
+    assert cache.load("key3") is None
+    with open(os.path.join("cache", "key4.psyresult"), "w",
+              encoding="utf-8") as fout:
+        fout.write('{"dependencies": [], "includes": {}, '
+                   '"directories": {}, "output_file": null, "output": ""}')
+    assert cache.load("key4") is None
+
+
+def test_result_cache_search_paths(cache_files):
+    '''Test that adding or removing a Fortran file or a directory in a
+    search path invalidates an entry, but that other files and the output
+    file are ignored.'''
+    cache = cache_files
+    os.mkdir("src")
+    cache.store("key1", "output1", ["input.f90"], ["src"],
+                os.path.join("src", "out.f90"))
+    assert cache.load("key1") == "output1"
+    for filename in ["out.f90", "a.o", "a.mod", "a.inc"]:
+        with open(os.path.join("src", filename), "w",
+                  encoding="utf-8") as fout:
+            fout.write("\n")
+    assert cache.load("key1") == "output1"
+
+    with open(os.path.join("src", "a_mod.F90"), "w",
+              encoding="utf-8") as fout:
+        fout.write("\n")
+    assert cache.load("key1") is None
+    os.remove(os.path.join("src", "a_mod.F90"))
+    assert cache.load("key1") == "output1"
+    os.mkdir(os.path.join("src", "sub"))
+    assert cache.load("key1") is None
+    os.rmdir(os.path.join("src", "sub"))
+    shutil.rmtree("src")
+    assert cache.load("key1") is None
+
+
+def test_result_cache_include_files(cache_files, monkeypatch):
+    '''Test that the files included by the source files are found in the
+    include paths (also recursively) and that a changed, added or removed
+    include file invalidates an entry.'''
+    cache = cache_files
+    for dirname in ["inc1", "inc2"]:
+        os.mkdir(dirname)
+    monkeypatch.setattr(Config.get(), "_include_paths", ["inc1", "inc2"])
+    with open("input.f90", "w", encoding="utf-8") as fout:
+        fout.write("program a\n  INCLUDE 'a.h' ! a comment\n"
+                   "  include \"missing.h\"\nend program a\n")
+    with open(os.path.join("inc2", "a.h"), "w", encoding="utf-8") as fout:
+        fout.write("include 'b.h'\n")
+    with open(os.path.join("inc2", "b.h"), "w", encoding="utf-8") as fout:
+        fout.write("integer :: b\n")
+    assert cache.get_include_files(["input.f90", "no_such_file.f90"]) == {
+        "a.h": os.path.join("inc2", "a.h"),
+        "b.h": os.path.join("inc2", "b.h"),
+        "missing.h": None}
+
+    cache.store("key1", "output1", ["input.f90"])
+    assert cache.load("key1") == "output1"
+    with open(os.path.join("inc2", "b.h"), "a", encoding="utf-8") as fout:
+        fout.write("! changed\n")
+    assert cache.load("key1") is None
+
+    cache.store("key2", "output2", ["input.f90"])
+    assert cache.load("key2") == "output2"
+    with open(os.path.join("inc1", "b.h"), "w", encoding="utf-8") as fout:
+        fout.write("integer :: b\n")
+    assert cache.load("key2") is None
+
+    cache.store("key3", "output3", ["input.f90"])
+    assert cache.load("key3") == "output3"
+    with open(os.path.join("inc1", "missing.h"), "w",
+              encoding="utf-8") as fout:
+        fout.write("\n")
+    assert cache.load("key3") is None
+
+
+def test_result_cache_store_error(cache_files, capsys, monkeypatch):
+    '''Test that failing to write a cache entry is not an error, and that
+    no temporary file is left behind.'''
+    cache = cache_files
+
+    def raise_error(*_1, **_2):
+        raise OSError("no space left")
+
+    monkeypatch.setattr(os, "replace", raise_error)
+    cache.store("key1", "output1", [])
+    assert cache.load("key1") is None
+    assert os.listdir("cache") == []
+    assert ("Unable to write PSyclone result cache entry - ignoring: no space "
+            "left" in capsys.readouterr().err)
+
+
+def test_result_cache_get_python_dependencies(tmpdir, monkeypatch):
+    '''Test that all imported Python modules that are not part of the
+    standard library are found, wherever they are imported from.'''
+    helper_dir = os.path.join(str(tmpdir), "helpers")
+    os.mkdir(helper_dir)
+    helper = os.path.join(helper_dir, "recipe_helper.py")
+    with open(helper, "w", encoding="utf-8") as fout:
+        fout.write("VALUE = 1\n")
+    monkeypatch.syspath_prepend(helper_dir)
+    # pylint: disable=import-outside-toplevel, import-error
+    import recipe_helper
+    assert recipe_helper.VALUE == 1
+    dependencies = ResultCache.get_python_dependencies()
+    assert helper in dependencies
+    assert os.path.abspath(fparser.__file__) in dependencies
+    assert os.path.abspath(json.__file__) not in dependencies
+    monkeypatch.delitem(sys.modules, "recipe_helper")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''Measures the throughput of the PSyIR backends. The given Fortran file
+(by default the NEMO traldf_iso example) is converted to PSyIR once and
+then written repeatedly by each backend. The best time of all repetitions
+is reported for each backend.
+
+Usage: benchmark_backend.py [-n REPETITIONS] [FILE]
+'''
+
+import argparse
+import os
+import time
+
+from psyclone.psyir.backend.debug_writer import DebugWriter
+from psyclone.psyir.backend.fortran import FortranWriter
+from psyclone.psyir.frontend.fortran import FortranReader
+from psyclone.psyir.nodes import Node
+
+DEFAULT_FILE = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..", "examples", "nemo", "code", "traldf_iso.F90"))
+
+
+def main():
+    '''Parses the command line and runs the benchmark.'''
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", "--repetitions", type=int, default=5,
+                        help="how often each backend is run")
+    parser.add_argument("filename", nargs="?", default=DEFAULT_FILE,
+                        help="the Fortran file to use")
+    args = parser.parse_args()
+
+    psyir = FortranReader().psyir_from_file(args.filename)
+    print(f"{args.filename}: {len(psyir.walk(Node))} nodes")
+
+    for name, writer in [
+            ("FortranWriter", FortranWriter()),
+            ("FortranWriter (no validation)",
+             FortranWriter(check_global_constraints=False)),
+            ("DebugWriter", DebugWriter())]:
+        times = []
+        for _ in range(args.repetitions):
+            start = time.perf_counter()
+            writer(psyir)
+            times.append(time.perf_counter() - start)
+        print(f"{name:30} {min(times):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+#!/bin/bash
+
+#
+# Measures the time it takes to import the PSyclone command-line driver,
+# which is the start-up overhead paid by every invocation of psyclone.
+# The import time is reported as the best of several runs, followed by
+# the most expensive top-level imports (using 'python -X importtime').
+#
+# Usage: benchmark_startup.sh [number of runs]
+#
+
+RUNS=5
+if [[ ! -z $1 ]]; then
+	RUNS=$1
+fi
+
+python - "$RUNS" <<'PYEOF'
+import subprocess
+import sys
+
+runs = int(sys.argv[1])
+code = ("import time; start = time.perf_counter(); "
+        "import psyclone.generator; "
+        "print(time.perf_counter() - start)")
+times = [float(subprocess.check_output([sys.executable, "-c", code]))
+         for _ in range(runs)]
+print(f"Importing psyclone.generator takes {min(times):.3f}s "
+      f"(best of {runs} runs).")
+PYEOF
+
+echo "Most expensive imports (cumulative time in microseconds):"
+python -X importtime -c "import psyclone.generator" 2>&1 | \
+	sort -t'|' -k2 -n | tail -15
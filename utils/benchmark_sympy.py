@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+'''Measures the time of the dependency analysis, which converts many
+expressions to SymPy. The dependency analysis is applied to each loop of
+the given Fortran file (by default the NEMO traldf_iso example): first
+using the affine representation of index expressions, then using only
+SymPy, once converting the PSyIR expressions directly into SymPy
+expressions and once by parsing their string representation with the SymPy
+parser (in all cases with an empty cache of symbolic comparisons), and
+finally re-using the cached comparisons. The best time of all repetitions
+and the number of loops that can be parallelised is reported for each
+variant.
+
+Usage: benchmark_sympy.py [-n REPETITIONS] [FILE]
+'''
+
+import argparse
+import os
+import time
+
+from psyclone.core import SymbolicMaths
+from psyclone.psyir.backend.sympy_writer import SymPyWriter
+from psyclone.psyir.frontend.fortran import FortranReader
+from psyclone.psyir.nodes import Loop
+from psyclone.psyir.tools import DependencyTools
+
+DEFAULT_FILE = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..", "examples", "nemo", "code", "traldf_iso.F90"))
+
+
+def analyse(loops):
+    '''Checks whether each of the given loops can be parallelised.
+
+    :param loops: the loops to analyse.
+    :type loops: List[:py:class:`psyclone.psyir.nodes.Loop`]
+
+    :returns: the result of the analysis for each loop.
+    :rtype: List[bool]
+    '''
+    dep_tools = DependencyTools()
+    return [dep_tools.can_loop_be_parallelised(loop) for loop in loops]
+
+
+def main():
+    '''Parses the command line and runs the benchmark.'''
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", "--repetitions", type=int, default=3,
+                        help="how often the analysis is run")
+    parser.add_argument("filename", nargs="?", default=DEFAULT_FILE,
+                        help="the Fortran file to use")
+    args = parser.parse_args()
+
+    psyir = FortranReader().psyir_from_file(args.filename)
+    loops = psyir.walk(Loop)
+    print(f"{args.filename}: {len(loops)} loops")
+
+    # pylint: disable=protected-access
+    for name, affine, direct, clear_cache in [
+            ("Affine fast path", True, True, True),
+            ("Direct conversion", False, True, True),
+            ("SymPy parser", False, False, True),
+            ("Cached comparisons", False, True, False)]:
+        DependencyTools._AFFINE_FAST_PATH = affine
+        SymPyWriter._DIRECT_CONVERSION = direct
+        times = []
+        for _ in range(args.repetitions):
+            if clear_cache:
+                SymbolicMaths.clear_cache()
+            start = time.perf_counter()
+            result = analyse(loops)
+            times.append(time.perf_counter() - start)
+        print(f"{name:30} {min(times):.3f}s "
+              f"({sum(result)} loops can be parallelised)")
+    DependencyTools._AFFINE_FAST_PATH = True
+    SymPyWriter._DIRECT_CONVERSION = True
+    print(f"Cache statistics: {SymbolicMaths.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''Measures the time taken to validate the task dependencies of an OpenMP
+serial region. For each requested size a synthetic subroutine is created
+with that many chunked loops, each of which contains an OpenMP task (with
+the clauses that OMPTaskTrans would compute for it): every task writes
+its own array and reads the array written by the previous task as well as
+an array that is shared by all tasks. The best time of all repetitions of
+the validation is reported for each size.
+
+Usage: benchmark_task_dependencies.py [-n REPETITIONS] [SIZE ...]
+'''
+
+import argparse
+import time
+
+from psyclone.psyir.frontend.fortran import FortranReader
+from psyclone.psyir.nodes import (
+    ArrayReference, OMPDependClause, OMPFirstprivateClause,
+    OMPPrivateClause, OMPSharedClause, OMPSingleDirective, OMPTaskDirective,
+    Reference, Routine)
+from psyclone.transformations import OMPParallelTrans, OMPSingleTrans
+
+
+def create_region(num_tasks):
+    '''Creates a serial region containing the given number of tasks.
+
+    :param int num_tasks: the number of tasks in the region.
+
+    :returns: the serial region.
+    :rtype: :py:class:`psyclone.psyir.nodes.OMPSingleDirective`
+    '''
+    arrays = ", ".join(f"a{idx}" for idx in range(num_tasks + 1))
+    loops = "\n".join(f'''
+        do i_out = 1, n, 32
+          i_el_inner = min(i_out + 31, n)
+          do i = i_out, i_el_inner
+            a{idx + 1}(i) = a{idx}(i) + shared(i)
+          end do
+        end do''' for idx in range(num_tasks))
+    code = f'''subroutine synthetic(n)
+        integer, intent(in) :: n
+        integer :: i, i_out, i_el_inner
+        real, dimension(1000) :: shared, {arrays}
+        {loops}
+    end subroutine synthetic'''
+    routine = FortranReader().psyir_from_source(code).walk(Routine)[0]
+    table = routine.symbol_table
+
+    def ref(name, index=None):
+        if index:
+            return ArrayReference.create(table.lookup(name),
+                                         [Reference(table.lookup(index))])
+        return Reference(table.lookup(name))
+
+    for idx, loop in enumerate(routine.children[:]):
+        inner = loop.loop_body.children[1]
+        inputs = [f"a{idx}", "shared"]
+        output = f"a{idx + 1}"
+        clauses = [
+            OMPPrivateClause(children=[ref("i")]),
+            OMPFirstprivateClause(children=[ref("i_out"),
+                                            ref("i_el_inner")]),
+            OMPSharedClause(children=[ref(name)
+                                      for name in [output] + inputs]),
+            OMPDependClause(
+                depend_type=OMPDependClause.DependClauseTypes.IN,
+                children=[ref(name, "i_out") for name in inputs]),
+            OMPDependClause(
+                depend_type=OMPDependClause.DependClauseTypes.OUT,
+                children=[ref(output, "i_out")])]
+        task = OMPTaskDirective(clauses=clauses)
+        inner.replace_with(task)
+        task.dir_body.addchild(inner)
+    OMPSingleTrans().apply(routine.children)
+    OMPParallelTrans().apply(routine.children)
+    return routine.walk(OMPSingleDirective)[0]
+
+
+def main():
+    '''Parses the command line and runs the benchmark.'''
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", "--repetitions", type=int, default=3,
+                        help="how often the validation is run")
+    parser.add_argument("sizes", nargs="*", type=int,
+                        default=[10, 100, 1000],
+                        help="the numbers of tasks in the regions")
+    args = parser.parse_args()
+
+    for num_tasks in args.sizes:
+        region = create_region(num_tasks)
+        times = []
+        for _ in range(args.repetitions):
+            start = time.perf_counter()
+            # pylint: disable=protected-access
+            region._validate_task_dependencies()
+            times.append(time.perf_counter() - start)
+        print(f"{num_tasks:6} tasks: {min(times):.3f}s")
+
+
+if __name__ == "__main__":
+    main()